@@ -1,5 +1,10 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
 from django.contrib import admin
 from django.db.utils import OperationalError, ProgrammingError
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
 from django.utils.html import format_html
 from .models import (
     EducationEntry,
@@ -16,8 +21,29 @@ from .models import (
     BlogLike,
     MediaFile,
     BackupRestore,
+    BackgroundJob,
+    RequestProfile,
+    MemoryReport,
     NewsletterSubscriber,
 )
+from . import memory, profiling
+from .facets import invalidate_blog_facets
+from .related import schedule_related_update
+from .response_cache import bump_version as invalidate_api_responses
+from .search import filter_matching, fts_available, index_object
+from .suggest import bump_generation
+
+
+class FullTextSearchAdminMixin:
+    """
+    Use the full-text index for changelist searches instead of icontains
+    scans over every search_fields column.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not fts_available():
+            return super().get_search_results(request, queryset, search_term)
+        return filter_matching(queryset, search_term), False
 
 
 @admin.register(EducationEntry)
@@ -37,7 +63,7 @@ class ExperienceEntryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'organization', 'type', 'start_date', 'end_date', 'is_visible', 'display_order')
     list_filter = ('is_visible', 'type')
     search_fields = ('title', 'organization', 'short_description', 'tags')
@@ -46,7 +72,7 @@ class ProjectAdmin(admin.ModelAdmin):
 
 
 @admin.register(ResearchPublication)
-class ResearchPublicationAdmin(admin.ModelAdmin):
+class ResearchPublicationAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'publication_type', 'publication_date', 'is_visible', 'display_order')
     list_filter = ('is_visible', 'publication_type')
     search_fields = ('title', 'description', 'authors', 'tags')
@@ -159,7 +185,7 @@ class HomeDataAdmin(admin.ModelAdmin):
 
 
 @admin.register(Blog)
-class BlogAdmin(admin.ModelAdmin):
+class BlogAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'author',
@@ -168,6 +194,7 @@ class BlogAdmin(admin.ModelAdmin):
         'is_trending',
         'is_featured',
         'views',
+        'trending_score',
         'published_date',
         'display_order'
     )
@@ -197,7 +224,7 @@ class BlogAdmin(admin.ModelAdmin):
 
     ordering = ('-published_date', 'display_order')
 
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'trending_score', 'trending_score_updated_at')
 
     fieldsets = (
         ('Basic Information', {
@@ -227,7 +254,7 @@ class BlogAdmin(admin.ModelAdmin):
             )
         }),
         ('Engagement Metrics', {
-            'fields': ('views', 'likes', 'comments_count', 'shares'),
+            'fields': ('views', 'likes', 'comments_count', 'shares', 'trending_score', 'trending_score_updated_at'),
             'classes': ('collapse',)
         }),
         ('SEO', {
@@ -245,27 +272,45 @@ class BlogAdmin(admin.ModelAdmin):
 
     def mark_as_trending(self, request, queryset):
         updated = queryset.update(is_trending=True)
+        invalidate_api_responses()
         self.message_user(request, f'{updated} blog(s) marked as trending.')
     mark_as_trending.short_description = "Mark selected blogs as trending"
 
     def unmark_as_trending(self, request, queryset):
         updated = queryset.update(is_trending=False)
+        invalidate_api_responses()
         self.message_user(request, f'{updated} blog(s) unmarked as trending.')
     unmark_as_trending.short_description = "Unmark selected blogs as trending"
 
     def publish_blogs(self, request, queryset):
         updated = queryset.update(is_published=True)
+        # queryset.update() bypasses the save signals
+        schedule_related_update()
+        invalidate_blog_facets()
+        invalidate_api_responses()
+        bump_generation()
+        for blog in queryset:
+            index_object(blog)
         self.message_user(request, f'{updated} blog(s) published.')
     publish_blogs.short_description = "Publish selected blogs"
 
     def unpublish_blogs(self, request, queryset):
         updated = queryset.update(is_published=False)
+        schedule_related_update()
+        invalidate_blog_facets()
+        invalidate_api_responses()
+        bump_generation()
+        for blog in queryset:
+            index_object(blog)
         self.message_user(request, f'{updated} blog(s) unpublished.')
     unpublish_blogs.short_description = "Unpublish selected blogs"
 
 
 @admin.register(BlogComment)
 class BlogCommentAdmin(admin.ModelAdmin):
+    # __str__ shows the blog title
+    list_select_related = ('blog',)
+
     list_display = (
         'author_name',
         'blog',
@@ -313,11 +358,13 @@ class BlogCommentAdmin(admin.ModelAdmin):
 
     def approve_comments(self, request, queryset):
         updated = queryset.update(is_approved=True)
+        invalidate_api_responses()
         self.message_user(request, f'{updated} comment(s) approved.')
     approve_comments.short_description = "Approve selected comments"
 
     def unapprove_comments(self, request, queryset):
         updated = queryset.update(is_approved=False)
+        invalidate_api_responses()
         self.message_user(request, f'{updated} comment(s) hidden.')
     unapprove_comments.short_description = "Hide selected comments"
 
@@ -362,6 +409,9 @@ class BlogSettingsAdmin(admin.ModelAdmin):
 
 @admin.register(BlogView)
 class BlogViewAdmin(admin.ModelAdmin):
+    # __str__ shows the blog title
+    list_select_related = ('blog',)
+
     list_display = (
         'blog',
         'fingerprint_preview',
@@ -412,6 +462,9 @@ class BlogViewAdmin(admin.ModelAdmin):
 
 @admin.register(BlogLike)
 class BlogLikeAdmin(admin.ModelAdmin):
+    # __str__ shows the blog title
+    list_select_related = ('blog',)
+
     list_display = (
         'blog',
         'fingerprint_preview',
@@ -611,11 +664,13 @@ class MediaFileAdmin(admin.ModelAdmin):
 
     def make_public(self, request, queryset):
         updated = queryset.update(is_public=True)
+        invalidate_api_responses()
         self.message_user(request, f'{updated} file(s) made public.')
     make_public.short_description = "Make selected files public"
 
     def make_private(self, request, queryset):
         updated = queryset.update(is_public=False)
+        invalidate_api_responses()
         self.message_user(request, f'{updated} file(s) made private.')
     make_private.short_description = "Make selected files private"
 
@@ -660,6 +715,148 @@ class BackupRestoreAdmin(admin.ModelAdmin):
             'has_change_permission': self.has_change_permission(request),
             'has_delete_permission': self.has_delete_permission(request),
             'opts': self.model._meta,
+            'recent_jobs': BackgroundJob.objects.filter(kind__in=('export', 'import'))[:5],
+        })
+
+        return render(request, self.change_list_template, extra_context)
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    """
+    Backup exports and imports and related-post updates run by
+    `manage.py run_jobs` (api/jobs.py). Jobs are queued from the Backup &
+    Restore page and by blog saves, so this is read-only.
+    """
+    list_display = ('__str__', 'progress_display', 'requested_by', 'created_at', 'finished_at', 'job_link')
+    list_filter = ('status', 'kind')
+    readonly_fields = (
+        'kind', 'status', 'params', 'progress', 'progress_message', 'result', 'error',
+        'requested_by', 'worker', 'created_at', 'started_at', 'finished_at', 'heartbeat_at',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def progress_display(self, obj):
+        return f'{obj.progress:.0%}'
+    progress_display.short_description = "Progress"
+
+    def job_link(self, obj):
+        return format_html('<a href="{}">Progress page</a>', reverse('admin-job-detail', kwargs={'pk': obj.pk}))
+    job_link.short_description = "Details"
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """
+    Lists the request profiles recorded with ?_profile= (see api/profiling.py).
+    Like Backup & Restore, there is no table behind it.
+    """
+    change_list_template = 'admin/request_profiles.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return True
+
+    def has_change_permission(self, request, obj=None):
+        return True
+
+    def get_queryset(self, request):
+        """Return empty queryset since this model has no database table."""
+        return self.model.objects.none()
+
+    def changelist_view(self, request, extra_context=None):
+        """List the stored profiles; POST deletes one (name=...) or all of them."""
+        from django.shortcuts import redirect, render
+
+        if request.method == 'POST':
+            if request.POST.get('delete_all'):
+                profiles = profiling.list_profiles()
+                for meta in profiles:
+                    profiling.delete_profile(meta['name'])
+                self.message_user(request, f'{len(profiles)} profile(s) deleted.')
+            elif profiling.delete_profile(request.POST.get('name', '')):
+                self.message_user(request, 'Profile deleted.')
+            return redirect('admin:api_requestprofile_changelist')
+
+        profiles = profiling.list_profiles()
+        for meta in profiles:
+            meta['created'] = parse_datetime(meta['created_at'])
+            meta['duration_ms'] = meta['duration'] * 1000
+
+        extra_context = extra_context or {}
+        extra_context.update({
+            'title': 'Request Profiles',
+            'app_label': self.model._meta.app_label,
+            'opts': self.model._meta,
+            'profiles': profiles,
+            'profiling_enabled': getattr(settings, 'API_PROFILING', True),
+            'keep': getattr(settings, 'API_PROFILE_KEEP', 50),
+        })
+
+        return render(request, self.change_list_template, extra_context)
+
+
+@admin.register(MemoryReport)
+class MemoryReportAdmin(admin.ModelAdmin):
+    """
+    Per-worker memory growth from the tracemalloc snapshots taken when
+    API_TRACEMALLOC is on (see api/memory.py). No table behind it either.
+    """
+    change_list_template = 'admin/memory_report.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return True
+
+    def has_change_permission(self, request, obj=None):
+        return True
+
+    def get_queryset(self, request):
+        """Return empty queryset since this model has no database table."""
+        return self.model.objects.none()
+
+    def changelist_view(self, request, extra_context=None):
+        """Show each worker's growth; POST asks workers for a snapshot (snapshot=1) or clears them (clear=1)."""
+        from django.shortcuts import redirect, render
+
+        if request.method == 'POST':
+            if request.POST.get('clear'):
+                memory.clear_snapshots()
+                self.message_user(request, 'All memory snapshots deleted.')
+            elif request.POST.get('snapshot'):
+                memory.request_snapshots()
+                self.message_user(
+                    request,
+                    f'Snapshot requested. Workers take it within {memory.POLL_SECONDS:.0f} seconds; reload to see it.',
+                )
+            return redirect('admin:api_memoryreport_changelist')
+
+        since = 'previous' if request.GET.get('since') == 'previous' else 'first'
+        reports = memory.worker_reports(limit=15, since=since)
+        for report in reports:
+            report['rss_growth_display'] = memory.format_growth(report['rss_growth'])
+            report['traced_growth_display'] = memory.format_growth(report['traced_growth'])
+            for meta in report['snapshots']:
+                meta['taken'] = datetime.fromtimestamp(meta['taken_at'], tz=dt_timezone.utc)
+
+        extra_context = extra_context or {}
+        extra_context.update({
+            'title': 'Memory Usage',
+            'app_label': self.model._meta.app_label,
+            'opts': self.model._meta,
+            'reports': reports,
+            'since': since,
+            'tracing_enabled': getattr(settings, 'API_TRACEMALLOC', False),
+            'interval': getattr(settings, 'API_MEMORY_SNAPSHOT_INTERVAL', 600),
         })
 
         return render(request, self.change_list_template, extra_context)
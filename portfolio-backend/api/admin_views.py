@@ -2,57 +2,48 @@
 Simple Admin Views for Import/Export Functionality
 """
 
-import os
-from django.shortcuts import redirect
-from django.contrib import messages
+from django.shortcuts import get_object_or_404, redirect, render
+from django.contrib import admin, messages
 from django.contrib.admin.views.decorators import staff_member_required
-from django.http import FileResponse
+from django.http import FileResponse, Http404, JsonResponse
 from django.conf import settings
-from pathlib import Path
 
-from .backup_utils import export_portfolio_data, import_portfolio_data
+from . import jobs, profiling
+from .models import BackgroundJob
 
 
 @staff_member_required
 def export_portfolio_view(request):
     """
-    Export all portfolio data as a ZIP file and download it.
+    Queue an export of all portfolio data and show its progress.
     """
-    try:
-        # Create export
-        zip_path = export_portfolio_data()
-
-        # Send file as download
-        if os.path.exists(zip_path):
-            response = FileResponse(
-                open(zip_path, 'rb'),
-                as_attachment=True,
-                filename=os.path.basename(zip_path)
-            )
-            messages.success(request, f'✅ Portfolio data exported: {os.path.basename(zip_path)}')
-            return response
-        else:
-            messages.error(request, '❌ Export file was not created.')
-            return redirect('admin:api_backuprestore_changelist')
-
-    except Exception as e:
-        messages.error(request, f'❌ Export failed: {str(e)}')
+    if request.method != 'POST':
+        messages.error(request, '❌ Invalid request method.')
         return redirect('admin:api_backuprestore_changelist')
 
+    mode = request.POST.get('mode', 'full')
+    if mode not in jobs.EXPORT_MODES:
+        messages.error(request, f'❌ Unknown export mode: {mode}')
+        return redirect('admin:api_backuprestore_changelist')
+
+    job = jobs.enqueue('export', {'mode': mode}, user=request.user)
+    return redirect('admin-job-detail', pk=job.pk)
+
 
 @staff_member_required
 def import_portfolio_view(request):
     """
-    Import portfolio data from a ZIP file.
+    Queue an import of portfolio data from a ZIP file and show its progress.
     """
     if request.method != 'POST':
         messages.error(request, '❌ Invalid request method.')
         return redirect('admin:api_backuprestore_changelist')
 
-    zip_file = request.FILES.get('backup_file')
+    # A full backup, optionally with the incremental backups made on top of it
+    zip_files = request.FILES.getlist('backup_file')
     overwrite = request.POST.get('overwrite') == 'yes'
 
-    if not zip_file:
+    if not zip_files:
         messages.error(request, '❌ Please select a backup file.')
         return redirect('admin:api_backuprestore_changelist')
 
@@ -60,40 +51,63 @@ def import_portfolio_view(request):
         messages.error(request, '❌ You must confirm overwrite by checking the checkbox.')
         return redirect('admin:api_backuprestore_changelist')
 
-    try:
-        # Save uploaded file temporarily
-        temp_dir = Path(settings.BASE_DIR) / 'temp_uploads'
-        temp_dir.mkdir(exist_ok=True)
-        temp_path = temp_dir / zip_file.name
+    # The worker reads the uploads after this request is gone; it deletes the files when done
+    paths = [jobs.save_upload(zip_file) for zip_file in zip_files]
+    job = jobs.enqueue(
+        'import',
+        {
+            'paths': [str(path) for path in paths],
+            'filename': ', '.join(zip_file.name for zip_file in zip_files),
+            'overwrite': overwrite,
+        },
+        user=request.user,
+    )
+    return redirect('admin-job-detail', pk=job.pk)
 
-        with open(temp_path, 'wb+') as destination:
-            for chunk in zip_file.chunks():
-                destination.write(chunk)
 
-        # Import data
-        results = import_portfolio_data(temp_path, overwrite=overwrite)
+@staff_member_required
+def job_detail_view(request, pk):
+    """
+    Progress page of a background job; polls job_status_view until it finishes.
+    """
+    job = get_object_or_404(BackgroundJob, pk=pk)
+    context = {
+        **admin.site.each_context(request),
+        'title': str(job),
+        'job': job,
+        'status': jobs.job_status(job),
+        'poll_interval_ms': int(settings.API_JOB_PROGRESS_INTERVAL * 1000),
+    }
+    return render(request, 'admin/background_job.html', context)
 
-        # Clean up
-        os.remove(temp_path)
-        if temp_dir.exists() and not any(temp_dir.iterdir()):
-            temp_dir.rmdir()
 
-        if results['success']:
-            message = '✅ Import completed successfully!\n\n'
-            message += 'Imported:\n'
-            for key, value in results['imported'].items():
-                message += f'  • {key}: {value}\n'
+@staff_member_required
+def job_status_view(request, pk):
+    """
+    Status and progress of a background job as JSON.
+    """
+    job = get_object_or_404(BackgroundJob, pk=pk)
+    return JsonResponse(jobs.job_status(job))
 
-            if results.get('errors'):
-                message += '\n⚠️ Warnings:\n'
-                for error in results['errors']:
-                    message += f'  • {error}\n'
 
-            messages.success(request, message)
-        else:
-            messages.error(request, f"❌ Import failed: {', '.join(results['errors'])}")
+@staff_member_required
+def job_download_view(request, pk):
+    """
+    Download the ZIP file written by a finished export job.
+    """
+    job = get_object_or_404(BackgroundJob, pk=pk)
+    path = jobs.export_file(job)
+    if path is None:
+        raise Http404('Export file not found')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=path.name)
 
-    except Exception as e:
-        messages.error(request, f'❌ Import failed: {str(e)}')
 
-    return redirect('admin:api_backuprestore_changelist')
+@staff_member_required
+def download_profile_view(request, name):
+    """
+    Download a stored request profile (.prof or speedscope JSON).
+    """
+    path = profiling.profile_path(name)
+    if path is None:
+        raise Http404('Profile not found')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=path.name)
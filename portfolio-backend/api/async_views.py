@@ -0,0 +1,370 @@
+"""
+Async-native versions of the blog engagement endpoints.
+
+Readers send a stream of small pings while they read: increment-view,
+update-duration heartbeats, like toggles and view-stats lookups. Under a
+sync gunicorn worker each one occupies the whole worker for its lifetime.
+With the ASGI profile (GUNICORN_ASGI=True, see gunicorn.conf.py) and
+API_ASYNC_ENGAGEMENT=True, api/urls.py routes these endpoints here, so
+one uvicorn worker keeps thousands of them in flight on its event loop.
+
+The views take the same requests and return the same JSON as their DRF
+counterparts in views.py. They are plain Django views because DRF's
+APIView is sync-only. They also do less work per ping:
+
+- only the blog columns a ping needs are loaded, not the markdown;
+- counters and durations are bumped with F() expressions, so concurrent
+  pings can't overwrite each other's increments;
+- the common update-duration and view-stats cases take one joined query
+  and only look the blog up again to tell the two 404s apart.
+
+The async ORM runs each request's queries on a thread of its own, with
+its own database connection. To keep a burst of pings from starting a
+thread and a connection per ping, at most API_ASYNC_DB_CONCURRENCY
+requests per worker use the database at once; the rest wait on the event
+loop, where waiting costs next to nothing.
+
+Counter updates go through QuerySet.aupdate(), which sends no post_save.
+The Blog handlers in signals.py ignore counter-only saves anyway.
+"""
+
+import asyncio
+import io
+import weakref
+
+from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status as http_status
+from rest_framework.exceptions import ParseError
+
+from . import live, metrics
+from .models import Blog, BlogLike, BlogView
+from .renderers import FastJSONParser, FastJSONRenderer
+from .trending import aretract_like
+from .views import BlogIncrementViewAPIView
+
+_renderer = FastJSONRenderer()
+_parser = FastJSONParser()
+get_client_ip = BlogIncrementViewAPIView.get_client_ip
+
+
+_db_slots = weakref.WeakKeyDictionary()
+
+
+class BadRequest(Exception):
+    pass
+
+
+def db_slots():
+    """The semaphore limiting database work on the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _db_slots:
+        _db_slots[loop] = asyncio.Semaphore(getattr(settings, 'API_ASYNC_DB_CONCURRENCY', 8))
+    return _db_slots[loop]
+
+
+def json_response(data, status=http_status.HTTP_200_OK):
+    """The response DRF's Response would render for `data`."""
+    return HttpResponse(_renderer.render(data), status=status, content_type='application/json')
+
+
+def not_found():
+    # What DRF answers for get_object_or_404(Blog, ...)
+    return json_response({'detail': 'No Blog matches the given query.'}, http_status.HTTP_404_NOT_FOUND)
+
+
+def request_data(request):
+    """The request body as a dict: JSON or form-encoded, like DRF's request.data."""
+    if request.content_type != 'application/json':
+        return request.POST
+    if not request.body:
+        return {}
+    try:
+        data = _parser.parse(io.BytesIO(request.body), parser_context={'encoding': request.encoding or 'utf-8'})
+    except ParseError as error:
+        raise BadRequest(error.detail)
+    if not isinstance(data, dict):
+        raise BadRequest('JSON parse error - expected an object')
+    return data
+
+
+def published_blogs(slug):
+    return Blog.objects.filter(slug=slug, is_published=True)
+
+
+def todays_view(slug, fingerprint):
+    # At most one row: (blog, fingerprint, viewed_date) is unique
+    return BlogView.objects.filter(
+        blog__slug=slug,
+        blog__is_published=True,
+        fingerprint=fingerprint,
+        viewed_date=timezone.now().date(),
+    )
+
+
+class AsyncEngagementView(View):
+    """Base class: exempt from CSRF like DRF's APIView, and answers bad bodies and methods with DRF's JSON errors."""
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            async with db_slots():
+                return await super().dispatch(request, *args, **kwargs)
+        except BadRequest as error:
+            return json_response({'detail': str(error)}, http_status.HTTP_400_BAD_REQUEST)
+
+    async def http_method_not_allowed(self, request, *args, **kwargs):
+        response = json_response(
+            {'detail': f'Method "{request.method}" not allowed.'}, http_status.HTTP_405_METHOD_NOT_ALLOWED)
+        response['Allow'] = ', '.join(self._allowed_methods())
+        return response
+
+
+class BlogIncrementViewAPIView(AsyncEngagementView):
+    """
+    POST /api/blog-posts/<slug>/increment-view/
+    Async twin of views.BlogIncrementViewAPIView: one view per device per day.
+    """
+
+    async def post(self, request, slug):
+        try:
+            blog = await published_blogs(slug).only('id', 'views').aget()
+        except Blog.DoesNotExist:
+            return not_found()
+
+        data = request_data(request)
+        fingerprint = data.get('fingerprint', '')
+        if not fingerprint:
+            return json_response({
+                'success': False,
+                'message': 'Fingerprint is required',
+                'views': blog.views
+            }, http_status.HTTP_400_BAD_REQUEST)
+
+        _, created = await BlogView.objects.aget_or_create(
+            blog_id=blog.pk,
+            fingerprint=fingerprint,
+            viewed_date=timezone.now().date(),
+            defaults={
+                'session_id': data.get('session_id', ''),
+                'ip_address': get_client_ip(request),
+                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+            }
+        )
+
+        views = blog.views
+        if created:
+            await Blog.objects.filter(pk=blog.pk).aupdate(views=F('views') + 1)
+            views += 1
+            metrics.record_engagement('view')
+            message = 'View count incremented'
+        else:
+            message = 'View already counted for this device today'
+
+        return json_response({
+            'success': True,
+            'message': message,
+            'views': views,
+            'is_new_view': created
+        })
+
+
+class BlogUpdateDurationAPIView(AsyncEngagementView):
+    """
+    POST /api/blog-posts/<slug>/update-duration/
+    Async twin of views.BlogUpdateDurationAPIView: adds a heartbeat's seconds to today's view.
+    """
+
+    async def post(self, request, slug):
+        data = request_data(request)
+        fingerprint = data.get('fingerprint', '')
+        if not fingerprint:
+            if not await published_blogs(slug).aexists():
+                return not_found()
+            return json_response({
+                'success': False,
+                'message': 'Fingerprint is required'
+            }, http_status.HTTP_400_BAD_REQUEST)
+
+        try:
+            duration = max(int(data.get('duration', 0)), 0)
+        except (ValueError, TypeError):
+            duration = 0
+
+        try:
+            view_record = await todays_view(slug, fingerprint).only('id', 'duration_seconds').aget()
+        except BlogView.DoesNotExist:
+            if not await published_blogs(slug).aexists():
+                return not_found()
+            return json_response({
+                'success': False,
+                'message': 'No view record found for today'
+            }, http_status.HTTP_404_NOT_FOUND)
+
+        # last_seen is auto_now, which update() doesn't apply
+        last_seen = timezone.now()
+        await BlogView.objects.filter(pk=view_record.pk).aupdate(
+            duration_seconds=F('duration_seconds') + duration,
+            last_seen=last_seen,
+        )
+        view_record.duration_seconds += duration
+
+        return json_response({
+            'success': True,
+            'message': 'Duration updated',
+            'total_duration': view_record.duration_seconds,
+            'total_duration_display': view_record.get_duration_display(),
+            'last_seen': last_seen.isoformat()
+        })
+
+
+class BlogLikeToggleAPIView(AsyncEngagementView):
+    """
+    POST /api/blog-posts/<slug>/toggle-like/
+    Async twin of views.BlogLikeToggleAPIView: one like per device.
+    """
+
+    async def post(self, request, slug):
+        try:
+            blog = await published_blogs(slug).only('id', 'likes').aget()
+        except Blog.DoesNotExist:
+            return not_found()
+
+        data = request_data(request)
+        fingerprint = data.get('fingerprint', '')
+        action = data.get('action', 'like')
+
+        if not fingerprint:
+            return json_response({
+                'success': False,
+                'message': 'Fingerprint is required',
+                'likes': blog.likes
+            }, http_status.HTTP_400_BAD_REQUEST)
+
+        if action not in ['like', 'unlike']:
+            return json_response({
+                'success': False,
+                'message': 'Invalid action. Use "like" or "unlike"'
+            }, http_status.HTTP_400_BAD_REQUEST)
+
+        like_record, created = await BlogLike.objects.aget_or_create(
+            blog_id=blog.pk,
+            fingerprint=fingerprint,
+            defaults={
+                'ip_address': get_client_ip(request),
+                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+                'is_active': (action == 'like')
+            }
+        )
+
+        likes = blog.likes
+        if action == 'like':
+            is_liked = True
+            if created or not like_record.is_active:
+                if not created:
+                    # Re-liking after unliking counts as a new like
+                    like_record.is_active = True
+                    like_record.liked_at = timezone.now()
+                    await like_record.asave(update_fields=['is_active', 'liked_at'])
+                await Blog.objects.filter(pk=blog.pk).aupdate(likes=F('likes') + 1)
+                likes += 1
+                metrics.record_engagement('like')
+                message = 'Blog liked'
+            else:
+                message = 'Already liked by this device'
+
+        else:  # action == 'unlike'
+            is_liked = False
+            if like_record.is_active:
+                like_record.is_active = False
+                await like_record.asave(update_fields=['is_active'])
+                await aretract_like(blog.pk, like_record.liked_at)
+                # Prevent negative likes
+                await Blog.objects.filter(pk=blog.pk).aupdate(likes=Greatest(F('likes') - 1, 0))
+                likes = max(0, likes - 1)
+                metrics.record_engagement('unlike')
+                message = 'Blog unliked'
+            else:
+                message = 'Not currently liked'
+
+        return json_response({
+            'success': True,
+            'message': message,
+            'likes': likes,
+            'is_liked': is_liked
+        })
+
+
+class BlogViewStatsAPIView(AsyncEngagementView):
+    """
+    GET /api/blog-posts/<slug>/view-stats/?fingerprint=<fingerprint>
+    Async twin of views.BlogViewStatsAPIView: this device's view of the post today.
+    """
+
+    async def get(self, request, slug):
+        fingerprint = request.GET.get('fingerprint', '')
+        if not fingerprint:
+            if not await published_blogs(slug).aexists():
+                return not_found()
+            return json_response({
+                'success': False,
+                'message': 'Fingerprint is required',
+                'has_viewed': False
+            }, http_status.HTTP_400_BAD_REQUEST)
+
+        try:
+            view_record = await todays_view(slug, fingerprint).only(
+                'viewed_at', 'last_seen', 'duration_seconds', 'viewed_date').aget()
+        except BlogView.DoesNotExist:
+            if not await published_blogs(slug).aexists():
+                return not_found()
+            return json_response({
+                'success': True,
+                'has_viewed': False,
+                'message': 'No view record found for today'
+            })
+
+        return json_response({
+            'success': True,
+            'has_viewed': True,
+            'first_viewed_at': view_record.viewed_at.isoformat(),
+            'last_seen': view_record.last_seen.isoformat(),
+            'total_duration': view_record.duration_seconds,
+            'total_duration_display': view_record.get_duration_display(),
+            'viewed_date': view_record.viewed_date.isoformat()
+        })
+
+
+class BlogLiveAPIView(AsyncEngagementView):
+    """
+    GET /api/blog-posts/<slug>/live/
+    Streams the post's counters as Server-Sent Events while the reader has
+    it open (see live.py). Async-only twin of views.BlogLiveAPIView, which
+    sends them once.
+    """
+
+    async def get(self, request, slug):
+        hub = live.get_hub()
+        counters = hub.latest.get(slug)
+        if counters is None:
+            try:
+                blog = await published_blogs(slug).only('slug', *live.COUNTER_FIELDS).aget()
+            except Blog.DoesNotExist:
+                return not_found()
+            counters = live.counters_of(blog)
+
+        # GZipMiddleware would compress each message on its own, which
+        # browsers don't decode as a stream; it skips clients without gzip
+        request.META.pop('HTTP_ACCEPT_ENCODING', None)
+        return StreamingHttpResponse(hub.stream(slug, counters), content_type='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',  # nginx: pass each message on as it comes
+        })
@@ -2,13 +2,31 @@
 Backup and Restore Utilities for Portfolio Data
 Handles export/import of all portfolio data including JSON, markdown files, and media.
 Auto-detects all models in the 'api' app for export/import.
+
+Both directions take an optional progress(fraction, message) callback, which
+the background job worker (api/jobs.py) uses to report how far along a
+backup or restore is.
+
+Incremental backups: every backup stores digests.json, a digest of each
+exported row and the size, mtime and SHA-256 of each media file. Given a
+base backup, export_portfolio_data compares the current data with the
+base's digests. It writes only new or changed rows and media, plus the
+primary keys and paths deleted since then. Digests are used rather than
+updated_at because several models have no timestamps, and counters are
+bumped with queryset.update(), which skips auto_now. manifest.json records
+the backup's id, its base and the chain back to the full backup.
+import_portfolio_data restores a full backup and then each increment in
+chain order.
 """
 
 import os
 import json
+import hashlib
 import shutil
+import uuid
 import zipfile
-from datetime import datetime
+from datetime import datetime, time
+from itertools import chain as chain_iterables
 from pathlib import Path
 from django.core import serializers
 from django.conf import settings
@@ -16,6 +34,57 @@ from django.core.files.storage import default_storage
 from django.apps import apps
 
 
+# Models rebuilt from other data after an import instead of being exported
+DERIVED_MODELS = {
+    'RelatedBlog',
+    'Tag',
+    'BlogTag',
+    'ProjectTag',
+    'ResearchPublicationTag',
+}
+
+# Bookkeeping of this installation, not portfolio data
+INTERNAL_MODELS = {
+    'BackgroundJob',
+}
+
+# Columns computed from other data: left out of backups and their digests,
+# so a recompute doesn't make every row look changed, and rebuilt on import
+DERIVED_FIELDS = {
+    'Blog': {'trending_score', 'trending_score_updated_at'},
+}
+
+
+DIGESTS_FILE = 'digests.json'
+
+# Primary keys per query when selecting or deleting rows by key
+PK_BATCH_SIZE = 500
+
+
+def report_progress(progress, fraction, message):
+    """Call the optional progress(fraction, message) callback."""
+    if progress is not None:
+        progress(min(max(fraction, 0.0), 1.0), message)
+
+
+def rebuild_derived_data():
+    """
+    Rebuild indexes and DERIVED_FIELDS derived from the exported models.
+    Returns a dict of {index_name: rows_written or stats}.
+    """
+    from .related import rebuild_related_blogs
+    from .search import rebuild_search_index
+    from .tags import rebuild_tag_index
+    from .trending import update_trending_scores
+
+    return {
+        'related_blogs': rebuild_related_blogs(),
+        'search_index': rebuild_search_index(),
+        'tag_links': rebuild_tag_index(),
+        'trending_scores': update_trending_scores(full=True),
+    }
+
+
 def get_exportable_models():
     """
     Auto-detect all models in the 'api' app that should be exported.
@@ -61,6 +130,10 @@ def get_exportable_models():
         if model_name.startswith('_'):
             continue
 
+        # Derived indexes are rebuilt after import
+        if model_name in DERIVED_MODELS or model_name in INTERNAL_MODELS:
+            continue
+
         # Get priority (default to 25 if not specified)
         priority = priority_map.get(model_name, 25)
 
@@ -77,20 +150,133 @@ def get_exportable_models():
     return models
 
 
-def export_portfolio_data(export_dir=None):
+def backup_fields(model):
+    """The concrete fields of `model` that go into a backup (no DERIVED_FIELDS)."""
+    derived = DERIVED_FIELDS.get(model.__name__, ())
+    return [field for field in model._meta.concrete_fields if field.name not in derived]
+
+
+def row_digests(model):
+    """
+    {primary key as str: digest} of every row of `model`, computed from the
+    raw column values (no model instances are built).
+    """
+    fields = [field.attname for field in backup_fields(model)]
+    pk_index = fields.index(model._meta.pk.attname)
+    rows = model.objects.order_by().values_list(*fields).iterator(chunk_size=2000)
+    return {
+        str(row[pk_index]): hashlib.blake2b(repr(tuple(map(backup_value, row))).encode(), digest_size=8).hexdigest()
+        for row in rows
+    }
+
+
+def backup_value(value):
+    """`value` as it survives a JSON backup: times keep milliseconds only."""
+    if isinstance(value, (datetime, time)) and value.microsecond % 1000:
+        return value.replace(microsecond=value.microsecond - value.microsecond % 1000)
+    return value
+
+
+def rows_by_pk(model, pks):
+    """The rows of `model` with the given primary keys, queried in batches."""
+    return chain_iterables.from_iterable(
+        model.objects.filter(pk__in=pks[i:i + PK_BATCH_SIZE]).order_by('pk')
+        for i in range(0, len(pks), PK_BATCH_SIZE)
+    )
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def media_digests(media_root, previous=None):
+    """
+    {relative path: [size, mtime_ns, sha256]} of every file under media_root.
+    Files whose size and mtime match `previous` keep their recorded hash
+    instead of being read again.
+    """
+    previous = previous or {}
+    digests = {}
+    if not media_root.exists():
+        return digests
+    for item in media_root.rglob('*'):
+        if not item.is_file():
+            continue
+        relative_path = item.relative_to(media_root).as_posix()
+        stat = item.stat()
+        known = previous.get(relative_path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            digests[relative_path] = known
+        else:
+            digests[relative_path] = [stat.st_size, stat.st_mtime_ns, file_sha256(item)]
+    return digests
+
+
+def read_backup_file(zip_path, name):
+    """Parsed JSON member `name` of a backup ZIP, or None if it has none."""
+    with zipfile.ZipFile(zip_path, 'r') as zipf:
+        try:
+            return json.loads(zipf.read(name))
+        except KeyError:
+            return None
+
+
+def read_manifest(zip_path):
+    return read_backup_file(zip_path, 'manifest.json') or {}
+
+
+def find_base_backup(full_only=False, exports_dir=None):
+    """
+    Newest backup ZIP in exports_dir that an incremental backup can be based
+    on (one with digests), or None. full_only=True picks the newest full
+    backup, for a differential backup.
+    """
+    exports_dir = Path(exports_dir or Path(settings.BASE_DIR) / 'exports')
+    candidates = []
+    for zip_path in exports_dir.glob('*.zip'):
+        try:
+            manifest = read_manifest(zip_path)
+        except (zipfile.BadZipFile, ValueError, OSError):
+            continue
+        if not manifest.get('backup_id') or not manifest.get('has_digests'):
+            continue
+        if full_only and manifest.get('backup_type') != 'full':
+            continue
+        candidates.append((manifest['export_date'], zip_path))
+    return max(candidates)[1] if candidates else None
+
+
+def export_portfolio_data(export_dir=None, progress=None, base=None):
     """
     Export all portfolio data to a directory structure.
     Returns the path to the created zip file.
     Raises exceptions with detailed messages if export fails.
     Auto-detects all models in the 'api' app for export.
+    Reports to progress(fraction, message) if given.
+
+    With `base` (the path of an earlier backup ZIP) only the rows and media
+    that changed since that backup are exported, as an incremental backup
+    that is restored on top of it.
     """
     from .models import Blog
 
+    base_manifest = base_digests = None
+    if base is not None:
+        base_manifest = read_manifest(base)
+        base_digests = read_backup_file(base, DIGESTS_FILE)
+        if not base_manifest.get('backup_id') or base_digests is None:
+            raise Exception(f"{Path(base).name} can't be the base of an incremental backup: it has no digests")
+
     try:
         # Create export directory
         if export_dir is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            export_dir = Path(settings.BASE_DIR) / 'exports' / f'portfolio_backup_{timestamp}'
+            suffix = '_incremental' if base is not None else ''
+            export_dir = Path(settings.BASE_DIR) / 'exports' / f'portfolio_backup_{timestamp}{suffix}'
         else:
             export_dir = Path(export_dir)
 
@@ -101,14 +287,36 @@ def export_portfolio_data(export_dir=None):
     # Get all exportable models (auto-detected)
     models_to_export = get_exportable_models()
 
-    # 1. Export all models as JSON
+    # 1. Export all models (or the rows changed since the base) as JSON
+    digests = {'rows': {}, 'media': {}}
+    changed_pks = {}
+    changed_counts = {}
+    deleted = {}
     try:
         json_dir = export_dir / 'json_data'
         json_dir.mkdir(exist_ok=True)
 
-        for filename, model, priority in models_to_export:
+        for number, (filename, model, priority) in enumerate(models_to_export):
+            report_progress(progress, 0.4 * number / len(models_to_export), f'Exporting {filename}')
             try:
-                data = serializers.serialize('json', model.objects.all(), indent=2)
+                current = row_digests(model)
+                digests['rows'][model.__name__] = current
+                if base_digests is None:
+                    rows = model.objects.all()
+                else:
+                    previous = base_digests['rows'].get(model.__name__, {})
+                    pk_field = model._meta.pk
+                    changed = [pk_field.to_python(pk) for pk, digest in current.items() if previous.get(pk) != digest]
+                    removed = [pk_field.to_python(pk) for pk in previous if pk not in current]
+                    if removed:
+                        deleted[model.__name__] = removed
+                    changed_pks[model.__name__] = changed
+                    changed_counts[model.__name__] = len(changed)
+                    if not changed:
+                        continue
+                    rows = rows_by_pk(model, changed)
+                fields = [field.name for field in backup_fields(model) if not field.primary_key]
+                data = serializers.serialize('json', rows, indent=2, fields=fields)
                 with open(json_dir / f'{filename}.json', 'w', encoding='utf-8') as f:
                     f.write(data)
             except Exception as e:
@@ -117,10 +325,15 @@ def export_portfolio_data(export_dir=None):
         raise Exception(f"Failed to export JSON data: {str(e)}")
 
     # 2. Export blogs as markdown files
+    report_progress(progress, 0.4, 'Writing blog posts as Markdown')
     blogs_dir = export_dir / 'blogs_markdown'
     blogs_dir.mkdir(exist_ok=True)
 
-    for blog in Blog.objects.all():
+    blogs = Blog.objects.all()
+    if base_digests is not None:
+        blogs = rows_by_pk(Blog, changed_pks.get('Blog', []))
+
+    for blog in blogs:
         # Create safe filename from slug
         filename = f"{blog.slug}.md"
         filepath = blogs_dir / filename
@@ -152,35 +365,68 @@ cover_image: {blog.cover_image}
     media_dir = export_dir / 'media_files'
     media_dir.mkdir(exist_ok=True)
 
-    # Copy all uploaded media files
+    # Copy all uploaded media files (new or changed ones for an incremental backup)
     media_root = Path(settings.MEDIA_ROOT)
-    if media_root.exists():
-        for item in media_root.rglob('*'):
-            if item.is_file():
-                # Preserve directory structure
-                relative_path = item.relative_to(media_root)
-                dest_path = media_dir / relative_path
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(item, dest_path)
+    report_progress(progress, 0.45, 'Hashing media files')
+    base_media = base_digests['media'] if base_digests is not None else {}
+    digests['media'] = media_digests(media_root, base_media)
+    media_files = [
+        relative_path for relative_path, (size, mtime_ns, sha256) in digests['media'].items()
+        if base_digests is None or base_media.get(relative_path, [None, None, None])[2] != sha256
+    ]
+    for number, relative_path in enumerate(media_files):
+        report_progress(progress, 0.5 + 0.35 * number / len(media_files),
+                        f'Copying media file {number + 1} of {len(media_files)}')
+        # Preserve directory structure
+        dest_path = media_dir / relative_path
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(media_root / relative_path, dest_path)
 
     # 4. Create a manifest file with metadata
     model_counts = {}
     for filename, model, priority in models_to_export:
-        model_counts[model.__name__] = model.objects.count()
+        model_counts[model.__name__] = len(digests['rows'][model.__name__])
 
+    backup_id = uuid.uuid4().hex
     manifest = {
         'export_date': datetime.now().isoformat(),
         'django_version': '5.2.8',  # Update as needed
         'models_exported': [filename for filename, _, _ in models_to_export],
         'model_counts': model_counts,
+        'backup_id': backup_id,
+        'backup_type': 'full' if base is None else 'incremental',
+        'has_digests': True,
+        'chain': [backup_id],
     }
+    if base is not None:
+        manifest.update({
+            'base': {
+                'backup_id': base_manifest['backup_id'],
+                'filename': Path(base).name,
+                'export_date': base_manifest['export_date'],
+            },
+            'chain': base_manifest.get('chain', [base_manifest['backup_id']]) + [backup_id],
+            'changed_counts': changed_counts,
+            'deleted': deleted,
+            'media_copied': len(media_files),
+            'media_deleted': sorted(set(base_media) - set(digests['media'])),
+        })
 
     with open(export_dir / 'manifest.json', 'w', encoding='utf-8') as f:
         json.dump(manifest, f, indent=2)
 
+    with open(export_dir / DIGESTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(digests, f, separators=(',', ':'))
+
     # 5. Create README
-    models_list = '\n'.join([f"- {model.__name__}: {model.objects.count()}"
+    models_list = '\n'.join([f"- {model.__name__}: {model_counts[model.__name__]}"
                              for _, model, _ in models_to_export])
+    if base is not None:
+        models_list = (
+            f"Incremental backup: only the changes since {Path(base).name}.\n"
+            f"Restore it together with every backup in its chain (see manifest.json).\n\n"
+            f"Rows in the database when it was made:\n{models_list}"
+        )
 
     readme_content = f"""# Portfolio Data Backup
 Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -189,12 +435,13 @@ Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 - json_data/: All database models exported as JSON
 - blogs_markdown/: Blog posts in Markdown format (if any)
 - media_files/: All uploaded media files (images, documents, etc.)
-- manifest.json: Backup metadata
+- manifest.json: Backup metadata (and the chain of an incremental backup)
+- digests.json: Row and media digests that incremental backups compare against
 
 ## To Restore:
 1. Upload this zip file to your Django admin panel
 2. Go to: /admin/api/backuprestore/
-3. Select the zip file and click "Import Data"
+3. Select the zip file (with its base backups, if incremental) and click "Import Data"
 4. All data will be restored to the database
 
 ## Models Included:
@@ -208,12 +455,12 @@ WARNING: Importing will overwrite existing data!
 
     # 6. Create ZIP file
     zip_path = export_dir.parent / f'{export_dir.name}.zip'
+    file_paths = [os.path.join(root, file) for root, dirs, files in os.walk(export_dir) for file in files]
     with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(export_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, export_dir)
-                zipf.write(file_path, arcname)
+        for number, file_path in enumerate(file_paths):
+            report_progress(progress, 0.85 + 0.15 * number / len(file_paths), 'Compressing the backup')
+            arcname = os.path.relpath(file_path, export_dir)
+            zipf.write(file_path, arcname)
 
     # 7. Clean up temporary directory
     shutil.rmtree(export_dir)
@@ -221,108 +468,214 @@ WARNING: Importing will overwrite existing data!
     return zip_path
 
 
-def import_portfolio_data(zip_path, overwrite=False):
+def order_backup_chain(backups):
+    """
+    Order (zip_path, manifest) pairs so that every incremental backup comes
+    right after its base. Raises ValueError unless they form a single chain.
     """
-    Import portfolio data from a backup zip file.
+    if len(backups) == 1:
+        return list(backups)
+
+    ids = {manifest.get('backup_id') for _, manifest in backups} - {None}
+    roots = []
+    children = {}
+    for zip_path, manifest in backups:
+        base_id = (manifest.get('base') or {}).get('backup_id')
+        if base_id in ids:
+            children.setdefault(base_id, []).append((zip_path, manifest))
+        else:
+            roots.append((zip_path, manifest))
+
+    if len(roots) != 1:
+        for zip_path, manifest in roots:
+            if manifest.get('base'):
+                raise ValueError(
+                    f"{Path(zip_path).name} is based on {manifest['base']['filename']}, which is missing")
+        names = ', '.join(Path(zip_path).name for zip_path, _ in roots)
+        raise ValueError(f"The backups don't form one chain: {names}")
+
+    ordered = roots
+    while True:
+        following = children.pop(ordered[-1][1].get('backup_id'), [])
+        if not following:
+            break
+        if len(following) > 1:
+            names = ' and '.join(Path(zip_path).name for zip_path, _ in following)
+            raise ValueError(f"{names} are both based on {Path(ordered[-1][0]).name}; restore only one of them")
+        ordered.append(following[0])
+    return ordered
+
+
+def restore_backup(backup_dir, manifest, models_info, results, progress, start, span):
+    """
+    Restore one extracted backup on top of the current data. An incremental
+    backup first removes the rows and media files deleted since its base.
+    """
+    from django.core import serializers as django_serializers
+
+    # Remove deleted rows in reverse priority order (dependent models first)
+    deleted = manifest.get('deleted') or {}
+    for filename, model, priority in sorted(models_info, key=lambda x: x[2], reverse=True):
+        pks = deleted.get(model.__name__)
+        if not pks:
+            continue
+        try:
+            for i in range(0, len(pks), PK_BATCH_SIZE):
+                model.objects.filter(pk__in=pks[i:i + PK_BATCH_SIZE]).delete()
+            key = f'{model.__name__}_removed'
+            results['imported'][key] = results['imported'].get(key, 0) + len(pks)
+        except Exception as e:
+            results['errors'].append(f"Error removing deleted {model.__name__} rows: {str(e)}")
+
+    # Import JSON data
+    json_dir = backup_dir / 'json_data'
+    if json_dir.exists():
+        # Import in normal priority order (lowest priority first)
+        # This ensures independent models are imported before dependent ones
+        for number, (filename, model, priority) in enumerate(models_info):
+            json_filename = f'{filename}.json'
+            filepath = json_dir / json_filename
+            report_progress(progress, start + 0.7 * span * number / len(models_info), f'Importing {json_filename}')
+
+            if filepath.exists():
+                results['imported'].setdefault(json_filename, 0)
+                try:
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        data = f.read()
+                        objects = django_serializers.deserialize('json', data)
+                        count = 0
+                        for obj in objects:
+                            obj.save()
+                            count += 1
+                        results['imported'][json_filename] += count
+                except Exception as e:
+                    error_msg = f"Error importing {json_filename}: {type(e).__name__}: {str(e)}"
+                    results['errors'].append(error_msg)
+
+    # Restore media files
+    media_root = Path(settings.MEDIA_ROOT)
+    for relative_path in manifest.get('media_deleted') or []:
+        path = (media_root / relative_path).resolve()
+        if media_root.resolve() in path.parents:
+            path.unlink(missing_ok=True)
+
+    media_dir = backup_dir / 'media_files'
+    if media_dir.exists():
+        media_root.mkdir(parents=True, exist_ok=True)
+
+        copied_files = 0
+        media_files = [item for item in media_dir.rglob('*') if item.is_file()]
+        for item in media_files:
+            report_progress(progress, start + span * (0.7 + 0.3 * copied_files / len(media_files)),
+                            f'Restoring media file {copied_files + 1} of {len(media_files)}')
+            relative_path = item.relative_to(media_dir)
+            dest_path = media_root / relative_path
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(item, dest_path)
+            copied_files += 1
+
+        results['imported']['media_files_copied'] = results['imported'].get('media_files_copied', 0) + copied_files
+
+
+def import_portfolio_data(zip_path, overwrite=False, progress=None):
+    """
+    Import portfolio data from a backup zip file, or from a full backup and
+    the incremental backups made on top of it.
     Auto-detects all models from the exported data.
 
     Args:
-        zip_path: Path to the backup zip file
+        zip_path: Path to the backup zip file, or a list of paths: a full
+            backup and its incremental backups, in any order
         overwrite: If True, will overwrite existing data
+        progress: Optional progress(fraction, message) callback
 
     Returns:
         dict: Import results with counts and status
     """
-    from django.core import serializers as django_serializers
-
     # Get all exportable models (auto-detected)
     models_info = get_exportable_models()
 
-    # Extract zip to temporary directory
-    import_dir = Path(settings.BASE_DIR) / 'temp_import'
-    if import_dir.exists():
-        shutil.rmtree(import_dir)
-    import_dir.mkdir(parents=True, exist_ok=True)
-
-    with zipfile.ZipFile(zip_path, 'r') as zipf:
-        zipf.extractall(import_dir)
-
     results = {
         'success': True,
         'imported': {},
         'errors': [],
     }
 
+    # Read manifest(s) and put the backups in chain order
+    zip_paths = [zip_path] if isinstance(zip_path, (str, os.PathLike)) else list(zip_path)
     try:
-        # Read manifest
-        manifest_path = import_dir / 'manifest.json'
-        if manifest_path.exists():
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                manifest = json.load(f)
-                results['manifest'] = manifest
-
-        # Clear existing data if overwrite is True
-        if overwrite:
-            # Delete in reverse priority order (highest priority first)
-            # This ensures models with FKs are deleted before their references
-            models_to_clear = sorted(models_info, key=lambda x: x[2], reverse=True)
-
-            for filename, model, priority in models_to_clear:
-                try:
-                    count = model.objects.count()
-                    model.objects.all().delete()
-                    results['imported'][f'{model.__name__}_deleted'] = count
-                except Exception as e:
-                    results['errors'].append(f"Error deleting {model.__name__}: {str(e)}")
-
-        # Import JSON data
-        json_dir = import_dir / 'json_data'
-        if json_dir.exists():
-            # Import in normal priority order (lowest priority first)
-            # This ensures independent models are imported before dependent ones
-            for filename, model, priority in models_info:
-                json_filename = f'{filename}.json'
-                filepath = json_dir / json_filename
-
-                if filepath.exists():
+        backups = order_backup_chain([(Path(path), read_manifest(path)) for path in zip_paths])
+    except (ValueError, zipfile.BadZipFile) as e:
+        results['success'] = False
+        results['errors'].append(f"Import failed: {str(e)}")
+        return results
+
+    first_manifest = backups[0][1]
+    if overwrite and first_manifest.get('backup_type') == 'incremental':
+        results['success'] = False
+        results['errors'].append(
+            f"Import failed: {backups[0][0].name} is an incremental backup; "
+            f"restore it together with its base {first_manifest['base']['filename']} and the rest of its chain"
+        )
+        return results
+
+    results['manifest'] = backups[-1][1]
+    if len(backups) > 1:
+        results['chain'] = [path.name for path, _ in backups]
+
+    # Extract zips to temporary directory
+    import_dir = Path(settings.BASE_DIR) / 'temp_import'
+    if import_dir.exists():
+        shutil.rmtree(import_dir)
+    import_dir.mkdir(parents=True, exist_ok=True)
+
+    # rebuild_derived_data() rebuilds related posts once at the end, so the
+    # blogs deleted and restored on the way don't each queue a related job
+    from .related import related_updates_paused
+
+    with related_updates_paused():
+        try:
+            report_progress(progress, 0.0, 'Extracting the backup')
+            for index, (path, manifest) in enumerate(backups):
+                with zipfile.ZipFile(path, 'r') as zipf:
+                    zipf.extractall(import_dir / str(index))
+
+            # Clear existing data if overwrite is True
+            if overwrite:
+                report_progress(progress, 0.1, 'Deleting existing data')
+                # Delete in reverse priority order (highest priority first)
+                # This ensures models with FKs are deleted before their references
+                models_to_clear = sorted(models_info, key=lambda x: x[2], reverse=True)
+
+                for filename, model, priority in models_to_clear:
                     try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = f.read()
-                            objects = django_serializers.deserialize('json', data)
-                            count = 0
-                            for obj in objects:
-                                obj.save()
-                                count += 1
-                            results['imported'][json_filename] = count
+                        count = model.objects.count()
+                        model.objects.all().delete()
+                        results['imported'][f'{model.__name__}_deleted'] = count
                     except Exception as e:
-                        error_msg = f"Error importing {json_filename}: {type(e).__name__}: {str(e)}"
-                        results['errors'].append(error_msg)
-                        results['imported'][json_filename] = 0
-
-        # Restore media files
-        media_dir = import_dir / 'media_files'
-        if media_dir.exists():
-            media_root = Path(settings.MEDIA_ROOT)
-            media_root.mkdir(parents=True, exist_ok=True)
-
-            copied_files = 0
-            for item in media_dir.rglob('*'):
-                if item.is_file():
-                    relative_path = item.relative_to(media_dir)
-                    dest_path = media_root / relative_path
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(item, dest_path)
-                    copied_files += 1
-
-            results['imported']['media_files_copied'] = copied_files
+                        results['errors'].append(f"Error deleting {model.__name__}: {str(e)}")
 
-    except Exception as e:
-        results['success'] = False
-        results['errors'].append(f"Import failed: {str(e)}")
+            # Restore the backups in chain order: the full one, then each increment
+            span = 0.7 / len(backups)
+            for index, (path, manifest) in enumerate(backups):
+                restore_backup(
+                    import_dir / str(index), manifest, models_info, results, progress, 0.2 + index * span, span)
+
+            # Rebuild derived indexes from the restored data
+            report_progress(progress, 0.9, 'Rebuilding search, tag and related-post indexes and trending scores')
+            try:
+                for name, count in rebuild_derived_data().items():
+                    results['imported'][f'{name}_rebuilt'] = count
+            except Exception as e:
+                results['errors'].append(f"Error rebuilding derived data: {str(e)}")
+
+        except Exception as e:
+            results['success'] = False
+            results['errors'].append(f"Import failed: {str(e)}")
 
-    finally:
-        # Clean up temporary directory
-        if import_dir.exists():
-            shutil.rmtree(import_dir)
+        finally:
+            # Clean up temporary directory
+            if import_dir.exists():
+                shutil.rmtree(import_dir)
 
     return results
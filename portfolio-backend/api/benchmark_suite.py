@@ -0,0 +1,242 @@
+"""
+Micro-benchmarks for the hot functions behind the API (run_benchmarks command).
+
+Each benchmark is a zero-argument callable timed with benchmarking.measure()
+over several rounds, so results carry min/median/mean/stdev and can be saved
+as JSON and compared between commits.
+
+The suite runs with a private local-memory cache, MEDIA_ROOT and BASE_DIR in
+a temporary directory; the backup benchmarks also get a scratch test
+database filled by datagen.generate_dataset(). Nothing touches the real
+database, cache or media.
+"""
+
+import platform
+import random
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import django
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test.utils import override_settings
+
+from .benchmarking import git_revision, measure
+from .datagen import generate_dataset, generate_markdown
+from .models import Blog, HomeData, MediaFile
+from .rendering import markdown_cache_key
+
+# (label, approximate markdown bytes) for get_content_html
+MARKDOWN_SIZES = [('small', 1000), ('medium', 12000), ('huge', 250000)]
+FILE_SIZES = [('bytes', 512), ('megabytes', 15 * 1024 ** 2), ('terabytes', 3 * 1024 ** 4)]
+BENCHMARK_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class Benchmark:
+
+    def __init__(self, name, func, group, params=None, number=None, setup=None):
+        self.name = name
+        self.func = func
+        self.group = group
+        self.params = params or {}
+        # None lets measure() pick a number of calls filling its minimum time
+        self.number = number
+        self.setup = setup
+
+
+def markdown_benchmarks(seed):
+    """BlogSerializer.get_content_html on small, medium and huge posts, rendered and cached."""
+    from .serializers import BlogSerializer
+
+    rng = random.Random(seed)
+    serializer = BlogSerializer()
+    benchmarks = []
+    for label, size in MARKDOWN_SIZES:
+        blog = Blog(content_markdown=generate_markdown(rng, size))
+        key = markdown_cache_key(blog.content_markdown)
+        params = {'markdown_bytes': len(blog.content_markdown)}
+
+        def render(blog=blog, key=key):
+            cache.delete(key)
+            return serializer.get_content_html(blog)
+
+        benchmarks.append(Benchmark(f'content_html[{label}]', render, 'markdown', params))
+        benchmarks.append(Benchmark(
+            f'content_html[{label}, cached]', lambda blog=blog: serializer.get_content_html(blog), 'markdown',
+            params, setup=lambda blog=blog: serializer.get_content_html(blog),
+        ))
+    return benchmarks
+
+
+def home_data_benchmarks(seed):
+    """HomeDataSerializer.to_representation on a fully filled-in home page."""
+    from .serializers import HomeDataSerializer
+
+    rng = random.Random(seed)
+    words = generate_markdown(rng, 4000).split()
+    home = HomeData(
+        pk=1,
+        hero_name='Benchmark Person',
+        hero_bio=' '.join(words[:60]),
+        about_paragraphs=[' '.join(words[i:i + 80]) for i in range(0, 400, 80)],
+        about_highlights=[' '.join(words[i:i + 6]) for i in range(0, 60, 6)],
+        stats_projects_completed=42,
+        stats_publications=7,
+        stats_technologies_used=30,
+        skills_categories=[
+            {'name': words[i], 'icon': 'code', 'skills': words[i:i + 12]}
+            for i in range(0, 96, 12)
+        ],
+        social_github='https://github.com/example',
+        social_email='person@example.com',
+    )
+    serializer = HomeDataSerializer()
+    return [Benchmark('home_data.to_representation', lambda: serializer.to_representation(home), 'serializers')]
+
+
+def file_size_benchmarks():
+    benchmarks = []
+    for label, size in FILE_SIZES:
+        media = MediaFile(file_size=size)
+        benchmarks.append(Benchmark(
+            f'file_size_display[{label}]', media.get_file_size_display, 'models', {'file_size': size}))
+    return benchmarks
+
+
+def backup_benchmarks(work_dir, dataset):
+    """
+    export_portfolio_data and import_portfolio_data(overwrite=True) on the
+    generated dataset. Each call is timed on its own (number=1); the import
+    restores the exported zip, so the data is the same every round. The
+    incremental export is based on that zip after one blog post changed.
+    """
+    from .backup_utils import export_portfolio_data, import_portfolio_data
+
+    export_dir = Path(work_dir) / 'exports' / 'benchmark_backup'
+    zip_path = export_dir.parent / f'{export_dir.name}.zip'
+    incremental_dir = export_dir.parent / 'benchmark_incremental'
+    params = dict(dataset)
+
+    def export():
+        return export_portfolio_data(export_dir)
+
+    def export_incremental():
+        return export_portfolio_data(incremental_dir, base=zip_path)
+
+    def setup_incremental():
+        export()
+        Blog.objects.filter(pk__in=Blog.objects.order_by('pk').values('pk')[:1]).update(views=F('views') + 1)
+        params['zip_bytes'] = zip_path.stat().st_size
+
+    def restore():
+        results = import_portfolio_data(zip_path, overwrite=True)
+        if results['errors']:
+            raise RuntimeError('; '.join(results['errors']))
+        return results
+
+    def setup_import():
+        export()
+        params['zip_bytes'] = zip_path.stat().st_size
+
+    return [
+        Benchmark('export_portfolio_data', export, 'backup', params, number=1),
+        Benchmark('import_portfolio_data', restore, 'backup', params, number=1, setup=setup_import),
+        Benchmark('export_portfolio_data[incremental]', export_incremental, 'backup', params, number=1,
+                  setup=setup_incremental),
+    ]
+
+
+@contextmanager
+def isolated_environment():
+    """Temporary BASE_DIR/MEDIA_ROOT and a private cache; yields the directory."""
+    work_dir = tempfile.mkdtemp(prefix='benchmarks-')
+    try:
+        media_root = Path(work_dir) / 'media'
+        with override_settings(BASE_DIR=Path(work_dir), MEDIA_ROOT=media_root, CACHES=BENCHMARK_CACHES):
+            cache.clear()
+            yield work_dir
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+@contextmanager
+def scratch_database():
+    """Create the test database for the duration of the block, like the test runner does."""
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def run_benchmarks(repeat=7, min_time=0.2, seed=42, select=None, backup_blogs=100, backup_views=20000,
+                   backup_repeat=3, progress=None):
+    """
+    Run the suite and return its results.
+
+    Args:
+        repeat: Timing rounds per benchmark (backup benchmarks use backup_repeat)
+        min_time: Minimum seconds per round when picking the number of calls
+        select: Optional substring; only benchmarks whose name contains it run
+        backup_blogs, backup_views: Size of the generated dataset for backups
+        progress: Optional callable(name) called before each benchmark
+
+    Returns:
+        dict: 'meta' and a list of 'results' (name, group, params and timings)
+    """
+    def selected(benchmarks):
+        return [benchmark for benchmark in benchmarks if not select or select in benchmark.name]
+
+    def run(benchmarks, rounds):
+        for benchmark in benchmarks:
+            if progress:
+                progress(benchmark.name)
+            if benchmark.setup:
+                benchmark.setup()
+            if benchmark.number is None:
+                # First calls pay for imports and compiled regexes
+                benchmark.func()
+            timing = measure(benchmark.func, repeat=rounds, number=benchmark.number, min_time=min_time)
+            results.append({'name': benchmark.name, 'group': benchmark.group, 'params': benchmark.params, **timing})
+
+    results = []
+    with isolated_environment() as work_dir:
+        run(selected(markdown_benchmarks(seed) + home_data_benchmarks(seed) + file_size_benchmarks()), repeat)
+
+        dataset = {'blogs': backup_blogs, 'views': backup_views, 'likes': backup_views // 20,
+                   'comments': backup_views // 50, 'projects': 20, 'media': 10}
+        backup = selected(backup_benchmarks(work_dir, dataset))
+        if backup:
+            with scratch_database():
+                generate_dataset(seed=seed, **dataset)
+                run(backup, backup_repeat)
+
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline, current):
+    """
+    Median change per benchmark present in both runs.
+
+    Returns:
+        list: (name, baseline median, current median, relative change)
+    """
+    before = {result['name']: result['median'] for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        if result['name'] in before:
+            old = before[result['name']]
+            rows.append((result['name'], old, result['median'], (result['median'] - old) / old if old else None))
+    return rows
@@ -0,0 +1,68 @@
+"""
+Small timing helpers shared by the benchmark management commands.
+"""
+
+import statistics
+import subprocess
+import time
+
+from django.conf import settings
+
+
+def autorange(func, min_time=0.2):
+    """Return how many calls of `func` take at least `min_time` seconds."""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - started >= min_time:
+            return number
+        number *= 2
+
+
+def measure(func, repeat=5, number=None, min_time=0.2):
+    """
+    Time `func` over `repeat` rounds of `number` calls each.
+
+    Returns:
+        dict: Per-call seconds (min, median, mean, stdev) plus the
+        number/repeat used, so results can be compared between runs
+    """
+    if number is None:
+        number = autorange(func, min_time)
+
+    per_call = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - started) / number)
+
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min': min(per_call),
+        'median': statistics.median(per_call),
+        'mean': statistics.fmean(per_call),
+        'stdev': statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    }
+
+
+def format_seconds(seconds):
+    """Format a duration with a unit suited to its size."""
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.1f} µs'
+    if seconds < 1:
+        return f'{seconds * 1e3:.2f} ms'
+    return f'{seconds:.2f} s'
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=settings.BASE_DIR, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
@@ -0,0 +1,492 @@
+"""
+Synthetic data for load and performance testing (generate_dataset command).
+
+Everything is drawn from one seeded random.Random, so the same arguments
+produce the same dataset. Popularity is heavy-tailed the way real traffic
+is: blogs and readers are ranked and drawn with Zipf weights, so a few
+posts get most views and a few devices do most of the reading. Markdown
+bodies have log-normally distributed sizes with headings, lists, tables and
+fenced code blocks.
+
+Rows are written with bulk_create in batches. Generated timestamps replace
+auto_now/auto_now_add values while generating (see explicit_timestamps),
+the denormalised counters on Blog are set from what was generated, and the
+derived indexes (tags, search, related posts, trending) are rebuilt at the
+end. Generated rows carry a 'gen-' prefix so clear_generated() can remove
+them without touching real content.
+"""
+
+import bisect
+import itertools
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, time as datetime_time, timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Blog, BlogComment, BlogLike, BlogView, MediaFile, Project
+from .related import related_updates_paused, schedule_related_update
+
+PREFIX = 'gen-'
+
+CATEGORIES = ['Machine Learning', 'Web Development', 'Databases', 'DevOps', 'Systems', 'Security', 'Career']
+TAGS = [
+    'Python', 'Django', 'JavaScript', 'TypeScript', 'PostgreSQL', 'SQLite', 'Docker', 'Kubernetes',
+    'Performance', 'Caching', 'Testing', 'Rust', 'Go', 'React', 'Astro', 'Linux', 'Networking',
+    'Observability', 'Security', 'Machine Learning', 'Data Engineering', 'APIs', 'Architecture', 'Career',
+]
+WORDS = (
+    'request response cache latency throughput query index database worker process thread queue '
+    'server client browser payload schema model view template serializer middleware handler '
+    'deploy container image cluster node replica shard partition transaction lock commit rollback '
+    'benchmark profile memory allocation garbage collector compiler runtime interpreter bytecode '
+    'function class module package dependency version release pipeline build artifact metric '
+    'trace log alert dashboard incident latency budget capacity traffic spike regression fix'
+).split()
+AUTHORS = ['Admin', 'Alex Morgan', 'Sam Lee', 'Jordan Kim', 'Riley Chen']
+
+CODE_SNIPPETS = {
+    'python': (
+        'def {name}(items):\n'
+        '    """{doc}"""\n'
+        '    result = {{}}\n'
+        '    for item in items:\n'
+        '        result.setdefault(item.key, []).append(item)\n'
+        '    return result\n'
+    ),
+    'javascript': (
+        'export async function {name}(url) {{\n'
+        '  // {doc}\n'
+        '  const response = await fetch(url);\n'
+        '  if (!response.ok) throw new Error(response.statusText);\n'
+        '  return response.json();\n'
+        '}}\n'
+    ),
+    'bash': (
+        '# {doc}\n'
+        'docker compose exec backend python manage.py {name}\n'
+        'curl -s http://localhost:8000/api/health/ | jq .\n'
+    ),
+    'sql': (
+        '-- {doc}\n'
+        'SELECT blog_id, COUNT(*) AS total\n'
+        'FROM api_blogview\n'
+        'WHERE viewed_date >= DATE(\'now\', \'-7 day\')\n'
+        'GROUP BY blog_id\n'
+        'ORDER BY total DESC\n'
+        'LIMIT 10;\n'
+    ),
+}
+
+# Median and spread of generated sizes (log-normal)
+MARKDOWN_MEDIAN_BYTES = 6000
+MARKDOWN_SIGMA = 0.7
+MARKDOWN_MAX_BYTES = 80000
+MEDIA_MEDIAN_BYTES = 120000
+MEDIA_SIGMA = 1.0
+MEDIA_MAX_BYTES = 5 * 1024 * 1024
+
+# Zipf exponents: blog popularity and reader activity
+BLOG_POPULARITY_EXPONENT = 1.1
+READER_ACTIVITY_EXPONENT = 0.9
+
+
+def zipf_cum_weights(count, exponent):
+    """Cumulative Zipf weights for ranks 1..count, for random.choices(cum_weights=...)."""
+    return list(itertools.accumulate(1.0 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def lognormal_size(rng, median, sigma, maximum):
+    return int(min(maximum, rng.lognormvariate(math.log(median), sigma)))
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    Let bulk_create() keep the timestamps set on the objects.
+
+    auto_now/auto_now_add fields overwrite any value in pre_save(); their
+    flags are switched off for the duration of the block and restored after.
+    """
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _sentence(rng, words=None):
+    words = words or rng.randint(8, 20)
+    text = ' '.join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def _title(rng):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 7))).title()
+
+
+def generate_markdown(rng, target_bytes):
+    """Markdown of roughly `target_bytes`: sections of prose, lists, tables and code."""
+    parts = [f'# {_title(rng)}', ' '.join(_sentence(rng) for _ in range(3))]
+    size = sum(len(part) for part in parts)
+    section = 0
+    while size < target_bytes:
+        section += 1
+        block = [f'## {section}. {_title(rng)}']
+        for _ in range(rng.randint(1, 3)):
+            block.append(' '.join(_sentence(rng) for _ in range(rng.randint(2, 6))))
+
+        roll = rng.random()
+        if roll < 0.45:
+            language = rng.choice(list(CODE_SNIPPETS))
+            code = CODE_SNIPPETS[language].format(name='_'.join(rng.sample(WORDS, 2)), doc=_sentence(rng, 6))
+            block.append(f'```{language}\n{code}```')
+        elif roll < 0.65:
+            block.append('\n'.join(f'- **{rng.choice(WORDS)}**: {_sentence(rng, 6)}' for _ in range(rng.randint(3, 6))))
+        elif roll < 0.75:
+            rows = [f'| {rng.choice(WORDS)} | {rng.randint(1, 999)} ms | {rng.randint(1, 100)}% |'
+                    for _ in range(rng.randint(3, 6))]
+            block.append('\n'.join(['| Case | Latency | Share |', '| ---- | ------- | ----- |', *rows]))
+        elif roll < 0.8:
+            block.append(f'> {_sentence(rng)}')
+
+        text = '\n\n'.join(block)
+        parts.append(text)
+        size += len(text) + 2
+    return '\n\n'.join(parts) + '\n'
+
+
+def _bulk_create(model, objects, batch_size):
+    with transaction.atomic():
+        model.objects.bulk_create(objects, batch_size=batch_size)
+    return len(objects)
+
+
+def _start_of_day(day):
+    moment = datetime.combine(day, datetime_time.min)
+    return timezone.make_aware(moment) if settings.USE_TZ else moment
+
+
+def create_blogs(rng, count, now, view_window_start, batch_size):
+    """Published blogs spread over the two years before the view window."""
+    oldest = view_window_start - timedelta(days=730)
+    span = (view_window_start - oldest).total_seconds()
+    blogs = []
+    for index in range(count):
+        title = _title(rng)
+        published = oldest + timedelta(seconds=rng.random() * span)
+        markdown = generate_markdown(rng, lognormal_size(rng, MARKDOWN_MEDIAN_BYTES, MARKDOWN_SIGMA, MARKDOWN_MAX_BYTES))
+        blogs.append(Blog(
+            slug=f'{PREFIX}{index}-{title.lower().replace(" ", "-")}'[:200],
+            title=title,
+            subtitle=_sentence(rng, 8),
+            excerpt=' '.join(_sentence(rng) for _ in range(2)),
+            content_markdown=markdown,
+            category=rng.choice(CATEGORIES),
+            tags=rng.sample(TAGS, rng.randint(1, 5)),
+            author=rng.choice(AUTHORS),
+            published_date=published,
+            created_at=published,
+            updated_at=published,
+            is_published=rng.random() < 0.95,
+            is_featured=rng.random() < 0.05,
+            is_editor_choice=rng.random() < 0.05,
+            read_time=max(1, len(markdown.split()) // 200),
+            meta_description=_sentence(rng, 12),
+        ))
+    with explicit_timestamps(Blog):
+        _bulk_create(Blog, blogs, batch_size)
+    return list(Blog.objects.filter(slug__startswith=PREFIX, is_published=True).order_by('id')
+                .values_list('id', flat=True))
+
+
+def create_views(rng, blog_ids, total, days, now, batch_size, progress=None):
+    """
+    Create about `total` BlogView rows over the last `days` days.
+
+    Blogs and readers are drawn with Zipf weights; each (blog, reader, day)
+    appears at most once, as the model requires. Days closer to now get more
+    views. Returns {blog_id: views}.
+    """
+    if not blog_ids or total <= 0:
+        return Counter()
+
+    popularity = zipf_cum_weights(len(blog_ids), BLOG_POPULARITY_EXPONENT)
+    ranked_blogs = rng.sample(blog_ids, len(blog_ids))
+    readers = max(100, total // 4)
+    activity = zipf_cum_weights(readers, READER_ACTIVITY_EXPONENT)
+
+    # Split the total over the days, weighted towards recent ones
+    day_weights = [1.0 + 2.0 * day / max(days - 1, 1) for day in range(days)]
+    weight_sum = sum(day_weights)
+    per_day = [int(total * weight / weight_sum) for weight in day_weights]
+    per_day[-1] += total - sum(per_day)
+
+    counts = Counter()
+    created = 0
+    start_day = timezone.localdate(now) - timedelta(days=days - 1)
+    with explicit_timestamps(BlogView):
+        for offset, quota in enumerate(per_day):
+            day = start_day + timedelta(days=offset)
+            day_start = _start_of_day(day)
+            seen = set()
+            batch = []
+            attempts = 0
+            while len(seen) < quota and attempts < quota * 3:
+                attempts += 1
+                blog_id = ranked_blogs[bisect.bisect(popularity, rng.random() * popularity[-1])]
+                reader = bisect.bisect(activity, rng.random() * activity[-1])
+                if (blog_id, reader) in seen:
+                    continue
+                seen.add((blog_id, reader))
+
+                viewed_at = min(now, day_start + timedelta(seconds=rng.randrange(86400)))
+                duration = int(min(3600, rng.lognormvariate(math.log(90), 1.0)))
+                batch.append(BlogView(
+                    blog_id=blog_id,
+                    fingerprint=f'{PREFIX}fp-{reader}',
+                    session_id=f'{PREFIX}s-{reader}-{offset}',
+                    ip_address=f'10.{reader // 65536 % 256}.{reader // 256 % 256}.{reader % 256}',
+                    user_agent='Mozilla/5.0 (generate_dataset)',
+                    viewed_at=viewed_at,
+                    viewed_date=day,
+                    last_seen=viewed_at + timedelta(seconds=duration),
+                    duration_seconds=duration,
+                ))
+                counts[blog_id] += 1
+                if len(batch) >= batch_size:
+                    created += _bulk_create(BlogView, batch, batch_size)
+                    batch = []
+                    if progress:
+                        progress('views', created, total)
+            if batch:
+                created += _bulk_create(BlogView, batch, batch_size)
+                if progress:
+                    progress('views', created, total)
+    return counts
+
+
+def create_likes(rng, blog_ids, total, days, now, batch_size):
+    """One like per (blog, reader); about 10% have been withdrawn. Returns {blog_id: active likes}."""
+    if not blog_ids or total <= 0:
+        return Counter()
+
+    popularity = zipf_cum_weights(len(blog_ids), BLOG_POPULARITY_EXPONENT)
+    ranked_blogs = rng.sample(blog_ids, len(blog_ids))
+    readers = max(100, total * 2)
+    activity = zipf_cum_weights(readers, READER_ACTIVITY_EXPONENT)
+
+    seen = set()
+    likes = []
+    counts = Counter()
+    attempts = 0
+    while len(likes) < total and attempts < total * 3:
+        attempts += 1
+        blog_id = ranked_blogs[bisect.bisect(popularity, rng.random() * popularity[-1])]
+        reader = bisect.bisect(activity, rng.random() * activity[-1])
+        if (blog_id, reader) in seen:
+            continue
+        seen.add((blog_id, reader))
+
+        is_active = rng.random() >= 0.1
+        likes.append(BlogLike(
+            blog_id=blog_id,
+            fingerprint=f'{PREFIX}fp-{reader}',
+            ip_address=f'10.{reader // 65536 % 256}.{reader // 256 % 256}.{reader % 256}',
+            user_agent='Mozilla/5.0 (generate_dataset)',
+            liked_at=now - timedelta(seconds=rng.random() * days * 86400),
+            is_active=is_active,
+        ))
+        if is_active:
+            counts[blog_id] += 1
+
+    with explicit_timestamps(BlogLike):
+        _bulk_create(BlogLike, likes, batch_size)
+    return counts
+
+
+def create_comments(rng, blog_ids, total, days, now, batch_size):
+    """Returns {blog_id: approved comments}."""
+    if not blog_ids or total <= 0:
+        return Counter()
+
+    popularity = zipf_cum_weights(len(blog_ids), BLOG_POPULARITY_EXPONENT)
+    ranked_blogs = rng.sample(blog_ids, len(blog_ids))
+
+    comments = []
+    counts = Counter()
+    for index in range(total):
+        blog_id = ranked_blogs[bisect.bisect(popularity, rng.random() * popularity[-1])]
+        created_at = now - timedelta(seconds=rng.random() * days * 86400)
+        is_approved = rng.random() >= 0.05
+        comments.append(BlogComment(
+            blog_id=blog_id,
+            author_name=f'Reader {index}',
+            author_email=f'reader{index}@example.com',
+            comment_text=' '.join(_sentence(rng) for _ in range(rng.randint(1, 4))),
+            created_at=created_at,
+            updated_at=created_at,
+            is_approved=is_approved,
+        ))
+        if is_approved:
+            counts[blog_id] += 1
+
+    with explicit_timestamps(BlogComment):
+        _bulk_create(BlogComment, comments, batch_size)
+    return counts
+
+
+def update_blog_counters(views, likes, comments, batch_size):
+    blogs = list(Blog.objects.filter(id__in=set(views) | set(likes) | set(comments)).only('id'))
+    for blog in blogs:
+        blog.views = views.get(blog.id, 0)
+        blog.likes = likes.get(blog.id, 0)
+        blog.comments_count = comments.get(blog.id, 0)
+    with transaction.atomic():
+        Blog.objects.bulk_update(blogs, ['views', 'likes', 'comments_count'], batch_size=batch_size)
+
+
+def create_projects(rng, count, batch_size):
+    projects = []
+    for index in range(count):
+        title = _title(rng)
+        projects.append(Project(
+            slug=f'{PREFIX}{index}-{title.lower().replace(" ", "-")}'[:200],
+            title=title,
+            organization=rng.choice(['Open Source', 'Acme Corp', 'University Lab', 'Freelance']),
+            role=rng.choice(['Lead Developer', 'Backend Engineer', 'Contributor']),
+            start_date=str(rng.randint(2015, 2024)),
+            type=rng.choice(['Web', 'Research', 'Tooling', 'Mobile']),
+            short_description=' '.join(_sentence(rng) for _ in range(2)),
+            responsibilities=[_sentence(rng, 8) for _ in range(rng.randint(2, 5))],
+            achievements=[_sentence(rng, 8) for _ in range(rng.randint(1, 4))],
+            skills=rng.sample(TAGS, 4),
+            tech_stack={'backend': rng.sample(TAGS, 2), 'frontend': rng.sample(TAGS, 2)},
+            contributor_count=rng.randint(1, 40),
+            tags=rng.sample(TAGS, rng.randint(1, 4)),
+            display_order=index,
+        ))
+    return _bulk_create(Project, projects, batch_size)
+
+
+def create_media_files(rng, count, batch_size):
+    """Files of log-normally distributed size, written to the default storage."""
+    files = []
+    for index in range(count):
+        media = MediaFile(
+            uuid=uuid.UUID(int=rng.getrandbits(128)),
+            slug=f'{PREFIX}file-{index}',
+            file_type='other',
+            mime_type='application/octet-stream',
+            title=f'Generated file {index}',
+        )
+        size = lognormal_size(rng, MEDIA_MEDIAN_BYTES, MEDIA_SIGMA, MEDIA_MAX_BYTES)
+        name = f'secure_storage/other/{media.uuid}.bin'
+        media.file.name = default_storage.save(name, ContentFile(rng.randbytes(size)))
+        media.original_filename = f'{media.slug}.bin'
+        media.file_size = size
+        files.append(media)
+    return _bulk_create(MediaFile, files, batch_size)
+
+
+def _delete_in_batches(queryset, batch_size):
+    """queryset.delete() `batch_size` primary keys at a time; returns the rows of its model deleted."""
+    model = queryset.model
+    deleted = 0
+    while True:
+        pks = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        deleted += model.objects.filter(pk__in=pks).delete()[1].get(model._meta.label, 0)
+
+
+def has_generated_rows():
+    return any(model.objects.filter(slug__startswith=PREFIX).exists() for model in (Blog, Project, MediaFile))
+
+
+def clear_generated(batch_size=5000):
+    """Delete everything generate_dataset created; returns {model name: rows deleted}."""
+    deleted = {}
+    with transaction.atomic(), related_updates_paused():
+        # Children first, in batches, so the blog delete doesn't have to collect millions of rows
+        for model in (BlogView, BlogLike, BlogComment):
+            deleted[model.__name__] = _delete_in_batches(model.objects.filter(blog__slug__startswith=PREFIX),
+                                                         batch_size)
+        for model in (Blog, Project):
+            # delete() also removes cascaded rows (related posts, tag links)
+            deleted[model.__name__] = _delete_in_batches(model.objects.filter(slug__startswith=PREFIX), batch_size)
+        if deleted['Blog']:
+            # One full related-posts rebuild instead of a job per deleted blog
+            transaction.on_commit(schedule_related_update)
+
+    media = MediaFile.objects.filter(slug__startswith=PREFIX)
+    for name in media.values_list('file', flat=True):
+        default_storage.delete(name)
+    deleted['MediaFile'] = media.delete()[1].get(MediaFile._meta.label, 0)
+    return deleted
+
+
+def rebuild_after_generation():
+    """Rebuild what bulk_create skipped (signals) and drop cached results."""
+    from .backup_utils import rebuild_derived_data
+    from .facets import invalidate_blog_facets
+    from .response_cache import bump_version
+    from .suggest import bump_generation
+
+    rebuilt = rebuild_derived_data()
+    invalidate_blog_facets()
+    bump_generation()
+    bump_version()
+    return rebuilt
+
+
+def generate_dataset(blogs=200, views=100000, likes=5000, comments=2000, projects=30, media=20,
+                     days=90, seed=42, batch_size=5000, progress=None):
+    """
+    Generate a dataset and return per-step timings and row counts.
+
+    Args:
+        blogs, views, likes, comments, projects, media: Rows to create
+        days: Length of the engagement window ending now
+        seed: Random seed; the same arguments give the same data
+        batch_size: Rows per bulk_create batch
+        progress: Optional callable(step, done, total) for long steps
+
+    Raises ValueError if generated rows are already there (clear_generated() first).
+    """
+    if has_generated_rows():
+        raise ValueError(f'The database already has generated rows (slugs starting with "{PREFIX}")')
+    rng = random.Random(seed)
+    now = timezone.now()
+    window_start = now - timedelta(days=days)
+    steps = []
+
+    def step(name, function, *args):
+        started = time.perf_counter()
+        result = function(*args)
+        steps.append((name, time.perf_counter() - started, result))
+        return result
+
+    blog_ids = step('blogs', create_blogs, rng, blogs, now, window_start, batch_size)
+    view_counts = step('views', create_views, rng, blog_ids, views, days, now, batch_size, progress)
+    like_counts = step('likes', create_likes, rng, blog_ids, likes, days, now, batch_size)
+    comment_counts = step('comments', create_comments, rng, blog_ids, comments, days, now, batch_size)
+    step('counters', update_blog_counters, view_counts, like_counts, comment_counts, batch_size)
+    step('projects', create_projects, rng, projects, batch_size)
+    step('media', create_media_files, rng, media, batch_size)
+    step('derived', rebuild_after_generation)
+    return steps
@@ -0,0 +1,73 @@
+"""
+Cached facet counts for the blog index.
+
+The counts are computed with grouped aggregate queries and cached in the
+shared cache until a blog is saved or deleted (see signals.py), so listing
+pages can render category/tag/author/year navigation without downloading
+every post.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+from .instrumentation import record_cache
+from .models import Blog, BlogTag
+
+FACETS_CACHE_KEY = 'blog-facets'
+
+# Saving any of these fields can change the facet counts
+FACET_FIELDS = {'category', 'tags', 'author', 'published_date', 'is_published'}
+
+
+def compute_blog_facets():
+    """Run the grouped aggregate queries for published blogs."""
+    published = Blog.objects.filter(is_published=True)
+
+    categories = (
+        published.exclude(category='')
+        .values('category')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'category')
+    )
+    authors = (
+        published.values('author')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'author')
+    )
+    years = (
+        published.exclude(published_date__isnull=True)
+        .annotate(year=ExtractYear('published_date'))
+        .values('year')
+        .annotate(count=Count('id'))
+        .order_by('-year')
+    )
+    tags = (
+        BlogTag.objects.filter(blog__is_published=True)
+        .values('tag__name', 'tag__slug')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'tag__name')
+    )
+
+    return {
+        'total': published.count(),
+        'categories': [{'name': row['category'], 'count': row['count']} for row in categories],
+        'tags': [{'name': row['tag__name'], 'slug': row['tag__slug'], 'count': row['count']} for row in tags],
+        'authors': [{'name': row['author'], 'count': row['count']} for row in authors],
+        'years': [{'year': row['year'], 'count': row['count']} for row in years],
+    }
+
+
+def get_blog_facets():
+    """Return facet counts from the cache, computing them on a miss."""
+    facets = cache.get(FACETS_CACHE_KEY)
+    record_cache('facets', facets is not None)
+    if facets is None:
+        facets = compute_blog_facets()
+        cache.set(FACETS_CACHE_KEY, facets, getattr(settings, 'BLOG_FACETS_CACHE_TIMEOUT', 3600))
+    return facets
+
+
+def invalidate_blog_facets():
+    cache.delete(FACETS_CACHE_KEY)
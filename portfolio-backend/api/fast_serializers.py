@@ -0,0 +1,106 @@
+"""
+Read-only fast path for list endpoints.
+
+ValuesSerializer produces the same output as a ModelSerializer's
+`many=True` representation, but reads rows with queryset.values_list()
+instead of instantiating model objects. The column list and a per-field
+mapper are derived once from the serializer's own fields, so the output
+follows the serializer definition: fields whose representation is the
+database value itself use it directly, everything else (datetimes, UUIDs,
+...) goes through the DRF field's to_representation().
+"""
+
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+
+# Serializer fields whose to_representation() returns database values unchanged
+IDENTITY_FIELDS = (
+    serializers.CharField,  # includes URLField, EmailField, SlugField
+    serializers.IntegerField,
+    serializers.FloatField,
+    serializers.BooleanField,
+    serializers.JSONField,
+)
+
+
+class ValuesSerializer:
+    """Serialise querysets through values_list() using a ModelSerializer's field layout."""
+
+    def __init__(self, serializer_class, field_names=None):
+        serializer = serializer_class()
+        model = serializer_class.Meta.model
+
+        self.serializer_class = serializer_class
+        self.names = []
+        self.columns = []
+        self.mappers = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only or (field_names is not None and name not in field_names):
+                continue
+            if isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer)) \
+                    or field.source == '*' or '.' in field.source:
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{name} cannot be read from values(); '
+                    'use the regular serializer for this endpoint.'
+                )
+
+            model._meta.get_field(field.source)  # fail early on non-column sources
+            self.names.append(name)
+            self.columns.append(field.source)
+            self.mappers.append(None if self._is_identity(field) else field.to_representation)
+
+    @staticmethod
+    def _is_identity(field):
+        if isinstance(field, serializers.JSONField):
+            return not field.binary
+        return isinstance(field, IDENTITY_FIELDS)
+
+    def to_representation(self, row):
+        item = {}
+        for name, mapper, value in zip(self.names, self.mappers, row):
+            if value is None or mapper is None:
+                item[name] = value
+            else:
+                item[name] = mapper(value)
+        return item
+
+    def serialize(self, queryset):
+        """Return a list of dicts for every row of `queryset`."""
+        to_representation = self.to_representation
+        return [to_representation(row) for row in queryset.values_list(*self.columns)]
+
+
+@lru_cache(maxsize=256)
+def get_values_serializer(serializer_class, field_names=None):
+    """
+    Return a cached ValuesSerializer, optionally restricted to `field_names`
+    (a tuple, e.g. a sparse fieldset).
+    """
+    return ValuesSerializer(serializer_class, field_names)
+
+
+class FastListMixin:
+    """
+    Serve ListAPIView responses through ValuesSerializer.
+
+    The output is identical to the view's serializer_class; the regular
+    path is still used when API_FAST_LIST_SERIALIZATION is off or the view
+    paginates.
+    """
+
+    def get_list_values_serializer(self):
+        return get_values_serializer(self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, 'API_FAST_LIST_SERIALIZATION', True) or self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        data = self.get_list_values_serializer().serialize(queryset)
+        return Response(data)
@@ -0,0 +1,231 @@
+"""
+Per-request performance instrumentation.
+
+InstrumentationMiddleware creates a RequestMetrics for every request and
+makes it the current one (a ContextVar, so background threads never record
+into it). It collects:
+
+- total: the whole request, as seen by the outermost middleware
+- db: query count and time, via an execute wrapper on every connection
+  that records into the current RequestMetrics (so queries the async ORM
+  runs in a worker thread are counted too; the ContextVar follows them)
+- serialize: time spent in the view outside the database, which for the
+  DRF views is almost entirely serializer work
+- render: DRF/template response rendering
+- cache: hits and misses of the shared-cache lookups that report here
+  (response cache, markdown, facets)
+- any named section wrapped in timed(), e.g. compress
+
+and reports them in a Server-Timing header and one `api.performance` log
+line per request, keyed by view name.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.urls import Resolver404, resolve
+
+logger = logging.getLogger('api.performance')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = (
+        'started', 'finished', 'view_name',
+        'db_queries', 'db_time',
+        'view_started', 'view_finished', 'view_db_time',
+        'render_started', 'render_time',
+        'route', 'cache_hits', 'cache_misses', 'cache_lookups', 'timings',
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.view_name = None
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.view_started = None
+        self.view_finished = None
+        self.view_db_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+        self.route = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_lookups = {}  # {(cache name, hit): count}
+        self.timings = {}
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.db_queries += 1
+
+    def start_view(self, view_func):
+        view_class = getattr(view_func, 'view_class', None)
+        self.view_name = (view_class or view_func).__name__
+        self.view_started = time.perf_counter()
+        self.view_db_time = self.db_time
+
+    def finish_view(self):
+        if self.view_started is not None and self.view_finished is None:
+            self.view_finished = time.perf_counter()
+            self.view_db_time = self.db_time - self.view_db_time
+
+    def start_render(self):
+        self.finish_view()
+        self.render_started = time.perf_counter()
+
+    def finish_render(self):
+        if self.render_started is not None:
+            self.render_time += time.perf_counter() - self.render_started
+            self.render_started = None
+
+    def finish(self):
+        self.finish_view()
+        self.finished = time.perf_counter()
+
+    @property
+    def total_time(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def serialize_time(self):
+        if self.view_finished is None:
+            return 0.0
+        return max(0.0, self.view_finished - self.view_started - self.view_db_time)
+
+    def as_dict(self):
+        """Durations in milliseconds, rounded for logging."""
+        data = {
+            'total_ms': round(self.total_time * 1000, 2),
+            'db_ms': round(self.db_time * 1000, 2),
+            'db_queries': self.db_queries,
+            'serialize_ms': round(self.serialize_time * 1000, 2),
+            'render_ms': round(self.render_time * 1000, 2),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+        for name, seconds in self.timings.items():
+            data[f'{name}_ms'] = round(seconds * 1000, 2)
+        return data
+
+    def server_timing(self):
+        """Value for the Server-Timing response header."""
+        entries = [
+            f'total;dur={self.total_time * 1000:.2f}',
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.db_queries} queries"',
+        ]
+        if self.view_finished is not None:
+            entries.append(f'serialize;dur={self.serialize_time * 1000:.2f}')
+        if self.render_time:
+            entries.append(f'render;dur={self.render_time * 1000:.2f}')
+        for name, seconds in self.timings.items():
+            entries.append(f'{name};dur={seconds * 1000:.2f}')
+        if self.cache_hits or self.cache_misses:
+            entries.append(f'cache;desc="{self.cache_hits} hit, {self.cache_misses} miss"')
+        return ', '.join(entries)
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.execute_wrapper(execute, sql, params, many, context)
+
+
+def _install_query_recorder(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        # First, so `with connection.execute_wrapper()` blocks still pop their own wrapper
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+def record_queries():
+    """Record queries on this thread's connections and every connection opened from now on."""
+    connection_created.connect(_install_query_recorder, dispatch_uid='api.instrumentation.record_queries')
+    for connection in connections.all(initialized_only=True):
+        _install_query_recorder(connection)
+
+
+def activate(metrics):
+    return _current.set(metrics)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def current():
+    """The RequestMetrics of the request being handled, or None."""
+    return _current.get()
+
+
+def record_cache(name, hit):
+    """Count a lookup in the shared cache `name` (e.g. 'response') for the current request."""
+    metrics = _current.get()
+    if metrics is not None:
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+        metrics.cache_lookups[name, hit] = metrics.cache_lookups.get((name, hit), 0) + 1
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's `name` timing."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] = metrics.timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def resolve_view(request, metrics):
+    """
+    Fill in view_name and route (the URL pattern, e.g. 'api/blog-posts/<slug:slug>/').
+
+    Resolves the path when the view never ran, e.g. on a response cache hit;
+    unmatched paths get '-'.
+    """
+    if metrics.route is not None:
+        return
+    match = request.resolver_match
+    if match is None:
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            metrics.view_name = metrics.view_name or '-'
+            metrics.route = '-'
+            return
+    if not metrics.view_name:
+        view_class = getattr(match.func, 'view_class', None)
+        metrics.view_name = (view_class or match.func).__name__
+    metrics.route = match.route
+
+
+def log_request(request, response, metrics):
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    resolve_view(request, metrics)
+    fields = {
+        'view': metrics.view_name,
+        'method': request.method,
+        'path': request.path,
+        'status': response.status_code,
+        **metrics.as_dict(),
+    }
+    if response.has_header('X-Cache'):
+        fields['response_cache'] = response['X-Cache']
+    logger.info(' '.join(f'{key}={value}' for key, value in fields.items()), extra={'performance': fields})
@@ -0,0 +1,297 @@
+"""
+Database-backed queue for slow admin work.
+
+Backup exports and imports used to run inside the admin request and hit
+gunicorn's 120 s timeout on large sites. The admin views now only queue a
+BackgroundJob row and send the user to a page that polls its progress.
+Blog saves queue the related-posts update the same way. A
+worker (`python manage.py run_jobs`, started next to gunicorn by
+gunicorn.conf.py) runs the jobs one at a time. The database is the only
+thing the two share, so no broker is needed.
+
+A worker claims the oldest queued job with a conditional UPDATE. That works
+on SQLite, which has no SELECT ... FOR UPDATE SKIP LOCKED, and two workers
+can never claim the same job. While a job runs, its handler reports
+progress(fraction, message), written at most every API_JOB_PROGRESS_INTERVAL
+seconds. A heartbeat thread also touches the row every
+API_JOB_HEARTBEAT_INTERVAL seconds, so a long single step doesn't look
+dead. A running job whose heartbeat is older than API_JOB_STALE_AFTER
+seconds lost its worker (a deploy or a crash). It is marked failed rather
+than retried, because a half-done import shouldn't run twice.
+"""
+
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.urls import reverse
+from django.utils import timezone
+
+from .backup_utils import export_portfolio_data, find_base_backup, import_portfolio_data
+from .models import BackgroundJob
+from .related import rebuild_related_blogs, update_related_for_blog
+
+logger = logging.getLogger(__name__)
+
+
+class JobFailed(Exception):
+    """Raised by a handler to fail its job with a message and, optionally, a result."""
+
+    def __init__(self, message, result=None):
+        super().__init__(message)
+        self.result = result
+
+
+EXPORT_MODES = ('full', 'incremental', 'differential')
+
+
+def run_export(job, progress):
+    """
+    A full backup, or with params['mode'] an incremental one based on the
+    newest backup or a differential one based on the newest full backup.
+    Without a usable base it falls back to a full backup.
+    """
+    mode = job.params.get('mode', 'full')
+    base = None
+    if mode != 'full':
+        base = find_base_backup(full_only=mode == 'differential')
+    zip_path = Path(export_portfolio_data(progress=progress, base=base))
+    return {
+        'path': str(zip_path),
+        'filename': zip_path.name,
+        'size': zip_path.stat().st_size,
+        'mode': mode if base is not None else 'full',
+        'base': base.name if base is not None else None,
+    }
+
+
+def run_import(job, progress):
+    paths = [Path(path) for path in job.params.get('paths') or [job.params['path']]]
+    try:
+        results = import_portfolio_data(paths, overwrite=job.params.get('overwrite', False), progress=progress)
+    finally:
+        for path in paths:
+            discard_upload(path)
+    if not results['success']:
+        raise JobFailed(', '.join(results['errors']), results)
+    return results
+
+
+def run_related(job, progress):
+    """The neighbours of params['blog_id'] after a save or delete, or every post's."""
+    blog_id = job.params.get('blog_id')
+    if blog_id is None:
+        return {'rows': rebuild_related_blogs()}
+    return {'rewritten': update_related_for_blog(blog_id, recompute_ids=job.params.get('recompute_ids', []))}
+
+
+HANDLERS = {
+    'export': run_export,
+    'import': run_import,
+    'related': run_related,
+}
+
+
+def upload_dir():
+    return Path(settings.BASE_DIR) / 'temp_uploads'
+
+
+def enqueue(kind, params=None, user=None):
+    """Queue a job of `kind` (a key of HANDLERS) and return it."""
+    if kind not in HANDLERS:
+        raise ValueError(f'Unknown job kind {kind!r}')
+    return BackgroundJob.objects.create(
+        kind=kind,
+        params=params or {},
+        requested_by=user.get_username() if user is not None else '',
+    )
+
+
+def enqueue_unless_queued(kind, params=None):
+    """enqueue(), unless a job of `kind` with the same params is still waiting; returns the job."""
+    params = params or {}
+    for job in BackgroundJob.objects.filter(kind=kind, status='queued'):
+        if job.params == params:
+            return job
+    return enqueue(kind, params)
+
+
+def job_status(job):
+    """What the admin progress page polls for."""
+    status = {
+        'id': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'message': job.progress_message,
+        'error': job.error,
+        'finished': job.is_finished,
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'download_url': None,
+        'imported': None,
+    }
+    if job.status == 'succeeded' and job.kind == 'export':
+        status['download_url'] = reverse('admin-job-download', kwargs={'pk': job.pk})
+        status['base'] = job.result.get('base')
+    if job.kind == 'import' and job.result:
+        status['imported'] = job.result.get('imported')
+        status['warnings'] = job.result.get('errors', [])
+    return status
+
+
+def export_file(job):
+    """Path of a finished export job's ZIP file, or None if it is gone."""
+    if job.kind != 'export' or job.status != 'succeeded' or not job.result:
+        return None
+    path = Path(job.result['path'])
+    exports = Path(settings.BASE_DIR) / 'exports'
+    if not path.is_file() or exports.resolve() not in path.resolve().parents:
+        return None
+    return path
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_next_job(worker):
+    """Mark the oldest queued job as running for `worker` and return it, or None."""
+    candidates = BackgroundJob.objects.filter(status='queued').order_by('created_at', 'pk')
+    for pk in candidates.values_list('pk', flat=True)[:10]:
+        now = timezone.now()
+        claimed = BackgroundJob.objects.filter(pk=pk, status='queued').update(
+            status='running', worker=worker, started_at=now, heartbeat_at=now,
+            progress=0, progress_message='Starting',
+        )
+        if claimed:
+            return BackgroundJob.objects.get(pk=pk)
+    return None
+
+
+def fail_stale_jobs():
+    """Fail running jobs whose worker stopped reporting; returns how many."""
+    stale_after = getattr(settings, 'API_JOB_STALE_AFTER', 120)
+    cutoff = timezone.now() - timezone.timedelta(seconds=stale_after)
+    return BackgroundJob.objects.filter(status='running', heartbeat_at__lt=cutoff).update(
+        status='failed',
+        finished_at=timezone.now(),
+        error=f'The worker stopped: no sign of life for {stale_after} seconds',
+    )
+
+
+class ProgressReporter:
+    """The progress(fraction, message) callback handed to a job's handler."""
+
+    def __init__(self, job_pk):
+        self.job_pk = job_pk
+        self.interval = getattr(settings, 'API_JOB_PROGRESS_INTERVAL', 1.0)
+        self.last_write = 0.0
+
+    def __call__(self, fraction, message):
+        now = time.monotonic()
+        if now - self.last_write < self.interval:
+            return
+        self.last_write = now
+        BackgroundJob.objects.filter(pk=self.job_pk).update(
+            progress=fraction, progress_message=message[:255], heartbeat_at=timezone.now())
+
+
+class Heartbeat(threading.Thread):
+    """Touches a running job's heartbeat_at until stopped."""
+
+    def __init__(self, job_pk):
+        super().__init__(daemon=True)
+        self.job_pk = job_pk
+        self.interval = getattr(settings, 'API_JOB_HEARTBEAT_INTERVAL', 10.0)
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                BackgroundJob.objects.filter(pk=self.job_pk, status='running').update(heartbeat_at=timezone.now())
+        except Exception:
+            logger.exception('Heartbeat of job %s failed', self.job_pk)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_job(job):
+    """Run a claimed job to completion and record the outcome."""
+    logger.info('Running %s', job)
+    heartbeat = Heartbeat(job.pk)
+    heartbeat.start()
+    started = time.monotonic()
+    try:
+        result = HANDLERS[job.kind](job, ProgressReporter(job.pk))
+    except Exception as error:
+        if not isinstance(error, JobFailed):
+            logger.exception('%s failed', job)
+        job.status = 'failed'
+        job.error = str(error) if isinstance(error, JobFailed) else f'{type(error).__name__}: {error}'
+        job.result = getattr(error, 'result', None)
+    else:
+        job.status = 'succeeded'
+        job.result = result
+        job.progress = 1.0
+        job.progress_message = 'Done'
+    finally:
+        heartbeat.stop()
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'result', 'progress', 'progress_message', 'finished_at'])
+    logger.info('%s finished in %.1f s', job, time.monotonic() - started)
+    return job
+
+
+def run_worker(poll_interval=None, once=False, should_stop=None):
+    """
+    Run queued jobs one at a time until `should_stop()` returns True, or,
+    with once=True, until the queue is empty. Returns the number of jobs run.
+    """
+    poll_interval = poll_interval or getattr(settings, 'API_JOB_POLL_INTERVAL', 2.0)
+    should_stop = should_stop or (lambda: False)
+    worker = worker_name()
+    ran = 0
+    while not should_stop():
+        close_old_connections()
+        stale = fail_stale_jobs()
+        if stale:
+            logger.warning('Marked %s stale job(s) as failed', stale)
+        job = claim_next_job(worker)
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        ran += 1
+    return ran
+
+
+def save_upload(uploaded_file):
+    """Store an uploaded backup where the worker can read it; returns the path."""
+    directory = upload_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{timezone.now():%Y%m%d_%H%M%S}_{os.getpid()}_{Path(uploaded_file.name).name}'
+    with open(path, 'wb') as destination:
+        for chunk in uploaded_file.chunks():
+            destination.write(chunk)
+    return path
+
+
+def discard_upload(path):
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    if path.parent.exists() and not any(path.parent.iterdir()):
+        shutil.rmtree(path.parent, ignore_errors=True)
@@ -0,0 +1,131 @@
+"""
+Live blog counters over Server-Sent Events.
+
+GET /api/blog-posts/<slug>/live/ (api/async_views.py) streams a post's
+views, likes and comment count to the reader while the page is open:
+
+    event: counters
+    data: {"views": 1204, "likes": 87, "comments_count": 12}
+
+Each worker process runs one Hub on its event loop. While anyone is
+subscribed, the hub reads the counters of every subscribed post in a
+single query every API_LIVE_INTERVAL seconds. It wakes the subscribers of
+the posts whose counters changed. So a post sends at most one message per
+interval however many pings it gets. The query sees changes made by every
+worker, sync or async, and by the admin, so no broker is needed. With
+nobody subscribed the hub stops and costs nothing.
+
+An idle subscriber is one coroutine waiting on its post's asyncio.Event,
+with no thread and no database connection. Waking the subscribers of a
+post is a single Event.set(). Every API_LIVE_KEEPALIVE seconds a comment
+line goes out, so that proxies keep the connection open and closed
+clients are noticed.
+"""
+
+import asyncio
+import logging
+import weakref
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from .models import Blog
+from .renderers import event_stream_message
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ('views', 'likes', 'comments_count')
+KEEPALIVE_MESSAGE = b': keepalive\n\n'
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_hub():
+    """The hub of the running event loop (one per worker under uvicorn)."""
+    loop = asyncio.get_running_loop()
+    if loop not in _hubs:
+        _hubs[loop] = Hub(
+            getattr(settings, 'API_LIVE_INTERVAL', 2.0),
+            getattr(settings, 'API_LIVE_KEEPALIVE', 15.0),
+        )
+    return _hubs[loop]
+
+
+def counters_of(blog):
+    return {field: getattr(blog, field) for field in COUNTER_FIELDS}
+
+
+class Hub:
+
+    def __init__(self, interval, keepalive):
+        self.interval = interval
+        self.keepalive = keepalive
+        self.subscribers = {}  # slug -> number of open streams
+        self.latest = {}  # slug -> counters last sent
+        self.events = {}  # slug -> Event set when its counters change
+        self.task = None
+
+    def subscribe(self, slug, counters):
+        self.subscribers[slug] = self.subscribers.get(slug, 0) + 1
+        self.latest.setdefault(slug, counters)
+        self.events.setdefault(slug, asyncio.Event())
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    def unsubscribe(self, slug):
+        self.subscribers[slug] -= 1
+        if not self.subscribers[slug]:
+            del self.subscribers[slug]
+            del self.latest[slug]
+            del self.events[slug]
+
+    def publish(self, slug, counters):
+        """Send `counters` to the subscribers of `slug` if they changed."""
+        if slug not in self.subscribers or self.latest[slug] == counters:
+            return
+        self.latest[slug] = counters
+        # Wake everyone waiting on the old event; later waits use a new one
+        self.events.pop(slug).set()
+        self.events[slug] = asyncio.Event()
+
+    async def run(self):
+        try:
+            while self.subscribers:
+                await asyncio.sleep(self.interval)
+                await self.poll()
+        finally:
+            self.task = None
+
+    async def poll(self):
+        slugs = list(self.subscribers)
+        if not slugs:
+            return
+        try:
+            rows = [
+                row async for row in Blog.objects.filter(slug__in=slugs, is_published=True)
+                .values('slug', *COUNTER_FIELDS)
+            ]
+        except DatabaseError:
+            logger.exception('Reading live counters failed')
+            return
+        for row in rows:
+            self.publish(row.pop('slug'), row)
+
+    async def stream(self, slug, counters):
+        """The event stream of one subscriber to `slug`, starting with `counters`."""
+        self.subscribe(slug, counters)
+        try:
+            sent = self.latest[slug]
+            yield event_stream_message(sent, 'counters')
+            while True:
+                event = self.events[slug]
+                try:
+                    await asyncio.wait_for(event.wait(), self.keepalive)
+                except asyncio.TimeoutError:
+                    yield KEEPALIVE_MESSAGE
+                    continue
+                if self.latest[slug] != sent:
+                    sent = self.latest[slug]
+                    yield event_stream_message(sent, 'counters')
+        finally:
+            self.unsubscribe(slug)
@@ -0,0 +1,443 @@
+"""
+Load testing against a running (or locally started) backend.
+
+Simulated readers replay the traffic the frontend produces: a list page,
+a blog post, the increment-view ping, a few update-duration heartbeats, an
+occasional like toggle and media fetch from /api/cdn/. Each virtual user
+runs sessions back to back over its own keep-alive connection (a small
+HTTP/1.1 client on asyncio streams, so one process can drive hundreds of
+users). Posts are picked with Zipf weights over the current view ranking,
+the way real traffic concentrates on a few popular posts.
+
+The 'pings' scenario leaves out the page loads and replays only the
+engagement calls a reader keeps sending while a post is open
+(increment-view, view-stats, update-duration heartbeats, likes). It
+compares the sync workers with the ASGI profile (start_local_server(...,
+asgi=True)) on the traffic the async views serve.
+
+run_load_test() returns per-endpoint throughput, latency percentiles and
+error rates as a JSON-serialisable dict; compare_results() lines two runs
+up, e.g. the same test before and after a commit.
+
+The readers record views, likes and reading time like real ones, so the
+load_test command only runs against a database whose published posts all
+come from generate_dataset (see is_generated_database()) unless told
+otherwise.
+"""
+
+import asyncio
+import bisect
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone as dt_timezone
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+from .benchmarking import git_revision
+from .datagen import PREFIX as GENERATED_PREFIX
+from .models import Blog, MediaFile
+
+# Share of sessions that do each optional step
+LIKE_RATE = 0.08
+UNLIKE_RATE = 0.02
+MEDIA_RATE = 0.3
+# Heartbeats per session are geometric with this mean
+MEAN_HEARTBEATS = 3
+LIST_PAGES = [
+    ('blog-list', '/api/blog-posts/', 4),
+    ('home', '/api/home/', 2),
+    ('trending', '/api/trending-blogs/', 2),
+    ('featured', '/api/featured-blogs/', 1),
+    ('blog-facets', '/api/blog-facets/', 1),
+]
+BLOG_POPULARITY_EXPONENT = 1.1
+SCENARIOS = ('reader', 'pings')
+PERCENTILES = (50, 95, 99)
+
+
+class HttpError(Exception):
+    pass
+
+
+class Connection:
+    """Minimal HTTP/1.1 client connection; reconnects when the server closes it."""
+
+    def __init__(self, host, port, host_header, timeout):
+        self.host = host
+        self.port = port
+        self.host_header = host_header
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        """Send one request; returns (status, bytes received)."""
+        return await asyncio.wait_for(self._request(method, path, body), self.timeout)
+
+    async def _request(self, method, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            return await self._exchange(method, path, body)
+        try:
+            return await self._exchange(method, path, body)
+        except (HttpError, ConnectionResetError, BrokenPipeError):
+            # The server closed the idle keep-alive connection; browsers retry on a new one
+            await self.close()
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            return await self._exchange(method, path, body)
+
+    async def _exchange(self, method, path, body):
+        payload = json.dumps(body).encode() if body is not None else b''
+        head = [
+            f'{method} {path} HTTP/1.1',
+            f'Host: {self.host_header}',
+            'Accept: application/json',
+            'Accept-Encoding: br, gzip',
+            'Connection: keep-alive',
+            'User-Agent: portfolio-loadtest',
+        ]
+        if body is not None:
+            head += ['Content-Type: application/json', f'Content-Length: {len(payload)}']
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            await self.close()
+            raise HttpError('connection closed by server')
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            size = 0
+            while True:
+                chunk_size = int((await self.reader.readline()).split(b';')[0], 16)
+                if chunk_size:
+                    size += len(await self.reader.readexactly(chunk_size))
+                await self.reader.readline()
+                if not chunk_size:
+                    break
+        elif 'content-length' in headers:
+            size = len(await self.reader.readexactly(int(headers['content-length'])))
+        else:
+            size = len(await self.reader.read())
+            await self.close()
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, size
+
+
+class EndpointStats:
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.bytes = 0
+        self.statuses = {}
+
+    def add(self, seconds, status, size, error=None):
+        self.latencies.append(seconds)
+        self.bytes += size
+        key = str(status) if status is not None else (error or 'error')
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if status is None or status >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed):
+        count = len(self.latencies)
+        ordered = sorted(self.latencies)
+        result = {
+            'requests': count,
+            'errors': self.errors,
+            'error_rate': self.errors / count if count else 0.0,
+            'throughput': count / elapsed if elapsed else 0.0,
+            'bytes': self.bytes,
+            'mean': sum(ordered) / count if count else 0.0,
+            'max': ordered[-1] if ordered else 0.0,
+            'statuses': dict(sorted(self.statuses.items())),
+        }
+        for percentile in PERCENTILES:
+            result[f'p{percentile}'] = percentile_of(ordered, percentile)
+        return result
+
+
+def percentile_of(ordered, percentile):
+    """Nearest-rank percentile of a sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-percentile * len(ordered) // 100))
+    return ordered[rank - 1]
+
+
+class Site:
+    """What the simulated readers can ask for, taken from the database."""
+
+    def __init__(self, slugs, media_slugs):
+        if not slugs:
+            raise ValueError('No published blogs to request (see generate_dataset)')
+        self.slugs = slugs
+        self.media_slugs = media_slugs
+        self.popularity = list(itertools.accumulate(
+            1.0 / rank ** BLOG_POPULARITY_EXPONENT for rank in range(1, len(slugs) + 1)))
+        self.list_pages = [(name, path) for name, path, _ in LIST_PAGES]
+        self.list_weights = list(itertools.accumulate(weight for *_, weight in LIST_PAGES))
+
+    @classmethod
+    def from_database(cls):
+        slugs = list(Blog.objects.filter(is_published=True).order_by('-views', 'id').values_list('slug', flat=True))
+        media = list(MediaFile.objects.filter(is_public=True).values_list('slug', flat=True))
+        return cls(slugs, media)
+
+    def pick_blog(self, rng):
+        return self.slugs[bisect.bisect(self.popularity, rng.random() * self.popularity[-1])]
+
+    def pick_list_page(self, rng):
+        return self.list_pages[bisect.bisect(self.list_weights, rng.random() * self.list_weights[-1])]
+
+
+def is_generated_database():
+    """True if there are published blogs and generate_dataset created all of them."""
+    published = Blog.objects.filter(is_published=True)
+    return published.exists() and not published.exclude(slug__startswith=GENERATED_PREFIX).exists()
+
+
+class VirtualUser:
+
+    def __init__(self, number, connection, site, stats, seed, think_time, deadline, max_requests,
+                 scenario='reader'):
+        self.number = number
+        self.connection = connection
+        self.site = site
+        self.stats = stats
+        self.rng = random.Random(f'{seed}-{number}')
+        self.think_time = think_time
+        self.deadline = deadline
+        self.max_requests = max_requests
+        self.session = self.ping_session if scenario == 'pings' else self.reader_session
+        self.sessions = 0
+
+    def done(self):
+        if time.monotonic() >= self.deadline:
+            return True
+        return self.max_requests is not None and self.max_requests[0] <= 0
+
+    async def call(self, name, method, path, body=None):
+        if self.max_requests is not None:
+            self.max_requests[0] -= 1
+        stats = self.stats.setdefault(name, EndpointStats())
+        started = time.perf_counter()
+        try:
+            status, size = await self.connection.request(method, path, body)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HttpError, ValueError) as error:
+            await self.connection.close()
+            stats.add(time.perf_counter() - started, None, 0, type(error).__name__)
+            return None
+        stats.add(time.perf_counter() - started, status, size)
+        return status
+
+    async def think(self):
+        if self.think_time:
+            await asyncio.sleep(self.rng.expovariate(1.0 / self.think_time))
+
+    async def reader_session(self):
+        """One reader visit, in the order the frontend sends its requests."""
+        self.sessions += 1
+        fingerprint = f'loadtest-{self.number}-{self.sessions}'
+        slug = self.site.pick_blog(self.rng)
+        post = f'/api/blog-posts/{slug}/'
+
+        name, path = self.site.pick_list_page(self.rng)
+        await self.call(name, 'GET', path)
+        await self.think()
+        await self.call('blog-detail', 'GET', post)
+        await self.call('increment-view', 'POST', post + 'increment-view/',
+                        {'fingerprint': fingerprint, 'session_id': f'loadtest-session-{self.number}'})
+
+        if self.site.media_slugs and self.rng.random() < MEDIA_RATE:
+            await self.call('cdn', 'GET', f'/api/cdn/{self.rng.choice(self.site.media_slugs)}/')
+
+        duration = 0
+        while self.rng.random() < MEAN_HEARTBEATS / (MEAN_HEARTBEATS + 1) and not self.done():
+            await self.think()
+            duration += 30
+            await self.call('update-duration', 'POST', post + 'update-duration/',
+                            {'fingerprint': fingerprint, 'duration': duration})
+
+        if self.rng.random() < LIKE_RATE:
+            await self.call('toggle-like', 'POST', post + 'toggle-like/', {'fingerprint': fingerprint, 'action': 'like'})
+            if self.rng.random() < UNLIKE_RATE / LIKE_RATE:
+                await self.call('toggle-like', 'POST', post + 'toggle-like/',
+                                {'fingerprint': fingerprint, 'action': 'unlike'})
+
+    async def ping_session(self):
+        """The engagement calls of one reader visit, without the page loads."""
+        self.sessions += 1
+        fingerprint = f'loadtest-{self.number}-{self.sessions}'
+        post = f'/api/blog-posts/{self.site.pick_blog(self.rng)}/'
+
+        await self.call('increment-view', 'POST', post + 'increment-view/',
+                        {'fingerprint': fingerprint, 'session_id': f'loadtest-session-{self.number}'})
+        await self.call('view-stats', 'GET', post + f'view-stats/?fingerprint={fingerprint}')
+
+        duration = 0
+        while self.rng.random() < MEAN_HEARTBEATS / (MEAN_HEARTBEATS + 1) and not self.done():
+            await self.think()
+            duration += 30
+            await self.call('update-duration', 'POST', post + 'update-duration/',
+                            {'fingerprint': fingerprint, 'duration': duration})
+
+        if self.rng.random() < LIKE_RATE:
+            await self.call('toggle-like', 'POST', post + 'toggle-like/', {'fingerprint': fingerprint, 'action': 'like'})
+
+    async def run(self):
+        try:
+            while not self.done():
+                await self.session()
+                await self.think()
+        finally:
+            await self.connection.close()
+
+
+async def _run(base_url, site, users, duration, seed, think_time, timeout, host, max_requests, scenario):
+    parts = urlsplit(base_url)
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    if parts.scheme != 'http':
+        raise ValueError('Only http:// base URLs are supported')
+    host_header = host or parts.netloc
+
+    stats = {}
+    deadline = time.monotonic() + duration
+    budget = [max_requests] if max_requests else None
+    virtual_users = [
+        VirtualUser(number, Connection(parts.hostname, port, host_header, timeout), site, stats,
+                    seed, think_time, deadline, budget, scenario)
+        for number in range(users)
+    ]
+    started = time.perf_counter()
+    await asyncio.gather(*(user.run() for user in virtual_users))
+    return stats, time.perf_counter() - started, sum(user.sessions for user in virtual_users)
+
+
+def run_load_test(base_url, users=20, duration=30.0, seed=42, think_time=0.0, timeout=30.0, host=None,
+                  max_requests=None, site=None, scenario='reader'):
+    """
+    Run the reader mix against `base_url` and return the results.
+
+    Args:
+        users: Concurrent virtual users (one connection each)
+        duration: Seconds to run for
+        seed: Seeds each user's choices, so runs replay the same mix
+        think_time: Mean pause between a user's requests in seconds (0 = closed loop)
+        max_requests: Optional cap on the total number of requests
+        site: Site to request; defaults to the published blogs in the database
+        scenario: 'reader' for whole visits, 'pings' for the engagement calls only
+
+    Returns:
+        dict: 'meta', 'total' and per-endpoint 'endpoints' summaries
+    """
+    if scenario not in SCENARIOS:
+        raise ValueError(f'Unknown scenario {scenario!r}')
+    site = site or Site.from_database()
+    started_at = datetime.now(dt_timezone.utc)
+    stats, elapsed, sessions = asyncio.run(
+        _run(base_url, site, users, duration, seed, think_time, timeout, host, max_requests, scenario))
+
+    total = EndpointStats()
+    for endpoint in stats.values():
+        total.latencies += endpoint.latencies
+        total.errors += endpoint.errors
+        total.bytes += endpoint.bytes
+        for status, count in endpoint.statuses.items():
+            total.statuses[status] = total.statuses.get(status, 0) + count
+
+    return {
+        'meta': {
+            'started_at': started_at.isoformat(),
+            'revision': git_revision(),
+            'base_url': base_url,
+            'users': users,
+            'duration': elapsed,
+            'seed': seed,
+            'think_time': think_time,
+            'scenario': scenario,
+            'sessions': sessions,
+            'blogs': len(site.slugs),
+            'media_files': len(site.media_slugs),
+            'python': platform.python_version(),
+        },
+        'total': total.summary(elapsed),
+        'endpoints': {name: stats[name].summary(elapsed) for name in sorted(stats)},
+    }
+
+
+def compare_results(baseline, current):
+    """
+    Per-endpoint changes from `baseline` to `current`.
+
+    Returns:
+        list: (endpoint, metric, baseline value, current value, relative change)
+    """
+    rows = []
+    names = ['total'] + sorted(set(baseline['endpoints']) & set(current['endpoints']))
+    for name in names:
+        before = baseline['total'] if name == 'total' else baseline['endpoints'][name]
+        after = current['total'] if name == 'total' else current['endpoints'][name]
+        for metric in ('throughput', 'p50', 'p95', 'p99', 'error_rate'):
+            change = (after[metric] - before[metric]) / before[metric] if before[metric] else None
+            rows.append((name, metric, before[metric], after[metric], change))
+    return rows
+
+
+def start_local_server(port, workers, log_file=None, asgi=False):
+    """
+    Start gunicorn with gunicorn.conf.py on 127.0.0.1:`port`; returns the process.
+
+    Cache warm-up and the background job worker are left off so they don't
+    compete with the test. asgi=True
+    starts the ASGI profile (uvicorn workers) instead of sync workers. The
+    server log goes to `log_file` (an open file) or is discarded.
+    """
+    env = dict(
+        os.environ,
+        GUNICORN_BIND=f'127.0.0.1:{port}',
+        GUNICORN_WORKERS=str(workers),
+        WARM_CACHES_ON_START='False',
+        GUNICORN_RUN_JOBS='False',
+        GUNICORN_ASGI=str(asgi),
+    )
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--access-logfile', os.devnull],
+        cwd=settings.BASE_DIR, env=env, stdout=log_file or subprocess.DEVNULL, stderr=subprocess.STDOUT,
+    )
+
+
+def stop_local_server(process, timeout=10.0):
+    process.terminate()
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.backup_utils import export_portfolio_data, find_base_backup, read_manifest
+
+
+class Command(BaseCommand):
+    help = 'Write a full, incremental or differential backup ZIP to the exports directory (e.g. nightly from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode',
+            choices=('full', 'incremental', 'differential'),
+            default='full',
+            help='Changes since the newest backup (incremental) or the newest full backup (differential) '
+                 'instead of everything (default: full)',
+        )
+        parser.add_argument(
+            '--max-chain',
+            type=int,
+            default=7,
+            help='Make a full backup instead once the chain already has this many incremental backups '
+                 '(default: 7, 0 = never)',
+        )
+
+    def handle(self, *args, **options):
+        if options['max_chain'] < 0:
+            raise CommandError('--max-chain must not be negative')
+
+        base = None
+        if options['mode'] != 'full':
+            base = find_base_backup(full_only=options['mode'] == 'differential')
+            if base is None:
+                self.stdout.write('No earlier backup with digests found; making a full backup')
+            elif options['max_chain'] and len(read_manifest(base).get('chain', [])) > options['max_chain']:
+                self.stdout.write(f"{base.name} ends a chain of {options['max_chain']} increments; making a full backup")
+                base = None
+
+        try:
+            zip_path = Path(export_portfolio_data(base=base))
+        except Exception as error:
+            raise CommandError(str(error))
+
+        manifest = read_manifest(zip_path)
+        size = zip_path.stat().st_size / 1024
+        if base is None:
+            self.stdout.write(self.style.SUCCESS(f'Full backup {zip_path.name} ({size:.0f} KB)'))
+            return
+        changed = sum(manifest['changed_counts'].values())
+        deleted = sum(len(pks) for pks in manifest['deleted'].values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['mode'].capitalize()} backup {zip_path.name} ({size:.0f} KB) based on {base.name}: "
+            f"{changed} changed and {deleted} deleted rows, {manifest['media_copied']} media files, "
+            f"chain of {len(manifest['chain'])}"
+        ))
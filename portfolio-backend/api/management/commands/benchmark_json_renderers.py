@@ -0,0 +1,88 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from api.benchmarking import format_seconds, measure
+from api.models import Blog
+from api.renderers import FastJSONRenderer, orjson
+
+
+LIST_ENDPOINTS = [
+    'education-list',
+    'experience-list',
+    'project-list',
+    'research-list',
+    'research-icons-list',
+    'home-data',
+    'blog-list',
+    'trending-blogs',
+    'featured-blogs',
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON rendering throughput (stdlib vs orjson) on the real API payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Timing rounds per renderer')
+        parser.add_argument('--blogs', type=int, default=3, help='Number of blog detail payloads to include')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+
+    def get_payloads(self, blog_count):
+        """
+        Fetch each endpoint once and keep the un-rendered response data.
+
+        The response cache is turned off: its responses are built from the
+        stored bytes and carry no .data.
+        """
+        client = Client()
+        urls = [reverse(name) for name in LIST_ENDPOINTS]
+        slugs = Blog.objects.filter(is_published=True).values_list('slug', flat=True)[:blog_count]
+        urls += [reverse('blog-detail', kwargs={'slug': slug}) for slug in slugs]
+
+        payloads = []
+        for url in urls:
+            with override_settings(API_RESPONSE_CACHE=False):
+                response = client.get(url)
+            if response.status_code == 200 and getattr(response, 'data', None) is not None:
+                payloads.append((url, response.data))
+        return payloads
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; FastJSONRenderer uses the stdlib fallback'))
+
+        renderers = [('stdlib', JSONRenderer()), ('fast', FastJSONRenderer())]
+        results = []
+
+        for url, data in self.get_payloads(options['blogs']):
+            row = {'endpoint': url}
+            for name, renderer in renderers:
+                size = len(renderer.render(data))
+                timing = measure(lambda: renderer.render(data), repeat=options['repeat'])
+                row[name] = {
+                    'bytes': size,
+                    'seconds_per_call': timing['median'],
+                    'bytes_per_second': size / timing['median'] if timing['median'] else 0,
+                }
+            row['speedup'] = row['stdlib']['seconds_per_call'] / row['fast']['seconds_per_call']
+            results.append(row)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{'endpoint':60} {'bytes':>9} {'stdlib':>11} {'fast':>11} {'MB/s std':>9} {'MB/s fast':>10} {'speedup':>8}")
+        for row in results:
+            self.stdout.write(
+                f"{row['endpoint']:60} {row['fast']['bytes']:>9} "
+                f"{format_seconds(row['stdlib']['seconds_per_call']):>11} "
+                f"{format_seconds(row['fast']['seconds_per_call']):>11} "
+                f"{row['stdlib']['bytes_per_second'] / 1e6:>9.1f} "
+                f"{row['fast']['bytes_per_second'] / 1e6:>10.1f} "
+                f"{row['speedup']:>7.1f}x"
+            )
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import get_resolver
+from rest_framework.renderers import JSONRenderer
+
+from api.benchmarking import format_seconds, measure
+from api.fast_serializers import FastListMixin, get_values_serializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Verify that the values()-based list serialisation renders byte-identical JSON '
+        'to the regular serializers for every row, and time both paths'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3, help='Timing rounds per path')
+        parser.add_argument('--no-timing', action='store_true', help='Only check equivalence')
+
+    def get_serializer_classes(self):
+        """Serializer classes used by every FastListMixin view in the URLconf."""
+        classes = []
+        for pattern in get_resolver().url_patterns:
+            for sub in getattr(pattern, 'url_patterns', [pattern]):
+                view_class = getattr(sub.callback, 'view_class', None)
+                if view_class and issubclass(view_class, FastListMixin) and view_class.serializer_class not in classes:
+                    classes.append(view_class.serializer_class)
+        return classes
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        failures = []
+
+        for serializer_class in self.get_serializer_classes():
+            queryset = serializer_class.Meta.model.objects.all()
+            values_serializer = get_values_serializer(serializer_class)
+
+            regular = renderer.render(serializer_class(queryset, many=True).data)
+            fast = renderer.render(values_serializer.serialize(queryset))
+
+            if regular != fast:
+                failures.append(serializer_class.__name__)
+                self.stdout.write(self.style.ERROR(f'{serializer_class.__name__}: output differs'))
+                continue
+
+            line = f'{serializer_class.__name__:35} {queryset.count():>6} rows  identical'
+            if not options['no_timing']:
+                slow = measure(lambda: serializer_class(queryset.all(), many=True).data, repeat=options['repeat'])
+                quick = measure(lambda: values_serializer.serialize(queryset.all()), repeat=options['repeat'])
+                line += (
+                    f"  serializer {format_seconds(slow['median']):>10}"
+                    f"  values() {format_seconds(quick['median']):>10}"
+                    f"  ({slow['median'] / quick['median']:.1f}x)"
+                )
+            self.stdout.write(self.style.SUCCESS(line))
+
+        if failures:
+            raise CommandError(f"Fast serialisation differs for: {', '.join(failures)}")
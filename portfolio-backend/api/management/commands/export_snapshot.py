@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from api.snapshots import export_snapshot, get_snapshot_root
+
+
+class Command(BaseCommand):
+    help = 'Write every public API payload to a versioned directory of static JSON files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only re-render detail pages that changed since the current snapshot',
+        )
+        parser.add_argument(
+            '--output',
+            help='Snapshot directory (default: SNAPSHOT_ROOT)',
+        )
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=3,
+            help='Number of snapshot versions to keep (default: 3)',
+        )
+
+    def handle(self, *args, **options):
+        root = options.get('output') or get_snapshot_root()
+        stats = export_snapshot(incremental=options['incremental'], root=root, keep=options['keep'])
+
+        base = f" (based on {stats['base']})" if stats['base'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot {stats['version']}{base}: {stats['written']} file(s) written, "
+            f"{stats['reused']} reused"
+        ))
+        for path in stats['skipped']:
+            self.stdout.write(self.style.WARNING(f'  - skipped {path} (non-200 response)'))
+        if stats['pruned']:
+            self.stdout.write(f"  Pruned old version(s): {', '.join(stats['pruned'])}")
+        self.stdout.write(f'  Current snapshot: {root}/current')
@@ -0,0 +1,94 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarking import format_seconds
+from api.datagen import PREFIX, clear_generated, generate_dataset, has_generated_rows
+
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible synthetic dataset (blogs, views, likes, comments, projects, media) for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--blogs', type=int, default=200, help='Blogs to create (default: 200)')
+        parser.add_argument('--views', type=int, default=100000, help='BlogView rows to create (default: 100000)')
+        parser.add_argument('--likes', type=int, default=5000, help='BlogLike rows to create (default: 5000)')
+        parser.add_argument('--comments', type=int, default=2000, help='Comments to create (default: 2000)')
+        parser.add_argument('--projects', type=int, default=30, help='Projects to create (default: 30)')
+        parser.add_argument('--media', type=int, default=20, help='Media files to create (default: 20)')
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=90,
+            help='Length of the view/like/comment history ending today (default: 90)',
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per bulk_create or delete batch (default: 5000)',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously generated rows (slugs starting with "gen-") first',
+        )
+        parser.add_argument(
+            '--clear-only',
+            action='store_true',
+            help='Delete previously generated rows and exit',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--days and --batch-size must be at least 1')
+
+        if options['clear'] or options['clear_only']:
+            started = time.perf_counter()
+            deleted = clear_generated(options['batch_size'])
+            summary = ', '.join(f'{count} {name}' for name, count in deleted.items())
+            self.stdout.write(f'Deleted {summary} in {format_seconds(time.perf_counter() - started)}')
+            if options['clear_only']:
+                return
+        elif has_generated_rows():
+            raise CommandError(f'The database already has generated rows (slugs starting with "{PREFIX}"); '
+                               'pass --clear to replace them')
+
+        last_reported = [0.0]
+
+        def progress(step, done, total):
+            now = time.perf_counter()
+            if now - last_reported[0] >= 5 or done >= total:
+                last_reported[0] = now
+                self.stdout.write(f'  {step}: {done}/{total}')
+
+        started = time.perf_counter()
+        steps = generate_dataset(
+            blogs=options['blogs'],
+            views=options['views'],
+            likes=options['likes'],
+            comments=options['comments'],
+            projects=options['projects'],
+            media=options['media'],
+            days=options['days'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            progress=progress,
+        )
+
+        for name, seconds, result in steps:
+            if isinstance(result, Counter):
+                detail = f'{sum(result.values())} counted'
+            elif isinstance(result, dict):
+                detail = ', '.join(f'{key}={value}' for key, value in result.items())
+            elif isinstance(result, list):
+                detail = f'{len(result)} published'
+            else:
+                detail = '' if result is None else str(result)
+            self.stdout.write(f'  {name:<10} {format_seconds(seconds):>10}  {detail}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated dataset (seed {options['seed']}) in {format_seconds(time.perf_counter() - started)}"
+        ))
@@ -0,0 +1,181 @@
+import json
+import socket
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarking import format_seconds
+from api.loadtest import (
+    SCENARIOS,
+    Site,
+    compare_results,
+    is_generated_database,
+    run_load_test,
+    start_local_server,
+    stop_local_server,
+)
+from api.warmup import default_host_header, wait_for_server
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = 'Replay a realistic reader traffic mix against the backend and report latency per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            help='Running server to test (default: start gunicorn locally, see --workers)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=3,
+            help='Gunicorn workers for the locally started server (default: 3)',
+        )
+        parser.add_argument(
+            '--asgi',
+            action='store_true',
+            help='Start the local server with the ASGI profile (uvicorn workers, async engagement views)',
+        )
+        parser.add_argument(
+            '--scenario',
+            choices=SCENARIOS,
+            default='reader',
+            help='Whole reader visits, or only the engagement pings sent while reading (default: reader)',
+        )
+        parser.add_argument(
+            '--host',
+            help='Host header to send (default: first entry of ALLOWED_HOSTS)',
+        )
+        parser.add_argument(
+            '--allow-writes',
+            action='store_true',
+            help='Run even though the database has posts not created by generate_dataset '
+                 '(the test records views, likes and reading time)',
+        )
+        parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users (default: 20)')
+        parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run (default: 30)')
+        parser.add_argument(
+            '--requests',
+            type=int,
+            help='Stop after this many requests even if --duration has not passed',
+        )
+        parser.add_argument(
+            '--think-time',
+            type=float,
+            default=0.0,
+            help='Mean pause between a user\'s requests in seconds (default: 0, back to back)',
+        )
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds (default: 30)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the traffic mix (default: 42)')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='Results JSON of an earlier run to compare against')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['duration'] <= 0:
+            raise CommandError('--users and --duration must be positive')
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as handle:
+                    baseline = json.load(handle)
+            except (OSError, ValueError) as error:
+                raise CommandError(f"Can't read {options['compare']}: {error}")
+
+        try:
+            site = Site.from_database()
+        except ValueError as error:
+            raise CommandError(str(error))
+        if not options['allow_writes'] and not is_generated_database():
+            raise CommandError(
+                'The load test records views and likes, and this database has published posts that '
+                'generate_dataset did not create. Use a database filled by generate_dataset, or pass --allow-writes.'
+            )
+
+        host = options.get('host') or default_host_header()
+        server = log = None
+        base_url = options['base_url']
+        if not base_url:
+            port = free_port()
+            base_url = f'http://127.0.0.1:{port}'
+            log = tempfile.TemporaryFile()
+            server = start_local_server(port, options['workers'], log, asgi=options['asgi'])
+            if not wait_for_server(base_url, 60, host):
+                stop_local_server(server)
+                log.seek(0)
+                raise CommandError(f'gunicorn did not start:\n{log.read().decode(errors="replace")[-2000:]}')
+
+        try:
+            results = run_load_test(
+                base_url,
+                users=options['users'],
+                duration=options['duration'],
+                seed=options['seed'],
+                think_time=options['think_time'],
+                timeout=options['timeout'],
+                host=host,
+                max_requests=options['requests'],
+                site=site,
+                scenario=options['scenario'],
+            )
+        finally:
+            if server is not None:
+                stop_local_server(server)
+                log.close()
+        if server is not None:
+            results['meta']['workers'] = options['workers']
+            results['meta']['asgi'] = options['asgi']
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(results, handle, indent=2)
+                handle.write('\n')
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.write_table(results)
+        if baseline:
+            self.write_comparison(baseline, results)
+
+    def write_table(self, results):
+        meta = results['meta']
+        self.stdout.write(
+            f"{meta['base_url']}  {meta.get('scenario', 'reader')}  {meta['users']} users  {meta['duration']:.1f} s  "
+            f"{meta['sessions']} sessions  revision {meta['revision'] or '-'}"
+        )
+        self.stdout.write(
+            f"  {'endpoint':<16} {'requests':>9} {'req/s':>8} {'p50':>10} {'p95':>10} {'p99':>10} {'errors':>8}")
+        rows = list(results['endpoints'].items()) + [('total', results['total'])]
+        for name, row in rows:
+            line = (
+                f"  {name:<16} {row['requests']:>9} {row['throughput']:>8.1f} "
+                f"{format_seconds(row['p50']):>10} {format_seconds(row['p95']):>10} "
+                f"{format_seconds(row['p99']):>10} {row['error_rate']:>7.1%}"
+            )
+            self.stdout.write(self.style.WARNING(line) if row['errors'] else line)
+
+        if results['total']['errors']:
+            statuses = ', '.join(f'{status}: {count}' for status, count in results['total']['statuses'].items())
+            self.stdout.write(self.style.WARNING(f'Responses by status: {statuses}'))
+
+    def write_comparison(self, baseline, results):
+        self.stdout.write(
+            f"Compared with revision {baseline['meta'].get('revision') or '-'} ({baseline['meta']['started_at']}):")
+        for name, metric, before, after, change in compare_results(baseline, results):
+            if metric == 'throughput':
+                values = f'{before:>10.1f} {after:>10.1f}'
+            elif metric == 'error_rate':
+                values = f'{before:>10.1%} {after:>10.1%}'
+            else:
+                values = f'{format_seconds(before):>10} {format_seconds(after):>10}'
+            delta = f'{change:+.1%}' if change is not None else '-'
+            self.stdout.write(f'  {name:<16} {metric:<10} {values} {delta:>8}')
@@ -0,0 +1,109 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+from api.memory import (
+    POLL_SECONDS,
+    clear_snapshots,
+    format_growth,
+    is_alive,
+    list_snapshots,
+    list_workers,
+    request_snapshots,
+    worker_reports,
+)
+
+
+class Command(BaseCommand):
+    help = 'Report memory growth and top allocation sites of the gunicorn workers (needs API_TRACEMALLOC=True)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--snapshot',
+            action='store_true',
+            help='Ask every worker for a fresh snapshot first and wait for them',
+        )
+        parser.add_argument('--pid', type=int, help='Only report this worker')
+        parser.add_argument('--limit', type=int, default=10, help='Allocation sites per worker (default: 10)')
+        parser.add_argument(
+            '--since',
+            choices=['first', 'previous'],
+            default='first',
+            help='Measure growth from the worker\'s first snapshot or the one before the latest (default: first)',
+        )
+        parser.add_argument(
+            '--group-by',
+            choices=['lineno', 'traceback'],
+            default='lineno',
+            help='Group allocations by line or by whole call stack (default: lineno)',
+        )
+        parser.add_argument('--clear', action='store_true', help='Delete all snapshots and exit')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            clear_snapshots()
+            self.stdout.write(self.style.SUCCESS('Deleted all memory snapshots'))
+            return
+
+        if options['snapshot']:
+            requested = time.time()
+            request_snapshots()
+            self.wait_for_snapshots(requested)
+
+        reports = worker_reports(options['limit'], options['pid'], options['since'], options['group_by'])
+        if not reports:
+            hint = '' if getattr(settings, 'API_TRACEMALLOC', False) else ' (API_TRACEMALLOC is off)'
+            raise CommandError(f'No worker snapshots in {settings.API_MEMORY_DIR}{hint}')
+
+        if options['json']:
+            self.stdout.write(json.dumps(reports, indent=2))
+            return
+
+        for report in reports:
+            self.write_report(report)
+
+    def wait_for_snapshots(self, requested):
+        """Wait until every running worker has a snapshot newer than `requested`."""
+        deadline = time.monotonic() + POLL_SECONDS * 5
+        while time.monotonic() < deadline:
+            pending = []
+            for pid in list_workers():
+                snapshots = list_snapshots(pid)
+                if is_alive(pid) and snapshots and snapshots[-1]['taken_at'] < requested:
+                    pending.append(pid)
+            if not pending:
+                return
+            time.sleep(0.5)
+        self.stdout.write(self.style.WARNING(f'Workers {pending} did not answer; reporting older snapshots'))
+
+    def write_report(self, report):
+        snapshots = report['snapshots']
+        state = 'running' if report['alive'] else 'exited'
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Worker {report['pid']} ({state}), {len(snapshots)} snapshot(s)"))
+        for meta in snapshots:
+            taken = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta['taken_at']))
+            requests = meta['requests'] if meta['requests'] is not None else '-'
+            self.stdout.write(
+                f"  {taken}  RSS {filesizeformat(meta['rss']):>10}  traced {filesizeformat(meta['traced']):>10}  "
+                f"requests {requests:>7}  ({meta['reason']})"
+            )
+        self.stdout.write(
+            f"  Growth: RSS {format_growth(report['rss_growth'])}, traced {format_growth(report['traced_growth'])}")
+
+        if report['growth']:
+            self.stdout.write('  Sites that grew the most:')
+            for stat in report['growth']:
+                self.stdout.write(
+                    f"    {format_growth(stat['size_diff']):>12} {stat['count_diff']:>+8} blocks  {stat['site']}")
+                for frame in stat['traceback'][:-1][::-1]:
+                    self.stdout.write(f'{"":36}called from {frame}')
+
+        self.stdout.write('  Largest sites now:')
+        for stat in report['top']:
+            self.stdout.write(f"    {filesizeformat(stat['size']):>12} {stat['count']:>8} blocks  {stat['site']}")
+        self.stdout.write('')
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Blog
+from api.related import rebuild_related_blogs, update_related_for_blog
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the related-posts index (TF-IDF cosine neighbours) for blog posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--slug',
+            help='Only refresh the neighbours affected by this blog instead of rebuilding everything',
+        )
+
+    def handle(self, *args, **options):
+        slug = options.get('slug')
+        if slug:
+            try:
+                blog = Blog.objects.get(slug=slug)
+            except Blog.DoesNotExist:
+                raise CommandError(f'Blog "{slug}" does not exist')
+            rewritten = update_related_for_blog(blog.id)
+            self.stdout.write(self.style.SUCCESS(f'Refreshed neighbour lists for {rewritten} blog(s)'))
+            return
+
+        rows = rebuild_related_blogs()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt related-posts index: {rows} neighbour row(s)'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api.search import fts_available, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for blogs, projects and research publications'
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write(self.style.WARNING(
+                'Full-text index is only used on SQLite; search falls back to icontains on this database.'
+            ))
+            return
+
+        count = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} document(s)'))
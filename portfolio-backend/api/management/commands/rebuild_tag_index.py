@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Tag
+from api.tags import rebuild_tag_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the normalised tag tables from the tags JSON fields'
+
+    def handle(self, *args, **options):
+        links = rebuild_tag_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {Tag.objects.count()} tag(s) with {links} link(s)'))
@@ -0,0 +1,93 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmark_suite import compare_results, run_benchmarks
+from api.benchmarking import format_seconds
+
+
+class Command(BaseCommand):
+    help = 'Time the hot functions (markdown rendering, serializers, backup export/import) over repeated rounds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=7, help='Timing rounds per benchmark (default: 7)')
+        parser.add_argument(
+            '--min-time',
+            type=float,
+            default=0.2,
+            help='Minimum seconds per round; sets how many calls a round makes (default: 0.2)',
+        )
+        parser.add_argument('--filter', help='Only run benchmarks whose name contains this text')
+        parser.add_argument('--seed', type=int, default=42, help='Seed for the generated content (default: 42)')
+        parser.add_argument(
+            '--backup-blogs',
+            type=int,
+            default=100,
+            help='Blogs in the dataset generated for the backup benchmarks (default: 100)',
+        )
+        parser.add_argument(
+            '--backup-views',
+            type=int,
+            default=20000,
+            help='BlogView rows in that dataset (default: 20000)',
+        )
+        parser.add_argument(
+            '--backup-repeat',
+            type=int,
+            default=3,
+            help='Timing rounds for the backup benchmarks, one call each (default: 3)',
+        )
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='Results JSON of an earlier run to compare against')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 2 or options['backup_repeat'] < 1:
+            raise CommandError('--repeat must be at least 2 and --backup-repeat at least 1')
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as handle:
+                    baseline = json.load(handle)
+            except (OSError, ValueError) as error:
+                raise CommandError(f"Can't read {options['compare']}: {error}")
+
+        def progress(name):
+            if not options['json']:
+                self.stderr.write(f'  running {name}...')
+
+        results = run_benchmarks(
+            repeat=options['repeat'],
+            min_time=options['min_time'],
+            seed=options['seed'],
+            select=options['filter'],
+            backup_blogs=options['backup_blogs'],
+            backup_views=options['backup_views'],
+            backup_repeat=options['backup_repeat'],
+            progress=progress,
+        )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(results, handle, indent=2)
+                handle.write('\n')
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{'benchmark':40} {'median':>11} {'min':>11} {'stdev':>11} {'calls':>12}")
+        for row in results['results']:
+            self.stdout.write(
+                f"{row['name']:40} {format_seconds(row['median']):>11} {format_seconds(row['min']):>11} "
+                f"{format_seconds(row['stdev']):>11} {row['number']:>7} x {row['repeat']:<3}"
+            )
+
+        if baseline:
+            self.stdout.write(f"Median change since revision {baseline['meta'].get('revision') or '-'}:")
+            for name, before, after, change in compare_results(baseline, results):
+                line = f'  {name:38} {format_seconds(before):>11} {format_seconds(after):>11} '
+                line += f'{change:+8.1%}' if change is not None else '       -'
+                # Flag slowdowns beyond typical run-to-run noise
+                self.stdout.write(self.style.WARNING(line) if change and change > 0.1 else line)
@@ -0,0 +1,35 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from api.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (backup exports and imports, related-post updates) until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs queued now and exit instead of waiting for more',
+        )
+        parser.add_argument(
+            '--poll',
+            type=float,
+            help='Seconds between checks of an empty queue (default: API_JOB_POLL_INTERVAL)',
+        )
+
+    def handle(self, *args, **options):
+        stopping = []
+
+        def stop(signum, frame):
+            # Finish the running job; a half-done import is worse than a late exit
+            self.stdout.write('Stopping after the current job')
+            stopping.append(signum)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        ran = run_worker(poll_interval=options['poll'], once=options['once'], should_stop=lambda: bool(stopping))
+        self.stdout.write(self.style.SUCCESS(f'Ran {ran} job(s)'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Blog
+from api.trending import update_trending_scores
+
+
+class Command(BaseCommand):
+    help = 'Recompute time-decayed trending scores from recent views and likes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignore stored scores and recompute every blog from the trending window',
+        )
+
+    def handle(self, *args, **options):
+        stats = update_trending_scores(full=options['full'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated trending scores: {stats['incremental']} incremental, {stats['full']} from scratch, "
+            f"{stats['unchanged']} unchanged"
+        ))
+
+        top = Blog.objects.filter(is_published=True, trending_score__gt=0).order_by('-trending_score')[:5]
+        for blog in top:
+            self.stdout.write(f'  - {blog.trending_score:10.2f}  {blog.title}')
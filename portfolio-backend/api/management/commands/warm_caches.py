@@ -0,0 +1,93 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarking import format_seconds
+from api.snapshots import public_paths
+from api.warmup import default_host_header, uncached_markdown, wait_for_server, warm_endpoints, warm_local_caches
+
+
+class Command(BaseCommand):
+    help = 'Fill the render, lookup and response caches by walking every public endpoint and blog slug'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            default='http://127.0.0.1:8000',
+            help='Running server to request (default: http://127.0.0.1:8000)',
+        )
+        parser.add_argument(
+            '--host',
+            help='Host header to send (default: first entry of ALLOWED_HOSTS)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Maximum requests in flight (default: 4)',
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=30.0,
+            help='Per-request timeout in seconds (default: 30)',
+        )
+        parser.add_argument(
+            '--wait',
+            type=float,
+            default=0.0,
+            help='Seconds to wait for the server to come up before giving up (default: 0)',
+        )
+        parser.add_argument(
+            '--local-only',
+            action='store_true',
+            help='Only warm the in-process caches (markdown, facets); make no HTTP requests',
+        )
+
+    def handle(self, *args, **options):
+        for name, seconds in warm_local_caches().items():
+            self.stdout.write(f'  {name:<40} {format_seconds(seconds):>10}')
+
+        if options['local_only']:
+            if self.check_markdown():
+                self.stdout.write(self.style.SUCCESS('Warmed local caches'))
+            return
+
+        base_url = options['base_url']
+        host = options.get('host') or default_host_header()
+        if options['wait'] and not wait_for_server(base_url, options['wait'], host):
+            raise CommandError(f'{base_url} did not answer within {options["wait"]:g}s')
+
+        paths = public_paths()
+        started = time.perf_counter()
+        results = warm_endpoints(base_url, paths, options['concurrency'], options['timeout'], host)
+        elapsed = time.perf_counter() - started
+
+        for result in results:
+            status = result['status'] or result['error']
+            line = (
+                f"  {result['path']:<40} {format_seconds(result['seconds']):>10} "
+                f"{result['bytes']:>9} B  {status}  {result['cache'] or ''}"
+            )
+            self.stdout.write(line if result['status'] == 200 else self.style.WARNING(line))
+
+        failed = [result for result in results if result['status'] != 200]
+        slowest = max(results, key=lambda result: result['seconds'], default=None)
+        summary = (
+            f'Warmed {len(results) - len(failed)}/{len(results)} endpoint(s) in {format_seconds(elapsed)} '
+            f"(concurrency {options['concurrency']})"
+        )
+        if slowest:
+            summary += f"; slowest {slowest['path']} {format_seconds(slowest['seconds'])}"
+        self.stdout.write(self.style.WARNING(summary) if failed else self.style.SUCCESS(summary))
+        self.check_markdown()
+
+    def check_markdown(self):
+        """Warn if warmed renderings were already evicted; returns True if all are cached."""
+        missing = uncached_markdown()
+        if missing:
+            self.stdout.write(self.style.WARNING(
+                f'{len(missing)} rendered post(s) were evicted again (e.g. {missing[0]}): '
+                f'the cache is too small for this site, raise DJANGO_CACHE_MAX_ENTRIES'
+            ))
+        return not missing
@@ -0,0 +1,255 @@
+"""
+Memory growth tracking for long-lived gunicorn workers.
+
+With API_TRACEMALLOC=True, gunicorn.conf.py calls start_worker_monitor() in
+every worker once the application is loaded. It starts tracemalloc and a
+daemon thread that dumps a snapshot into API_MEMORY_DIR/<pid>/:
+
+- when the worker starts (the baseline),
+- every API_MEMORY_SNAPSHOT_INTERVAL seconds,
+- and whenever request_snapshots() has been called since the last one
+  (the admin page and `memory_report --snapshot` do this), so every
+  worker can be asked for a snapshot whichever one serves the request.
+
+Each snapshot has a small .json with the worker's RSS, traced memory and
+request count. worker_reports() diffs a worker's snapshots and returns
+the allocation sites that grew the most. Snapshots are only compared
+within one worker.
+"""
+
+import json
+import linecache
+import os
+import resource
+import shutil
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.template.defaultfilters import filesizeformat
+
+POLL_SECONDS = 2.0
+REQUEST_FILE = 'snapshot-request'
+# Workers whose snapshots are kept after they exit (recycled or crashed)
+DEAD_WORKERS_KEPT = 5
+IGNORED_FILES = (
+    tracemalloc.__file__,
+    linecache.__file__,
+    '<frozen importlib._bootstrap>',
+    '<frozen importlib._bootstrap_external>',
+    '<unknown>',
+)
+
+
+def memory_dir():
+    return Path(getattr(settings, 'API_MEMORY_DIR', Path(settings.BASE_DIR) / 'memory'))
+
+
+def current_rss():
+    """Resident set size of this process in bytes (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm', encoding='ascii') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is in KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+def is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def request_snapshots():
+    """Ask every monitored worker for a snapshot at its next poll."""
+    directory = memory_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / REQUEST_FILE).write_text(str(time.time()), encoding='ascii')
+
+
+def _requested_at():
+    try:
+        return float((memory_dir() / REQUEST_FILE).read_text(encoding='ascii'))
+    except (OSError, ValueError):
+        return 0.0
+
+
+def take_snapshot(worker=None, reason='interval'):
+    """Dump a tracemalloc snapshot of this process and its metadata; returns the snapshot path."""
+    directory = memory_dir() / str(os.getpid())
+    directory.mkdir(parents=True, exist_ok=True)
+
+    snapshot = tracemalloc.take_snapshot()
+    traced, peak = tracemalloc.get_traced_memory()
+    taken_at = time.time()
+    name = f'{int(taken_at * 1_000_000)}'  # microseconds, so back-to-back snapshots don't collide
+    snapshot.dump(str(directory / f'{name}.tracemalloc'))
+    meta = {
+        'pid': os.getpid(),
+        'taken_at': taken_at,
+        'reason': reason,
+        'rss': current_rss(),
+        'traced': traced,
+        'traced_peak': peak,
+        'requests': getattr(worker, 'nr', None),
+    }
+    (directory / f'{name}.json').write_text(json.dumps(meta), encoding='utf-8')
+
+    keep = getattr(settings, 'API_MEMORY_SNAPSHOTS_KEEP', 12)
+    # Always keep the first snapshot: it's the baseline growth is measured from
+    for old in list_snapshots(os.getpid())[1:-keep or None]:
+        delete_snapshot(old)
+    return directory / f'{name}.tracemalloc'
+
+
+def _monitor(worker, interval):
+    handled_request = _requested_at()
+    next_due = time.monotonic() + interval
+    while True:
+        time.sleep(POLL_SECONDS)
+        requested = _requested_at()
+        if requested > handled_request:
+            handled_request = requested
+            take_snapshot(worker, 'requested')
+        elif time.monotonic() >= next_due:
+            take_snapshot(worker, 'interval')
+        else:
+            continue
+        next_due = time.monotonic() + interval
+
+
+def start_worker_monitor(worker=None):
+    """Start tracing this process and snapshotting it in the background (no-op unless API_TRACEMALLOC)."""
+    if not getattr(settings, 'API_TRACEMALLOC', False):
+        return False
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(getattr(settings, 'API_TRACEMALLOC_FRAMES', 10))
+    prune_dead_workers()
+    take_snapshot(worker, 'start')
+    interval = getattr(settings, 'API_MEMORY_SNAPSHOT_INTERVAL', 600)
+    threading.Thread(target=_monitor, args=(worker, interval), name='memory-monitor', daemon=True).start()
+    return True
+
+
+def list_snapshots(pid):
+    """Metadata of a worker's snapshots, oldest first."""
+    snapshots = []
+    for path in (memory_dir() / str(pid)).glob('*.json'):
+        try:
+            meta = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        meta['path'] = str(path.with_suffix('.tracemalloc'))
+        snapshots.append(meta)
+    return sorted(snapshots, key=lambda meta: meta['taken_at'])
+
+
+def delete_snapshot(meta):
+    path = Path(meta['path'])
+    path.unlink(missing_ok=True)
+    path.with_suffix('.json').unlink(missing_ok=True)
+
+
+def list_workers():
+    """PIDs with snapshots, newest worker first."""
+    directory = memory_dir()
+    if not directory.exists():
+        return []
+    pids = [int(path.name) for path in directory.iterdir() if path.is_dir() and path.name.isdigit()]
+    return sorted(pids, key=lambda pid: (memory_dir() / str(pid)).stat().st_mtime, reverse=True)
+
+
+def prune_dead_workers(keep=DEAD_WORKERS_KEPT):
+    dead = [pid for pid in list_workers() if not is_alive(pid)]
+    for pid in dead[keep:]:
+        shutil.rmtree(memory_dir() / str(pid), ignore_errors=True)
+
+
+def clear_snapshots():
+    """Delete every worker's snapshots (running workers keep taking new ones)."""
+    for pid in list_workers():
+        shutil.rmtree(memory_dir() / str(pid), ignore_errors=True)
+
+
+def format_growth(size):
+    """A byte delta as '+1.2 MB' / '-300 bytes'."""
+    return ('+' if size >= 0 else '-') + filesizeformat(abs(size))
+
+
+def _site(stat):
+    # Tracebacks run from the oldest frame to the allocating one
+    frame = stat.traceback[-1]
+    return f'{frame.filename}:{frame.lineno}'
+
+
+def compare_snapshots(old, new, limit=15, group_by='lineno'):
+    """
+    Allocation sites by growth between two snapshots (metadata dicts),
+    grouped by allocating line or, with group_by='traceback', by the whole
+    call stack (needs API_TRACEMALLOC_FRAMES > 1 to show the callers).
+
+    Returns:
+        list: dicts with site, size, size_diff, count, count_diff and the
+        innermost frames of the allocating traceback
+    """
+    before = tracemalloc.Snapshot.load(old['path'])
+    after = tracemalloc.Snapshot.load(new['path'])
+    stats = [stat for stat in after.compare_to(before, group_by) if _counted(stat) and stat.size_diff > 0]
+    stats.sort(key=lambda stat: stat.size_diff, reverse=True)
+    return [_stat_dict(stat) for stat in stats[:limit]]
+
+
+def top_sites(meta, limit=15):
+    """Largest allocation sites (by line) in one snapshot."""
+    snapshot = tracemalloc.Snapshot.load(meta['path'])
+    stats = [stat for stat in snapshot.statistics('lineno') if _counted(stat)]
+    return [_stat_dict(stat) for stat in stats[:limit]]
+
+
+def _counted(stat):
+    # Snapshot.filter_traces() would do this, but takes seconds on a busy worker
+    return stat.traceback[-1].filename not in IGNORED_FILES
+
+
+def _stat_dict(stat):
+    return {
+        'site': _site(stat),
+        'size': stat.size,
+        'size_diff': getattr(stat, 'size_diff', None),
+        'count': stat.count,
+        'count_diff': getattr(stat, 'count_diff', None),
+        'traceback': [f'{frame.filename}:{frame.lineno}' for frame in stat.traceback][-5:],
+    }
+
+
+def worker_reports(limit=15, pid=None, since='first', group_by='lineno'):
+    """
+    Growth report per worker: snapshots (RSS over time) and the sites that
+    grew most from the first (or `since='previous'`) snapshot to the latest.
+    """
+    reports = []
+    for worker_pid in ([pid] if pid else list_workers()):
+        snapshots = list_snapshots(worker_pid)
+        if not snapshots:
+            continue
+        latest = snapshots[-1]
+        base = snapshots[0] if since == 'first' or len(snapshots) < 2 else snapshots[-2]
+        report = {
+            'pid': worker_pid,
+            'alive': is_alive(worker_pid),
+            'snapshots': [{key: value for key, value in meta.items() if key != 'path'} for meta in snapshots],
+            'rss_growth': latest['rss'] - base['rss'],
+            'traced_growth': latest['traced'] - base['traced'],
+            'growth': compare_snapshots(base, latest, limit, group_by) if base is not latest else [],
+            'top': top_sites(latest, limit),
+        }
+        reports.append(report)
+    return reports
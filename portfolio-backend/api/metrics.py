@@ -0,0 +1,156 @@
+"""
+Prometheus metrics for GET /api/metrics/.
+
+Request figures come from InstrumentationMiddleware (so they need
+API_INSTRUMENTATION), engagement and media counters from the views that
+record them. Under gunicorn every worker writes its samples to files in
+PROMETHEUS_MULTIPROC_DIR (set up by gunicorn.conf.py) and the endpoint
+aggregates all of them, so a scrape sees the whole server whichever worker
+answers it. Without that variable (runserver, manage.py) the process-local
+registry is used.
+
+Database-derived gauges (trending backlog) are computed at scrape time.
+prometheus_client is optional; without it the endpoint answers 503.
+
+Only loopback clients may scrape by default: set API_METRICS_TOKEN or widen
+API_METRICS_ALLOWED_IPS for a Prometheus on another host or container.
+"""
+
+import hmac
+import ipaddress
+import os
+import time
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram, multiprocess
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # metrics are optional
+    prometheus_client = None
+
+from .models import Blog, BlogLike, BlogView
+
+# Request latency buckets in seconds; cache hits land in the first few
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def is_enabled():
+    return prometheus_client is not None and getattr(settings, 'API_METRICS', True)
+
+
+def is_multiprocess():
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+def is_allowed_scraper(request):
+    """
+    Whether `request` may read the metrics: it sends API_METRICS_TOKEN as
+    `Authorization: Bearer <token>`, or its REMOTE_ADDR (never a forwarded
+    header, which clients can set) is in API_METRICS_ALLOWED_IPS.
+    """
+    token = getattr(settings, 'API_METRICS_TOKEN', '')
+    if token:
+        supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ')
+        if hmac.compare_digest(supplied.encode(), token.encode()):
+            return True
+
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in getattr(settings, 'API_METRICS_ALLOWED_IPS', ())
+    )
+
+
+if prometheus_client is not None:
+    REQUEST_DURATION = Histogram(
+        'api_request_duration_seconds', 'Request latency by URL route',
+        ['route', 'method'], buckets=LATENCY_BUCKETS,
+    )
+    REQUESTS = Counter('api_requests', 'Requests by URL route and status', ['route', 'method', 'status'])
+    DB_QUERIES = Counter('api_db_queries', 'SQL queries by URL route', ['route'])
+    DB_SECONDS = Counter('api_db_query_seconds', 'SQL time by URL route', ['route'])
+    CACHE_LOOKUPS = Counter('api_cache_lookups', 'Shared cache lookups', ['cache', 'result'])
+    ENGAGEMENT_EVENTS = Counter('api_engagement_events', 'Blog views and likes recorded', ['event'])
+    MEDIA_BYTES = Counter('api_media_bytes_served', 'Bytes of media files served by /api/cdn/', ['file_type'])
+    WORKER_STARTED = Gauge(
+        'api_worker_start_time_seconds', 'Start time of each live worker process',
+        multiprocess_mode='liveall',
+    )
+    WORKER_REQUESTS = Gauge(
+        'api_worker_requests', 'Requests handled by each live worker process',
+        multiprocess_mode='liveall',
+    )
+    WORKER_STARTED.set(time.time())
+
+
+def observe_request(method, status, request_metrics):
+    """Record one finished request from its instrumentation.RequestMetrics."""
+    route = request_metrics.route or '-'
+    REQUEST_DURATION.labels(route, method).observe(request_metrics.total_time)
+    REQUESTS.labels(route, method, str(status)).inc()
+    if request_metrics.db_queries:
+        DB_QUERIES.labels(route).inc(request_metrics.db_queries)
+        DB_SECONDS.labels(route).inc(request_metrics.db_time)
+    for (cache_name, hit), count in request_metrics.cache_lookups.items():
+        CACHE_LOOKUPS.labels(cache_name, 'hit' if hit else 'miss').inc(count)
+    WORKER_REQUESTS.inc()
+
+
+def record_engagement(event):
+    """Count a recorded 'view', 'like' or 'unlike'."""
+    if is_enabled():
+        ENGAGEMENT_EVENTS.labels(event).inc()
+
+
+def record_media_bytes(file_type, size):
+    if is_enabled() and size:
+        MEDIA_BYTES.labels(file_type).inc(size)
+
+
+class TrendingBacklogCollector:
+    """
+    Engagement events recorded since the last trending score update, i.e.
+    waiting for update_trending_scores to fold them into Blog.trending_score.
+    """
+
+    def collect(self):
+        # Runs leave unchanged scores alone, so the newest timestamp is the last run
+        since = Blog.objects.filter(is_published=True).aggregate(
+            latest=Max('trending_score_updated_at'))['latest']
+        views = BlogView.objects.all()
+        likes = BlogLike.objects.filter(is_active=True)
+        if since is not None:
+            views = views.filter(viewed_at__gt=since)
+            likes = likes.filter(liked_at__gt=since)
+
+        backlog = GaugeMetricFamily(
+            'api_trending_pending_events', 'Engagement events not yet in trending scores', labels=['event'])
+        backlog.add_metric(['view'], views.count())
+        backlog.add_metric(['like'], likes.count())
+        yield backlog
+
+        age = (timezone.now() - since).total_seconds() if since else float('nan')
+        yield GaugeMetricFamily(
+            'api_trending_update_age_seconds', 'Seconds since trending scores last changed', value=age)
+
+
+def render_metrics():
+    """Return (body, content_type) in the Prometheus text format."""
+    if is_multiprocess():
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+
+    live = prometheus_client.CollectorRegistry()
+    live.register(TrendingBacklogCollector())
+
+    body = prometheus_client.generate_latest(registry) + prometheus_client.generate_latest(live)
+    return body, prometheus_client.CONTENT_TYPE_LATEST
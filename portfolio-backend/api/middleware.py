@@ -0,0 +1,237 @@
+import logging
+import threading
+import time
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import reverse
+
+from . import instrumentation, metrics as prometheus_metrics, profiling, response_cache
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentationMiddleware:
+    """
+    Time every request and report it in a Server-Timing header, an
+    `api.performance` log line (see api/instrumentation.py) and the
+    Prometheus metrics (api/metrics.py).
+
+    Should be the first middleware so `total` covers the whole stack. With
+    API_INSTRUMENTATION=False it removes itself at start-up.
+    """
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'API_INSTRUMENTATION', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrumentation.record_queries()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Non-blocking hooks: as coroutines Django awaits them instead of hopping to a thread
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = instrumentation.RequestMetrics()
+        token = instrumentation.activate(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.deactivate(token)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = instrumentation.RequestMetrics()
+        token = instrumentation.activate(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.deactivate(token)
+        return self.report(request, response, metrics)
+
+    def report(self, request, response, metrics):
+        metrics.finish()
+
+        response['Server-Timing'] = metrics.server_timing()
+        instrumentation.log_request(request, response, metrics)
+        if prometheus_metrics.is_enabled():
+            instrumentation.resolve_view(request, metrics)
+            prometheus_metrics.observe_request(request.method, response.status_code, metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = instrumentation.current()
+        if metrics is not None:
+            metrics.start_view(view_func)
+
+    def process_template_response(self, request, response):
+        # Called between the view returning and the response being rendered
+        metrics = instrumentation.current()
+        if metrics is not None:
+            metrics.start_render()
+            response.add_post_render_callback(lambda rendered: metrics.finish_render())
+        return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return type(self).process_view(self, request, view_func, view_args, view_kwargs)
+
+    async def aprocess_template_response(self, request, response):
+        return type(self).process_template_response(self, request, response)
+
+
+class ProfilingMiddleware:
+    """
+    Run a single request under a profiler when a staff user asks for it
+    with ?_profile=cprofile|sampling or an X-Profile header (see
+    api/profiling.py). The response links to the saved profile in an
+    X-Profile header.
+
+    Requests that don't ask cost one substring check; the session is only
+    looked at when they do. Must come after AuthenticationMiddleware. With
+    API_PROFILING=False it removes itself at start-up.
+    """
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'API_PROFILING', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = profiling.requested_mode(request)
+        if mode is None or not profiling.may_profile(request.user):
+            return self.get_response(request)
+
+        metrics = instrumentation.current()
+        queries_before = metrics.db_queries if metrics else 0
+        started = time.perf_counter()
+        name = f'{request.method} {request.path}'
+        response, data = profiling.profile_call(mode, name, self.get_response, request)
+        profile_name = profiling.save_profile(
+            mode, data, self.describe(request, response, started, metrics, queries_before))
+        response['X-Profile'] = reverse('admin-request-profile-download', kwargs={'name': profile_name})
+        return response
+
+    async def __acall__(self, request):
+        mode = profiling.requested_mode(request)
+        if mode is None or not profiling.may_profile(await request.auser()):
+            return await self.get_response(request)
+
+        metrics = instrumentation.current()
+        queries_before = metrics.db_queries if metrics else 0
+        started = time.perf_counter()
+        name = f'{request.method} {request.path}'
+        response, data = await profiling.profile_async_call(mode, name, self.get_response, request)
+        profile_name = await sync_to_async(profiling.save_profile)(
+            mode, data, self.describe(request, response, started, metrics, queries_before))
+        response['X-Profile'] = reverse('admin-request-profile-download', kwargs={'name': profile_name})
+        return response
+
+    @staticmethod
+    def describe(request, response, started, metrics, queries_before):
+        return {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'duration': time.perf_counter() - started,
+            'queries': metrics.db_queries - queries_before if metrics else None,
+            'user': request.user.get_username(),
+        }
+
+
+class ResponseCacheMiddleware:
+    """
+    Serve anonymous GET /api/ responses from the cache, precompressed.
+
+    Fresh entries are served as they are. Entries past the soft TTL are
+    still served while one background thread per path rebuilds them, and a
+    cold path is built by one process while concurrent requests briefly wait
+    for its result instead of all rebuilding it.
+
+    Must be the last middleware: background refreshes re-run only what comes
+    after it (the view) on a cloned request.
+
+    Under ASGI, requests that can't be cached go straight to the view.
+    Cacheable ones are handled in a thread, since the cache and session
+    lookups block; the view then runs back on the event loop.
+    """
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.get_response = async_to_sync(get_response)
+            self.get_async_response = get_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+    async def __acall__(self, request):
+        if not response_cache.is_cacheable_path(request):
+            return await self.get_async_response(request)
+        return await sync_to_async(self.handle)(request)
+
+    def handle(self, request):
+        if not response_cache.is_cacheable_request(request):
+            return self.get_response(request)
+
+        path = response_cache.cache_path(request)
+        encoding = response_cache.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        version = response_cache.get_version(request.path)
+        key = response_cache.entry_key(path, encoding, version)
+
+        entry = cache.get(key)
+        instrumentation.record_cache('response', entry is not None)
+        if entry is not None:
+            if response_cache.is_fresh(entry):
+                return response_cache.build_response(entry, 'HIT')
+            if response_cache.acquire_lock(path):
+                self.refresh_in_background(request, path)
+            return response_cache.build_response(entry, 'STALE')
+
+        locked = response_cache.acquire_lock(path)
+        if not locked:
+            entry = response_cache.wait_for_entry(key, path)
+            if entry is not None:
+                return response_cache.build_response(entry, 'HIT')
+
+        try:
+            response = self.get_response(request)
+            if not response_cache.is_cacheable_response(response):
+                return response
+            entries = response_cache.store_response(path, version, response)
+        finally:
+            if locked:
+                response_cache.release_lock(path)
+        return response_cache.build_response(entries[encoding], 'MISS')
+
+    def refresh_in_background(self, request, path):
+        refresh_request = response_cache.clone_request(request)
+
+        def refresh():
+            try:
+                version = response_cache.get_version(request.path)
+                response = self.get_response(refresh_request)
+                if response_cache.is_cacheable_response(response):
+                    response_cache.store_response(path, version, response)
+            except Exception:
+                logger.exception('Background refresh of %s failed', path)
+            finally:
+                response_cache.release_lock(path)
+                connections.close_all()
+
+        threading.Thread(target=refresh, daemon=True).start()
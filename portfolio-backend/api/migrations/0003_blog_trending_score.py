@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_newslettersubscriber'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='trending_score',
+            field=models.FloatField(default=0, help_text='Time-decayed engagement score (see update_trending_scores)'),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='trending_score_updated_at',
+            field=models.DateTimeField(blank=True, help_text='When trending_score was last recomputed', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['is_published', '-trending_score'], name='api_blog_is_publ_947992_idx'),
+        ),
+    ]
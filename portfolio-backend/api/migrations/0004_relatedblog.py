@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_blog_trending_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedBlog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(default=0, help_text='Cosine similarity between the two posts')),
+                ('rank', models.PositiveSmallIntegerField(default=0)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='api.blog')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.blog')),
+            ],
+            options={
+                'verbose_name': 'Related Blog',
+                'verbose_name_plural': 'Related Blogs',
+                'ordering': ['blog', 'rank'],
+                'indexes': [models.Index(fields=['blog', 'rank'], name='api_related_blog_id_c3da46_idx')],
+                'unique_together': {('blog', 'related')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# FTS5 full-text index used by api.search (SQLite only)
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS api_search_index USING fts5("
+        "kind UNINDEXED, object_id UNINDEXED, slug UNINDEXED, is_public UNINDEXED, "
+        "title, body, tags, tokenize = 'porter unicode61')"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS api_search_index")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_relatedblog'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
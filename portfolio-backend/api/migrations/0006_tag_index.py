@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def populate_tag_index(apps, schema_editor):
+    """Copy the existing JSON tag lists into the tag tables."""
+    Tag = apps.get_model('api', 'Tag')
+    sources = [
+        (apps.get_model('api', 'Blog'), apps.get_model('api', 'BlogTag'), 'blog'),
+        (apps.get_model('api', 'Project'), apps.get_model('api', 'ProjectTag'), 'project'),
+        (apps.get_model('api', 'ResearchPublication'), apps.get_model('api', 'ResearchPublicationTag'), 'publication'),
+    ]
+
+    tags = {}
+    for model, through, fk_name in sources:
+        links = set()
+        for obj_id, names in model.objects.values_list('id', 'tags'):
+            for name in names or []:
+                if not isinstance(name, str) or not name.strip():
+                    continue
+                slug = slugify(name, allow_unicode=True) or name.strip().lower()
+                if slug not in tags:
+                    tags[slug] = Tag.objects.create(slug=slug, name=name.strip())
+                links.add((obj_id, tags[slug].id))
+        through.objects.bulk_create(
+            [through(**{f'{fk_name}_id': obj_id, 'tag_id': tag_id}) for obj_id, tag_id in links]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('slug', models.CharField(db_index=True, max_length=255, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResearchPublicationTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publication', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='api.researchpublication')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='research_links', to='api.tag')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tag', 'publication'], name='api_researc_tag_id_30d283_idx')],
+                'unique_together': {('publication', 'tag')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='api.project')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_links', to='api.tag')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tag', 'project'], name='api_project_tag_id_93a0f0_idx')],
+                'unique_together': {('project', 'tag')},
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='api.blog')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blog_links', to='api.tag')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tag', 'blog'], name='api_blogtag_tag_id_27b319_idx')],
+                'unique_together': {('blog', 'tag')},
+            },
+        ),
+        migrations.RunPython(populate_tag_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_requestprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemoryReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+            options={
+                'verbose_name': 'Memory Usage',
+                'verbose_name_plural': 'Memory Usage',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Fill the FTS5 index created by 0005_search_index with the existing rows
+
+from django.db import migrations
+
+
+# kind -> (model, title, body fields, tag fields, public flag) as of this migration
+SOURCES = {
+    'blog': ('Blog', 'title', ['subtitle', 'excerpt', 'content_markdown'], ['tags', 'category', 'author'], 'is_published'),
+    'project': ('Project', 'title', ['short_description', 'organization', 'role', 'responsibilities', 'achievements'],
+                ['tags', 'skills', 'type'], 'is_visible'),
+    'research': ('ResearchPublication', 'title', ['description', 'results_summary', 'objectives', 'highlights', 'institution'],
+                 ['tags', 'authors', 'publication_type'], 'is_visible'),
+}
+
+
+def _flatten(value):
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        return ' '.join(_flatten(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_flatten(item) for item in value)
+    return str(value)
+
+
+def _join(obj, fields, separator):
+    parts = (_flatten(getattr(obj, field)) for field in fields)
+    return separator.join(part for part in parts if part)
+
+
+def populate_search_index(apps, schema_editor):
+    """Index every blog, project and publication that existed before the index did."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    rows = []
+    for kind, (model_name, title, body, tags, public) in SOURCES.items():
+        for obj in apps.get_model('api', model_name).objects.all().iterator():
+            rows.append((
+                kind,
+                str(obj.pk),
+                obj.slug,
+                '1' if getattr(obj, public) else '0',
+                getattr(obj, title),
+                _join(obj, body, '\n'),
+                _join(obj, tags, ' '),
+            ))
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DELETE FROM api_search_index")
+        cursor.executemany(
+            "INSERT INTO api_search_index (kind, object_id, slug, is_public, title, body, tags) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
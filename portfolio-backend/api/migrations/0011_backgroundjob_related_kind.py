@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_populate_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backgroundjob',
+            name='kind',
+            field=models.CharField(choices=[('export', 'Export'), ('import', 'Import'), ('related', 'Related posts update')], max_length=20),
+        ),
+    ]
@@ -236,6 +236,8 @@ class Blog(models.Model):
     is_published = models.BooleanField(default=False, help_text="Publish this blog")
     is_featured = models.BooleanField(default=False, help_text="Feature on homepage")
     is_trending = models.BooleanField(default=False, help_text="Mark as trending")
+    trending_score = models.FloatField(default=0, help_text="Time-decayed engagement score (see update_trending_scores)")
+    trending_score_updated_at = models.DateTimeField(null=True, blank=True, help_text="When trending_score was last recomputed")
     is_editor_choice = models.BooleanField(default=False)
     allow_comments = models.BooleanField(default=True)
 
@@ -249,6 +251,15 @@ class Blog(models.Model):
         ordering = ['-published_date', 'display_order']
         verbose_name = "Blog Post"
         verbose_name_plural = "Blog Posts"
+        indexes = [
+            models.Index(fields=['is_published', '-trending_score']),
+            # Matches TrendingBlogsView's ORDER BY, so the LIMIT stops after the first published rows
+            models.Index(
+                fields=['-is_trending', '-trending_score'],
+                condition=models.Q(is_published=True),
+                name='api_blog_trending_order_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -275,6 +286,29 @@ class BlogComment(models.Model):
         return f"Comment by {self.author_name} on {self.blog.title}"
 
 
+class RelatedBlog(models.Model):
+    """
+    Precomputed related-post neighbours for a blog (top-k by text similarity).
+    Rebuilt by the rebuild_related_blogs command and refreshed on blog save.
+    """
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(default=0, help_text="Cosine similarity between the two posts")
+    rank = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ['blog', 'rank']
+        verbose_name = "Related Blog"
+        verbose_name_plural = "Related Blogs"
+        unique_together = ['blog', 'related']
+        indexes = [
+            models.Index(fields=['blog', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.blog_id} -> {self.related_id} ({self.score:.3f})"
+
+
 class BlogsData(models.Model):
     # Keep metadata and lists as JSON for flexibility
     metadata = models.JSONField()
@@ -387,6 +421,64 @@ class BlogLike(models.Model):
         return f"{status} {self.blog.title} - {self.fingerprint[:20]}"
 
 
+class Tag(models.Model):
+    """
+    Normalised tag, indexed for lookups.
+    Mirrors the `tags` JSON lists on Blog, Project and ResearchPublication,
+    which stay the source of truth (see api/tags.py).
+    """
+    name = models.CharField(max_length=255)
+    slug = models.CharField(max_length=255, unique=True, db_index=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class BlogTag(models.Model):
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='tag_links')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='blog_links')
+
+    class Meta:
+        unique_together = ['blog', 'tag']
+        indexes = [
+            models.Index(fields=['tag', 'blog']),
+        ]
+
+    def __str__(self):
+        return f"{self.blog_id} #{self.tag_id}"
+
+
+class ProjectTag(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='tag_links')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='project_links')
+
+    class Meta:
+        unique_together = ['project', 'tag']
+        indexes = [
+            models.Index(fields=['tag', 'project']),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} #{self.tag_id}"
+
+
+class ResearchPublicationTag(models.Model):
+    publication = models.ForeignKey(ResearchPublication, on_delete=models.CASCADE, related_name='tag_links')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='research_links')
+
+    class Meta:
+        unique_together = ['publication', 'tag']
+        indexes = [
+            models.Index(fields=['tag', 'publication']),
+        ]
+
+    def __str__(self):
+        return f"{self.publication_id} #{self.tag_id}"
+
+
 def secure_file_upload_path(instance, filename):
     """
     Generate a secure file path using UUID.
@@ -409,6 +501,82 @@ class BackupRestore(models.Model):
         app_label = 'api'
 
 
+class RequestProfile(models.Model):
+    """
+    Dummy model for the Request Profiles admin page.
+    Profiles are files in API_PROFILE_DIR (see api/profiling.py), not rows.
+    """
+    class Meta:
+        managed = False  # Don't create a database table
+        verbose_name = "Request Profile"
+        verbose_name_plural = "Request Profiles"
+        app_label = 'api'
+
+
+class MemoryReport(models.Model):
+    """
+    Dummy model for the Memory Usage admin page.
+    Snapshots are files in API_MEMORY_DIR (see api/memory.py), not rows.
+    """
+    class Meta:
+        managed = False  # Don't create a database table
+        verbose_name = "Memory Usage"
+        verbose_name_plural = "Memory Usage"
+        app_label = 'api'
+
+
+class BackgroundJob(models.Model):
+    """
+    Slow admin work (backup export/import, related-post updates) queued by
+    the admin and run by `python manage.py run_jobs` outside the request
+    (see api/jobs.py).
+    Not exported with the portfolio data.
+    """
+    KIND_CHOICES = [
+        ('export', 'Export'),
+        ('import', 'Import'),
+        ('related', 'Related posts update'),
+    ]
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    params = models.JSONField(default=dict, blank=True, help_text="Arguments for the job's handler")
+
+    # Progress, updated by the worker while the job runs
+    progress = models.FloatField(default=0, help_text="Fraction done, 0 to 1")
+    progress_message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    requested_by = models.CharField(max_length=150, blank=True, help_text="Username of the admin who queued it")
+    worker = models.CharField(max_length=100, blank=True, help_text="host:pid of the worker running it")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True, help_text="Last progress report of a running job")
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Background Job"
+        verbose_name_plural = "Background Jobs"
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in ('succeeded', 'failed')
+
+
 class MediaFile(models.Model):
     """
     Model for storing media files (images, audio, video, documents, etc.)
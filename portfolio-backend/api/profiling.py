@@ -0,0 +1,240 @@
+"""
+On-demand profiling of single requests (ProfilingMiddleware).
+
+A staff user adds ?_profile=cprofile (or =sampling) to a URL, or sends the
+same value in an X-Profile header, and that one request runs under a
+profiler:
+
+- cprofile: deterministic cProfile, saved as a .prof file for pstats,
+  snakeviz and the like;
+- sampling: the request thread's stack is sampled from a helper thread,
+  saved as speedscope JSON (https://www.speedscope.app). Lower overhead,
+  so timings stay closer to an unprofiled request.
+
+Profiles are written to API_PROFILE_DIR, each with a small .meta.json
+describing the request, and listed on the Request Profiles admin page.
+Only the newest API_PROFILE_KEEP are kept.
+"""
+
+import cProfile
+import json
+import marshal
+import re
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+QUERY_PARAM = '_profile'
+HEADER = 'HTTP_X_PROFILE'
+MODES = {
+    '1': 'cprofile',
+    'true': 'cprofile',
+    'cprofile': 'cprofile',
+    'sampling': 'sampling',
+    'speedscope': 'sampling',
+}
+EXTENSIONS = {'cprofile': '.prof', 'sampling': '.speedscope.json'}
+SAMPLE_INTERVAL = 0.001
+_NAME = re.compile(r'^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$')
+
+
+def requested_mode(request):
+    """The profiler asked for by `request`, or None. Cheap for requests that don't ask."""
+    value = request.META.get(HEADER)
+    if value is None:
+        if QUERY_PARAM not in request.META.get('QUERY_STRING', ''):
+            return None
+        value = request.GET.get(QUERY_PARAM)
+    return MODES.get((value or '').lower())
+
+
+def may_profile(user):
+    return user is not None and user.is_active and user.is_staff
+
+
+class SamplingProfiler:
+    """
+    Sample one thread's Python stack every `interval` seconds from a daemon
+    thread. The sampler needs the GIL to take a sample, so the interpreter's
+    switch interval (5 ms by default) is lowered to `interval` while it runs.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.frames = {}
+        self.samples = []
+        self.weights = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval)
+        self.started = self._last = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self):
+        current_frames = sys._current_frames
+        while not self._stop.wait(self.interval):
+            frame = current_frames().get(self._target)
+            now = time.perf_counter()
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_name, code.co_filename, code.co_firstlineno)
+                index = self.frames.get(key)
+                if index is None:
+                    index = self.frames[key] = len(self.frames)
+                stack.append(index)
+                frame = frame.f_back
+            stack.reverse()
+            self.samples.append(stack)
+            self.weights.append(now - self._last)
+            self._last = now
+
+    def speedscope(self, name):
+        """The samples as a speedscope file (sampled profile, seconds)."""
+        frames = [{'name': function, 'file': filename, 'line': line} for function, filename, line in self.frames]
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'portfolio-backend',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': self.duration,
+                'samples': self.samples,
+                'weights': self.weights,
+            }],
+        }
+
+
+def profile_call(mode, name, func, *args):
+    """
+    Call func(*args) under the `mode` profiler.
+
+    Returns:
+        tuple: (func's result, profile file contents as bytes)
+    """
+    if mode == 'sampling':
+        profiler = SamplingProfiler()
+        profiler.start()
+        try:
+            result = func(*args)
+        finally:
+            profiler.stop()
+        return result, json.dumps(profiler.speedscope(name)).encode()
+
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args)
+    # What Profile.dump_stats() writes, without needing a path
+    profiler.create_stats()
+    return result, marshal.dumps(profiler.stats)
+
+
+async def profile_async_call(mode, name, func, *args):
+    """
+    profile_call() for a coroutine function, under ASGI. Both profilers
+    watch the event loop thread. Queries the async ORM runs in a worker
+    thread show up as waiting. Other requests the worker is serving at the
+    same time show up too.
+    """
+    if mode == 'sampling':
+        profiler = SamplingProfiler()
+        profiler.start()
+        try:
+            result = await func(*args)
+        finally:
+            profiler.stop()
+        return result, json.dumps(profiler.speedscope(name)).encode()
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = await func(*args)
+    finally:
+        profiler.disable()
+    profiler.create_stats()
+    return result, marshal.dumps(profiler.stats)
+
+
+def profile_dir():
+    return Path(getattr(settings, 'API_PROFILE_DIR', Path(settings.BASE_DIR) / 'profiles'))
+
+
+def profile_path(name):
+    """Path of the profile file called `name`, or None if there is none."""
+    if not _NAME.match(name):
+        return None
+    for extension in EXTENSIONS.values():
+        path = profile_dir() / f'{name}{extension}'
+        if path.exists():
+            return path
+    return None
+
+
+def save_profile(mode, data, meta):
+    """
+    Store a profile and its metadata, then prune old profiles.
+
+    Returns:
+        str: The profile's name (used in its download URL)
+    """
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    now = timezone.now()
+    # Microseconds (as hex) before the random part, so names sort by creation time
+    name = f'{now:%Y%m%d-%H%M%S}-{now.microsecond:05x}{uuid.uuid4().hex[:3]}'
+    extension = EXTENSIONS[mode]
+
+    (directory / f'{name}{extension}').write_bytes(data)
+    meta = dict(meta, name=name, mode=mode, created_at=now.isoformat(), size=len(data),
+                filename=f'{name}{extension}')
+    (directory / f'{name}.meta.json').write_text(json.dumps(meta), encoding='utf-8')
+
+    prune_profiles(getattr(settings, 'API_PROFILE_KEEP', 50))
+    return name
+
+
+def list_profiles():
+    """Metadata of every stored profile, newest first."""
+    profiles = []
+    for path in profile_dir().glob('*.meta.json'):
+        try:
+            profiles.append(json.loads(path.read_text(encoding='utf-8')))
+        except (OSError, ValueError):
+            continue
+    return sorted(profiles, key=lambda meta: meta['name'], reverse=True)
+
+
+def delete_profile(name):
+    if not _NAME.match(name):
+        return False
+    deleted = False
+    for path in profile_dir().glob(f'{name}.*'):
+        path.unlink(missing_ok=True)
+        deleted = True
+    return deleted
+
+
+def prune_profiles(keep):
+    for meta in list_profiles()[keep:]:
+        delete_profile(meta['name'])
@@ -0,0 +1,317 @@
+"""
+Related-posts index for blog posts.
+
+Posts are turned into TF-IDF vectors over their title, excerpt, tags and
+markdown content, and the top-k cosine neighbours of every published post are
+stored in the RelatedBlog table. Vectors are sparse {term: weight} dicts and
+similarities are accumulated through an inverted index, so only posts that
+share at least one term are ever compared.
+
+Saves don't update the index in the request: the save signals queue a
+'related' background job (api/jobs.py) that updates the neighbours of the
+saved post. The worker keeps the corpus (term counts, document frequencies,
+vectors and postings) in memory between jobs and re-reads only the posts
+whose updated_at changed, so an update costs one (id, updated_at) query plus
+the changed posts rather than re-vectorising every post.
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+
+from .models import Blog, RelatedBlog
+from .response_cache import bump_version
+
+
+# Fields that feed the vectors, with how many times each term is counted
+FIELD_WEIGHTS = {
+    'title': 3,
+    'tags': 3,
+    'category': 2,
+    'excerpt': 2,
+    'content_markdown': 1,
+}
+
+# Saving any of these fields can change a post's neighbours
+INDEXED_FIELDS = set(FIELD_WEIGHTS) | {'is_published', 'slug'}
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+STOP_WORDS = frozenset("""
+a about above after again all also an and any are as at be because been before
+being below between both but by can could did do does doing down during each
+few for from further had has have having he her here hers him his how i if in
+into is it its itself just let me more most my no nor not now of off on once
+only or other our out over own same she should so some such than that the
+their them then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you
+your yours use using used one two get like make way
+""".split())
+
+
+def get_neighbour_count():
+    return getattr(settings, 'RELATED_BLOGS_COUNT', 5)
+
+
+def tokenize(text):
+    """Lowercase and split text into indexable terms."""
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def term_counts(blog):
+    """Return weighted term frequencies for a blog."""
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        value = getattr(blog, field) or ''
+        if isinstance(value, list):
+            value = ' '.join(str(item) for item in value)
+        for token in tokenize(value):
+            counts[token] += weight
+    return counts
+
+
+def inverse_document_frequency(document_frequency, total):
+    return {term: math.log((1 + total) / (1 + df)) + 1 for term, df in document_frequency.items()}
+
+
+def weigh(terms, idf):
+    """The L2-normalised TF-IDF vector of `terms` ({term: weighted count})."""
+    vector = {term: (1 + math.log(tf)) * idf[term] for term, tf in terms.items()}
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if norm:
+        vector = {term: weight / norm for term, weight in vector.items()}
+    return vector
+
+
+def similarities_for(blog_id, vectors, postings):
+    """Return {other_id: cosine similarity} for every post sharing a term."""
+    scores = defaultdict(float)
+    for term, weight in vectors.get(blog_id, {}).items():
+        for other_id, other_weight in postings.get(term, {}).items():
+            if other_id != blog_id:
+                scores[other_id] += weight * other_weight
+    return scores
+
+
+def top_neighbours(scores, k):
+    """Return the k best (other_id, score) pairs, best first."""
+    return heapq.nlargest(k, ((other_id, score) for other_id, score in scores.items() if score > 0),
+                          key=lambda item: (item[1], -item[0]))
+
+
+def _neighbour_rows(blog_id, neighbours):
+    return [
+        RelatedBlog(blog_id=blog_id, related_id=other_id, score=score, rank=rank)
+        for rank, (other_id, score) in enumerate(neighbours)
+    ]
+
+
+class Corpus:
+    """
+    The published posts' vectors, kept up to date incrementally.
+
+    sync() compares each published post's updated_at with the one its terms
+    were read at, re-reads only the posts that changed and adjusts the
+    document frequencies. A changed post's vector is weighed with the
+    current IDF; the other vectors keep the IDF they were built with until
+    the next reset(), which rebuild_related_blogs() does.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.counts = {}
+        self.stamps = {}
+        self.document_frequency = Counter()
+        self.vectors = {}
+        self.postings = defaultdict(dict)
+
+    def _remove(self, blog_id):
+        for term in self.counts.pop(blog_id, {}):
+            self.document_frequency[term] -= 1
+            if not self.document_frequency[term]:
+                del self.document_frequency[term]
+        for term in self.vectors.pop(blog_id, {}):
+            self.postings[term].pop(blog_id, None)
+            if not self.postings[term]:
+                del self.postings[term]
+        self.stamps.pop(blog_id, None)
+
+    def sync(self):
+        """Catch up with the published posts in the database."""
+        stamps = dict(Blog.objects.filter(is_published=True).values_list('id', 'updated_at'))
+        dropped = set(self.stamps) - set(stamps)
+        changed = [blog_id for blog_id, stamp in stamps.items() if self.stamps.get(blog_id) != stamp]
+        for blog_id in dropped:
+            self._remove(blog_id)
+        if not changed:
+            return
+
+        blogs = Blog.objects.filter(id__in=changed).only('id', 'updated_at', *FIELD_WEIGHTS)
+        for blog in blogs.iterator(chunk_size=500):
+            self._remove(blog.id)
+            self.counts[blog.id] = term_counts(blog)
+            self.stamps[blog.id] = blog.updated_at
+            self.document_frequency.update(self.counts[blog.id].keys())
+
+        idf = inverse_document_frequency(self.document_frequency, len(self.counts))
+        for blog_id in changed:
+            if blog_id in self.counts:
+                self.vectors[blog_id] = weigh(self.counts[blog_id], idf)
+                for term, weight in self.vectors[blog_id].items():
+                    self.postings[term][blog_id] = weight
+
+
+corpus = Corpus()
+
+
+def detail_paths(blog_ids):
+    """The blog detail URL paths of `blog_ids` that still exist."""
+    slugs = Blog.objects.filter(id__in=blog_ids).values_list('slug', flat=True)
+    return [reverse('blog-detail', kwargs={'slug': slug}) for slug in slugs]
+
+
+def rebuild_related_blogs():
+    """
+    Rebuild the whole related-posts table.
+
+    Returns:
+        int: Number of neighbour rows written
+    """
+    k = get_neighbour_count()
+    rows = []
+    with corpus.lock:
+        corpus.reset()
+        corpus.sync()
+        for blog_id in corpus.vectors:
+            neighbours = top_neighbours(similarities_for(blog_id, corpus.vectors, corpus.postings), k)
+            rows.extend(_neighbour_rows(blog_id, neighbours))
+
+    with transaction.atomic():
+        RelatedBlog.objects.all().delete()
+        RelatedBlog.objects.bulk_create(rows, batch_size=500)
+    bump_version()  # the `related` lists on blog detail responses changed
+    return len(rows)
+
+
+def update_related_for_blog(blog_id, recompute_ids=()):
+    """
+    Refresh the neighbours affected by a change to a single blog.
+
+    The changed post gets a freshly computed neighbour list. Every other post
+    only has the changed post inserted into, moved within or dropped from its
+    existing list; a post whose list loses an entry is recomputed so the
+    freed slot is filled. Vectors come from the in-memory corpus, which
+    re-reads only the posts that changed (see Corpus), so a periodic full
+    rebuild keeps IDF drift in check. Only the detail responses of the
+    posts whose list was rewritten are invalidated.
+
+    Args:
+        blog_id: ID of the blog that was saved or deleted
+        recompute_ids: Blogs whose lists must be recomputed regardless, e.g.
+            the posts that listed a blog which has since been deleted
+
+    Returns:
+        int: Number of blogs whose neighbour list was rewritten
+    """
+    k = get_neighbour_count()
+    force_ids = set(recompute_ids)
+    with corpus.lock:
+        corpus.sync()
+        rewritten, stale_ids = _changed_neighbours(blog_id, force_ids, k, corpus.vectors, corpus.postings)
+
+    with transaction.atomic():
+        RelatedBlog.objects.filter(blog_id__in=list(rewritten) + list(stale_ids)).delete()
+        rows = []
+        for other_id, neighbours in rewritten.items():
+            rows.extend(_neighbour_rows(other_id, neighbours))
+        RelatedBlog.objects.bulk_create(rows, batch_size=500)
+    # The `related` lists on these blogs' detail responses changed
+    for path in detail_paths(set(rewritten) | stale_ids):
+        bump_version(path)
+    return len(rewritten)
+
+
+def _changed_neighbours(blog_id, force_ids, k, vectors, postings):
+    """The new neighbour lists after a change to `blog_id`, and the posts that should have none."""
+    current = defaultdict(list)
+    for row in RelatedBlog.objects.exclude(blog_id=blog_id).values_list('blog_id', 'related_id', 'score'):
+        current[row[0]].append((row[1], row[2]))
+
+    changed_scores = similarities_for(blog_id, vectors, postings) if blog_id in vectors else {}
+
+    rewritten = {}
+    if blog_id in vectors:
+        rewritten[blog_id] = top_neighbours(changed_scores, k)
+
+    for other_id in vectors:
+        if other_id == blog_id:
+            continue
+        neighbours = current.get(other_id, [])
+        listed = any(related_id == blog_id for related_id, _ in neighbours)
+        score = changed_scores.get(other_id, 0.0)
+
+        if other_id in force_ids:
+            rewritten[other_id] = top_neighbours(similarities_for(other_id, vectors, postings), k)
+        elif listed:
+            remaining = [item for item in neighbours if item[0] != blog_id]
+            if score > 0 and (len(neighbours) < k or (remaining and score >= min(s for _, s in remaining))):
+                rewritten[other_id] = sorted(remaining + [(blog_id, score)], key=lambda item: -item[1])[:k]
+            else:
+                # The changed post fell out; recompute so the next best fills the slot
+                rewritten[other_id] = top_neighbours(similarities_for(other_id, vectors, postings), k)
+        elif score > 0 and (len(neighbours) < k or score > min(s for _, s in neighbours)):
+            rewritten[other_id] = sorted(neighbours + [(blog_id, score)], key=lambda item: -item[1])[:k]
+
+    # Posts that are no longer published keep no neighbours and appear in none
+    stale_ids = set(current) - set(vectors)
+    if blog_id not in vectors:
+        stale_ids.add(blog_id)
+
+    return rewritten, stale_ids
+
+
+_paused = threading.local()
+
+
+@contextmanager
+def related_updates_paused():
+    """
+    Don't queue related-post jobs for the blogs saved or deleted in this
+    thread during the block, e.g. while a restore or a bulk delete that
+    rebuilds or schedules the whole index itself runs.
+    """
+    previous = getattr(_paused, 'active', False)
+    _paused.active = True
+    try:
+        yield
+    finally:
+        _paused.active = previous
+
+
+def related_updates_are_paused():
+    return getattr(_paused, 'active', False)
+
+
+def schedule_related_update(blog_id=None, recompute_ids=()):
+    """
+    Queue update_related_for_blog() for a saved or deleted blog, or without
+    `blog_id` a full rebuild, as a background job. A job with the same
+    arguments that is still waiting is reused.
+    """
+    from .jobs import enqueue_unless_queued
+
+    params = {} if blog_id is None else {'blog_id': blog_id, 'recompute_ids': sorted(recompute_ids)}
+    return enqueue_unless_queued('related', params)
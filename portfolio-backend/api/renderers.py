@@ -0,0 +1,98 @@
+"""
+Fast JSON renderer and parser for the API.
+
+Uses orjson when it is installed and falls back to DRF's stdlib-based
+implementations otherwise (or whenever orjson cannot handle a payload).
+Types orjson does not serialise natively the same way DRF does (datetimes,
+Decimals, lazy strings, querysets, ...) are passed to DRF's JSONEncoder, so
+both backends produce the same JSON.
+
+EventStreamRenderer wraps the same JSON in a Server-Sent Events message,
+for the live counter endpoints (see api/live.py).
+"""
+
+from django.conf import settings
+from rest_framework import renderers, parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+_drf_encoder = encoders.JSONEncoder()
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    Drop-in replacement for rest_framework.renderers.JSONRenderer.
+    Indented output (e.g. 'application/json; indent=4') still goes through
+    the stdlib encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_drf_encoder.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            # e.g. integers wider than 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Match JSONRenderer: keep output a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    Drop-in replacement for rest_framework.parsers.JSONParser.
+    Non UTF-8 request bodies are handed to the stdlib parser.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+def event_stream_message(data, event=None, retry=None):
+    """One Server-Sent Events message carrying `data` as JSON."""
+    lines = []
+    if retry is not None:
+        lines.append(b'retry: %d' % retry)
+    if event:
+        lines.append(b'event: ' + event.encode())
+    lines.append(b'data: ' + FastJSONRenderer().render(data))
+    return b'\n'.join(lines) + b'\n\n'
+
+
+class EventStreamRenderer(renderers.BaseRenderer):
+    """
+    Renders the response data as a single Server-Sent Events message. The
+    view may set `event_name` and `retry` (milliseconds before the client
+    reconnects).
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        view = (renderer_context or {}).get('view')
+        return event_stream_message(data, getattr(view, 'event_name', None), getattr(view, 'retry', None))
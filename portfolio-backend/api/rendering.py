@@ -0,0 +1,38 @@
+"""
+Cached markdown rendering.
+
+Rendered HTML is stored in the shared cache under a hash of the markdown
+source, so entries never need invalidating: edited content simply hashes to
+a new key. warm_caches fills these entries ahead of the first request.
+"""
+
+import hashlib
+
+import markdown
+from django.conf import settings
+from django.core.cache import cache
+
+from .instrumentation import record_cache, timed
+
+MARKDOWN_EXTENSIONS = [
+    'extra',  # Includes tables, fenced code blocks, etc.
+    'codehilite',  # Syntax highlighting for code blocks
+    'toc',  # Table of contents
+    'nl2br',  # Convert newlines to <br>
+]
+
+
+def markdown_cache_key(text):
+    return 'markdown:' + hashlib.sha256(text.encode()).hexdigest()
+
+
+def render_markdown(text):
+    """Convert markdown to HTML, reusing a cached rendering when there is one."""
+    key = markdown_cache_key(text)
+    html = cache.get(key)
+    record_cache('markdown', html is not None)
+    if html is None:
+        with timed('markdown'):
+            html = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS).convert(text)
+        cache.set(key, html, getattr(settings, 'MARKDOWN_CACHE_TIMEOUT', 7 * 24 * 3600))
+    return html
@@ -0,0 +1,272 @@
+"""
+Cache for anonymous GET /api/ responses, stored precompressed.
+
+A response is compressed once, when it enters the cache, into every
+supported encoding (gzip, plus br when the brotli package is installed) and
+each variant is stored under its own key, so a hit loads exactly the bytes it
+sends and never compresses anything. Keys include a content version that the
+signal handlers bump whenever content changes; invalidation is a single
+cache.incr() and stale entries simply expire. Changes that only show up
+under one URL path (trending scores) bump that path's version instead.
+
+Entries have a soft and a hard TTL. Until the soft TTL they are served as
+fresh; between soft and hard TTL they are still served, while one request
+per path (guarded by a cache.add() lock) refreshes them in the background.
+Responses carry a matching Cache-Control: max-age / stale-while-revalidate
+so nginx and browsers behave the same way.
+
+Keys are built from the path and only the query parameters listed in
+API_RESPONSE_CACHE_QUERY_PARAMS, normalised (see cache_path()), so query
+strings the views ignore can't push real entries out of the cache.
+"""
+
+import gzip
+import hashlib
+import io
+import re
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from .instrumentation import timed
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+VERSION_KEY = 'response-cache:version'
+
+# Headers copied from the original response into cached entries
+STORED_HEADERS = ('Content-Type', 'Allow', 'Vary')
+
+
+def path_version_key(path):
+    return f'{VERSION_KEY}:{_digest(path)}'
+
+
+def bump_version(path=None):
+    """
+    Invalidate every cached API response, or with `path` (a URL path such
+    as '/api/trending-blogs/') only the responses for that path, whatever
+    their query string.
+    """
+    key = VERSION_KEY if path is None else path_version_key(path)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_version(path=None):
+    """
+    The content version entry keys are built with. With `path`, it also
+    includes that path's own version, read in the same cache round trip.
+    """
+    if path is None:
+        return cache.get(VERSION_KEY, 0)
+    versions = cache.get_many([VERSION_KEY, path_version_key(path)])
+    version = versions.get(VERSION_KEY, 0)
+    path_version = versions.get(path_version_key(path))
+    return f'{version}.{path_version}' if path_version else version
+
+
+def supported_encodings():
+    """Content codings we can produce, best first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=getattr(settings, 'API_BROTLI_QUALITY', 9))
+    return gzip.compress(body, compresslevel=getattr(settings, 'API_GZIP_LEVEL', 9), mtime=0)
+
+
+def parse_accept_encoding(header):
+    """Return {coding: q} from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        match = re.search(r'q=([0-9.]+)', params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header):
+    """Pick the best coding the client accepts, or 'identity'."""
+    accepted = parse_accept_encoding(header or '')
+    for coding in supported_encodings():
+        if accepted.get(coding, accepted.get('*', 0.0)) > 0:
+            return coding
+    return 'identity'
+
+
+# Comma-separated parameters whose order and duplicates don't change the response
+LIST_QUERY_PARAMS = ('fields', 'exclude')
+
+
+def cache_path(request):
+    """
+    The path `request` is cached under: request.path plus the allow-listed
+    query parameters (API_RESPONSE_CACHE_QUERY_PARAMS) in sorted order, with
+    empty values dropped and field lists sorted. Other parameters are left
+    out of the key; the views ignore them.
+    """
+    params = []
+    for name in sorted(getattr(settings, 'API_RESPONSE_CACHE_QUERY_PARAMS', ())):
+        value = request.GET.get(name, '').strip()
+        if name in LIST_QUERY_PARAMS:
+            value = ','.join(sorted({item.strip() for item in value.split(',') if item.strip()}))
+        if value:
+            params.append((name, value))
+    return f'{request.path}?{urlencode(params)}' if params else request.path
+
+
+def _digest(path):
+    return hashlib.sha256(path.encode()).hexdigest()
+
+
+def entry_key(path, encoding, version):
+    return f'api-response:{version}:{_digest(path)}:{encoding}'
+
+
+def lock_key(path):
+    return f'api-response-lock:{_digest(path)}'
+
+
+def soft_ttl():
+    return getattr(settings, 'API_RESPONSE_CACHE_SOFT_TTL', 60)
+
+
+def hard_ttl():
+    return getattr(settings, 'API_RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def is_fresh(entry):
+    return time.time() - entry['stored_at'] < soft_ttl()
+
+
+def acquire_lock(path):
+    """
+    Return True if this process may rebuild `path`; only one holder at a time.
+
+    The lock is a cache.add(), which is atomic on Redis, Memcached and the
+    local-memory cache, but not on FileBasedCache (the default): its add()
+    checks for the file and then writes it, so two processes can both win
+    and rebuild the same entry. There the lock only narrows a stampede; use
+    an atomic backend (DJANGO_CACHE_BACKEND) where that matters.
+    """
+    return cache.add(lock_key(path), True, getattr(settings, 'API_RESPONSE_CACHE_LOCK_TIMEOUT', 30))
+
+
+def release_lock(path):
+    cache.delete(lock_key(path))
+
+
+def wait_for_entry(key, path):
+    """Poll for an entry another process is building; None after API_RESPONSE_CACHE_LOCK_WAIT."""
+    deadline = time.monotonic() + getattr(settings, 'API_RESPONSE_CACHE_LOCK_WAIT', 2.0)
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+        if cache.get(lock_key(path)) is None:
+            return None  # the rebuild finished without caching (e.g. an error response)
+    return None
+
+
+def clone_request(request):
+    """
+    Build an independent GET request for the same URL, for use on another
+    thread after the original request has finished.
+    """
+    environ = dict(request.META)
+    environ.update({'REQUEST_METHOD': 'GET', 'CONTENT_LENGTH': '0', 'wsgi.input': io.BytesIO()})
+    return WSGIRequest(environ)
+
+
+def is_cacheable_path(request):
+    """is_cacheable_request() without the user check, which may need the session."""
+    if not getattr(settings, 'API_RESPONSE_CACHE', True) or request.method != 'GET':
+        return False
+    if not request.path.startswith('/api/') or 'HTTP_AUTHORIZATION' in request.META:
+        return False
+    return not any(re.search(pattern, request.path) for pattern in getattr(settings, 'API_RESPONSE_CACHE_EXCLUDE', []))
+
+
+def is_cacheable_request(request):
+    if not is_cacheable_path(request):
+        return False
+    user = getattr(request, 'user', None)
+    return user is None or not user.is_authenticated
+
+
+def is_cacheable_response(response):
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    if response.has_header('Content-Encoding'):
+        return False
+    cache_control = response.get('Cache-Control', '').lower()
+    return not any(directive in cache_control for directive in ('private', 'no-store', 'no-cache'))
+
+
+def store_response(path, version, response):
+    """
+    Compress `response` into every supported encoding and cache the variants.
+
+    Returns:
+        dict: {encoding: entry} for all encodings, including 'identity'
+    """
+    body = response.content
+    headers = [(name, response[name]) for name in STORED_HEADERS if response.has_header(name)]
+    min_size = getattr(settings, 'API_COMPRESSION_MIN_SIZE', 200)
+    stored_at = time.time()
+
+    identity = {'headers': headers, 'encoding': None, 'body': body, 'stored_at': stored_at}
+    entries = {'identity': identity}
+    for encoding in supported_encodings():
+        with timed('compress'):
+            compressed = compress(body, encoding) if len(body) >= min_size else None
+        if compressed is not None and len(compressed) < len(body):
+            entries[encoding] = dict(identity, encoding=encoding, body=compressed)
+        else:
+            entries[encoding] = identity
+
+    cache.set_many({entry_key(path, encoding, version): entry for encoding, entry in entries.items()}, hard_ttl())
+    return entries
+
+
+def build_response(entry, status):
+    """Turn a cached entry into an HttpResponse; `status` goes into X-Cache."""
+    body = entry['body']
+    response = HttpResponse(body)
+    for name, value in entry['headers']:
+        response[name] = value
+    if entry['encoding']:
+        response['Content-Encoding'] = entry['encoding']
+    response['Content-Length'] = str(len(body))
+    response['Age'] = str(int(max(time.time() - entry['stored_at'], 0)))
+    response['X-Cache'] = status
+    patch_vary_headers(response, ('Accept-Encoding',))
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=soft_ttl(),
+        stale_while_revalidate=max(hard_ttl() - soft_ttl(), 0),
+    )
+    return response
@@ -0,0 +1,280 @@
+"""
+Full-text search over blogs, projects and research publications.
+
+On SQLite the text is kept in an FTS5 virtual table (api_search_index) that
+is created by migration 0005_search_index and kept in sync by the signal
+handlers in signals.py. Queries are ranked with bm25 and return highlighted titles and
+snippets. Other database backends fall back to a plain icontains filter so
+the endpoint keeps working, just without ranking or snippets.
+"""
+
+import html
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Blog, Project, ResearchPublication
+
+
+SEARCH_TABLE = 'api_search_index'
+
+# Highlight markers are control characters so the text can be HTML-escaped
+# after FTS5 has inserted them; they are swapped for <mark> tags afterwards.
+MARK_OPEN = '\x02'
+MARK_CLOSE = '\x03'
+
+# kind -> how to index and link one content type
+SEARCH_SOURCES = {
+    'blog': {
+        'model': Blog,
+        'title': 'title',
+        'body': ['subtitle', 'excerpt', 'content_markdown'],
+        'tags': ['tags', 'category', 'author'],
+        'public': 'is_published',
+    },
+    'project': {
+        'model': Project,
+        'title': 'title',
+        'body': ['short_description', 'organization', 'role', 'responsibilities', 'achievements'],
+        'tags': ['tags', 'skills', 'type'],
+        'public': 'is_visible',
+    },
+    'research': {
+        'model': ResearchPublication,
+        'title': 'title',
+        'body': ['description', 'results_summary', 'objectives', 'highlights', 'institution'],
+        'tags': ['tags', 'authors', 'publication_type'],
+        'public': 'is_visible',
+    },
+}
+
+# Column weights for bm25: kind, object_id, slug, is_public, title, body, tags
+BM25_WEIGHTS = '0, 0, 0, 0, 10.0, 1.0, 5.0'
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_available():
+    """Return True if the FTS5 index can be used on the current database."""
+    return connection.vendor == 'sqlite'
+
+
+def get_source_for_model(model):
+    """Return (kind, source) for a model class, or (None, None)."""
+    for kind, source in SEARCH_SOURCES.items():
+        if source['model'] is model:
+            return kind, source
+    return None, None
+
+
+def get_indexed_fields(source):
+    """Return the model fields whose changes must be reflected in the index."""
+    return {source['title'], source['public'], 'slug', *source['body'], *source['tags']}
+
+
+def _flatten(value):
+    """Turn field values (strings or JSON lists/dicts) into plain text."""
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        return ' '.join(_flatten(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_flatten(item) for item in value)
+    return str(value)
+
+
+def _join(obj, fields, separator):
+    parts = (_flatten(getattr(obj, field)) for field in fields)
+    return separator.join(part for part in parts if part)
+
+
+def _document(kind, source, obj):
+    return (
+        kind,
+        str(obj.pk),
+        obj.slug,
+        '1' if getattr(obj, source['public']) else '0',
+        obj.title,
+        _join(obj, source['body'], '\n'),
+        _join(obj, source['tags'], ' '),
+    )
+
+
+def index_object(obj):
+    """Insert or replace a single object in the search index."""
+    if not fts_available():
+        return
+    kind, source = get_source_for_model(type(obj))
+    if kind is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE kind = %s AND object_id = %s", [kind, str(obj.pk)])
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (kind, object_id, slug, is_public, title, body, tags) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            _document(kind, source, obj),
+        )
+
+
+def remove_object(model, pk):
+    """Remove a single object from the search index."""
+    if not fts_available():
+        return
+    kind, _ = get_source_for_model(model)
+    if kind is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE kind = %s AND object_id = %s", [kind, str(pk)])
+
+
+def rebuild_search_index():
+    """
+    Re-index every searchable object.
+
+    Returns:
+        int: Number of documents indexed
+    """
+    if not fts_available():
+        return 0
+
+    rows = []
+    for kind, source in SEARCH_SOURCES.items():
+        for obj in source['model'].objects.all().iterator():
+            rows.append(_document(kind, source, obj))
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (kind, object_id, slug, is_public, title, body, tags) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+    return len(rows)
+
+
+def build_match_expression(query):
+    """
+    Turn free user input into a safe FTS5 MATCH expression.
+
+    Every word is quoted (so FTS5 operators in the input are ignored) and
+    the last word is treated as a prefix to support search-as-you-type.
+    """
+    tokens = TOKEN_RE.findall(query)
+    if not tokens:
+        return ''
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _render_marks(text):
+    return html.escape(text).replace(MARK_OPEN, '<mark>').replace(MARK_CLOSE, '</mark>')
+
+
+def search(query, kinds=None, public_only=True, limit=20):
+    """
+    Run a ranked full-text search.
+
+    Returns:
+        list: Result dicts with type, id, slug, title, title_highlighted,
+        snippet and score (higher is better)
+    """
+    kinds = [kind for kind in (kinds or SEARCH_SOURCES) if kind in SEARCH_SOURCES]
+    if not query.strip() or not kinds:
+        return []
+
+    if not fts_available():
+        return _fallback_search(query, kinds, public_only, limit)
+
+    expression = build_match_expression(query)
+    if not expression:
+        return []
+
+    sql = (
+        f"SELECT kind, object_id, slug, title, "
+        f"highlight({SEARCH_TABLE}, 4, %s, %s), "
+        f"snippet({SEARCH_TABLE}, 5, %s, %s, '…', 24), "
+        f"bm25({SEARCH_TABLE}, {BM25_WEIGHTS}) AS rank "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+        f"AND kind IN ({', '.join(['%s'] * len(kinds))})"
+    )
+    params = [MARK_OPEN, MARK_CLOSE, MARK_OPEN, MARK_CLOSE, expression, *kinds]
+    if public_only:
+        sql += " AND is_public = '1'"
+    sql += " ORDER BY rank LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    return [
+        {
+            'type': kind,
+            'id': int(object_id),
+            'slug': slug,
+            'title': title,
+            'title_highlighted': _render_marks(title_highlighted),
+            'snippet': _render_marks(snippet.strip()),
+            'score': round(-rank, 6),
+        }
+        for kind, object_id, slug, title, title_highlighted, snippet, rank in rows
+    ]
+
+
+def filter_matching(queryset, query, public_only=False):
+    """
+    Restrict a queryset of one searchable model to the objects matching
+    `query`, however many there are.
+
+    The admin changelist uses this: it orders and paginates the result
+    itself, so the match set is passed to the database as a subquery
+    instead of a capped list of ranked ids.
+    """
+    kind, source = get_source_for_model(queryset.model)
+    if kind is None:
+        return queryset.none()
+    if not fts_available():
+        queryset = queryset.filter(_fallback_condition(source, query))
+        return queryset.filter(**{source['public']: True}) if public_only else queryset
+
+    expression = build_match_expression(query)
+    if not expression:
+        return queryset.none()
+    sql = (
+        f"SELECT CAST(object_id AS INTEGER) FROM {SEARCH_TABLE} "
+        f"WHERE {SEARCH_TABLE} MATCH %s AND kind = %s"
+    )
+    if public_only:
+        sql += " AND is_public = '1'"
+    return queryset.filter(pk__in=RawSQL(sql, [expression, kind]))
+
+
+def _fallback_condition(source, query):
+    condition = Q()
+    for field in [source['title'], *source['body'], *source['tags']]:
+        condition |= Q(**{f'{field}__icontains': query})
+    return condition
+
+
+def _fallback_search(query, kinds, public_only, limit):
+    """Unranked icontains search for databases without FTS5."""
+    results = []
+    for kind in kinds:
+        source = SEARCH_SOURCES[kind]
+        queryset = source['model'].objects.filter(_fallback_condition(source, query))
+        if public_only:
+            queryset = queryset.filter(**{source['public']: True})
+        for obj in queryset[:limit]:
+            results.append({
+                'type': kind,
+                'id': obj.pk,
+                'slug': obj.slug,
+                'title': obj.title,
+                'title_highlighted': html.escape(obj.title),
+                'snippet': html.escape(_flatten(getattr(obj, source['body'][0]))[:200]),
+                'score': 0.0,
+            })
+    return results[:limit]
@@ -1,5 +1,4 @@
 from rest_framework import serializers
-import markdown
 from .models import (
     EducationEntry,
     ExperienceEntry,
@@ -9,125 +8,197 @@ from .models import (
     HomeData,
     Blog,
     BlogComment,
+    RelatedBlog,
     BlogsData,
     MediaFile,
     NewsletterSubscriber,
 )
+from .rendering import render_markdown
+from .sparse_fields import SparseFieldsSerializerMixin
 
 
-class EducationEntrySerializer(serializers.ModelSerializer):
+class EducationEntrySerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = EducationEntry
         fields = '__all__'
 
 
-class ExperienceEntrySerializer(serializers.ModelSerializer):
+class ExperienceEntrySerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ExperienceEntry
         fields = '__all__'
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = '__all__'
 
 
-class ResearchPublicationSerializer(serializers.ModelSerializer):
+class ResearchPublicationSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ResearchPublication
         fields = '__all__'
 
 
-class ResearchIconSerializer(serializers.ModelSerializer):
+class ResearchIconSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ResearchIcon
         fields = '__all__'
 
 
-class HomeDataSerializer(serializers.ModelSerializer):
+class HomeDataSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for HomeData model.
     Formats the individual fields into the expected frontend structure.
+    Sparse fieldsets select whole sections (?fields=hero,about).
     """
+    sections = ['hero', 'about', 'stats', 'skills', 'social_links', 'cta', 'featured_sections']
+
     class Meta:
         model = HomeData
         fields = '__all__'
+        sparse_field_sources = {
+            'hero': [
+                'hero_name', 'hero_tagline', 'hero_bio', 'hero_profile_image', 'hero_resume_url',
+                'hero_cta_primary_text', 'hero_cta_primary_url',
+                'hero_cta_secondary_text', 'hero_cta_secondary_url',
+            ],
+            'about': ['about_title', 'about_paragraphs', 'about_highlights'],
+            'stats': [
+                'stats_years_of_experience', 'stats_projects_completed',
+                'stats_publications', 'stats_technologies_used',
+            ],
+            'skills': ['skills_title', 'skills_categories'],
+            'social_links': ['social_github', 'social_linkedin', 'social_twitter', 'social_email', 'social_scholar'],
+            'cta': [
+                'cta_title', 'cta_paragraph', 'cta_primary_text', 'cta_primary_url',
+                'cta_secondary_text', 'cta_secondary_url', 'social_email',
+            ],
+            'featured_sections': ['show_experience', 'show_education', 'show_projects', 'show_research', 'show_blog'],
+        }
+
+    def get_available_fields(self):
+        return list(self.sections)
 
     def to_representation(self, instance):
         """
         Transform the flat model structure into nested JSON for frontend.
         """
+        selected = self.context.get('sparse_fields')
         return {
             'data': {
-                'hero': {
-                    'name': instance.hero_name,
-                    'tagline': instance.hero_tagline,
-                    'bio': instance.hero_bio,
-                    'profile_image': instance.hero_profile_image,
-                    'resume_url': instance.hero_resume_url or None,
-                    'cta_buttons': {
-                        'primary': {
-                            'text': instance.hero_cta_primary_text,
-                            'url': instance.hero_cta_primary_url,
-                        } if instance.hero_cta_primary_text else None,
-                        'secondary': {
-                            'text': instance.hero_cta_secondary_text,
-                            'url': instance.hero_cta_secondary_url,
-                        } if instance.hero_cta_secondary_text else None,
-                    }
-                },
-                'about': {
-                    'title': instance.about_title,
-                    'paragraphs': instance.about_paragraphs,
-                    'highlights': instance.about_highlights,
-                },
-                'stats': {
-                    'years_of_experience': instance.stats_years_of_experience or None,
-                    'projects_completed': instance.stats_projects_completed,
-                    'publications': instance.stats_publications,
-                    'technologies_used': instance.stats_technologies_used,
-                },
-                'skills': {
-                    'title': instance.skills_title,
-                    'categories': instance.skills_categories,
-                },
-                'social_links': {
-                    'github': instance.social_github or None,
-                    'linkedin': instance.social_linkedin or None,
-                    'twitter': instance.social_twitter or None,
-                    'email': instance.social_email or None,
-                    'scholar': instance.social_scholar or None,
-                },
-                'cta': {
-                    'title': instance.cta_title or None,
-                    'paragraph': instance.cta_paragraph or None,
-                    'primary': {
-                        'text': instance.cta_primary_text,
-                        'url': instance.cta_primary_url or f"mailto:{instance.social_email}",
-                    } if instance.cta_primary_text else None,
-                    'secondary': {
-                        'text': instance.cta_secondary_text,
-                        'url': instance.cta_secondary_url,
-                    } if instance.cta_secondary_text else None,
-                },
-                'featured_sections': {
-                    'show_experience': instance.show_experience,
-                    'show_education': instance.show_education,
-                    'show_projects': instance.show_projects,
-                    'show_research': instance.show_research,
-                    'show_blog': instance.show_blog,
-                }
+                section: getattr(self, f'get_{section}')(instance)
+                for section in self.sections
+                if selected is None or section in selected
+            }
+        }
+
+    def get_hero(self, instance):
+        return {
+            'name': instance.hero_name,
+            'tagline': instance.hero_tagline,
+            'bio': instance.hero_bio,
+            'profile_image': instance.hero_profile_image,
+            'resume_url': instance.hero_resume_url or None,
+            'cta_buttons': {
+                'primary': {
+                    'text': instance.hero_cta_primary_text,
+                    'url': instance.hero_cta_primary_url,
+                } if instance.hero_cta_primary_text else None,
+                'secondary': {
+                    'text': instance.hero_cta_secondary_text,
+                    'url': instance.hero_cta_secondary_url,
+                } if instance.hero_cta_secondary_text else None,
             }
         }
 
+    def get_about(self, instance):
+        return {
+            'title': instance.about_title,
+            'paragraphs': instance.about_paragraphs,
+            'highlights': instance.about_highlights,
+        }
+
+    def get_stats(self, instance):
+        return {
+            'years_of_experience': instance.stats_years_of_experience or None,
+            'projects_completed': instance.stats_projects_completed,
+            'publications': instance.stats_publications,
+            'technologies_used': instance.stats_technologies_used,
+        }
 
-class BlogSerializer(serializers.ModelSerializer):
+    def get_skills(self, instance):
+        return {
+            'title': instance.skills_title,
+            'categories': instance.skills_categories,
+        }
+
+    def get_social_links(self, instance):
+        return {
+            'github': instance.social_github or None,
+            'linkedin': instance.social_linkedin or None,
+            'twitter': instance.social_twitter or None,
+            'email': instance.social_email or None,
+            'scholar': instance.social_scholar or None,
+        }
+
+    def get_cta(self, instance):
+        return {
+            'title': instance.cta_title or None,
+            'paragraph': instance.cta_paragraph or None,
+            'primary': {
+                'text': instance.cta_primary_text,
+                'url': instance.cta_primary_url or f"mailto:{instance.social_email}",
+            } if instance.cta_primary_text else None,
+            'secondary': {
+                'text': instance.cta_secondary_text,
+                'url': instance.cta_secondary_url,
+            } if instance.cta_secondary_text else None,
+        }
+
+    def get_featured_sections(self, instance):
+        return {
+            'show_experience': instance.show_experience,
+            'show_education': instance.show_education,
+            'show_projects': instance.show_projects,
+            'show_research': instance.show_research,
+            'show_blog': instance.show_blog,
+        }
+
+
+class RelatedBlogSerializer(serializers.ModelSerializer):
+    """
+    Compact representation of a related post, read from the precomputed index.
+    """
+    slug = serializers.CharField(source='related.slug')
+    title = serializers.CharField(source='related.title')
+    excerpt = serializers.CharField(source='related.excerpt')
+    cover_image = serializers.CharField(source='related.cover_image')
+    category = serializers.CharField(source='related.category')
+    published_date = serializers.DateTimeField(source='related.published_date')
+
+    class Meta:
+        model = RelatedBlog
+        fields = [
+            'slug',
+            'title',
+            'excerpt',
+            'cover_image',
+            'category',
+            'published_date',
+            'score',
+        ]
+
+
+class BlogSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Blog model with markdown to HTML conversion.
     The 'content_html' field is automatically generated from 'content_markdown'.
+    The 'related' field lists neighbours from the precomputed related-posts index.
     """
     content_html = serializers.SerializerMethodField()
+    related = serializers.SerializerMethodField()
 
     class Meta:
         model = Blog
@@ -160,24 +231,32 @@ class BlogSerializer(serializers.ModelSerializer):
             'read_time',
             'meta_description',
             'meta_keywords',
+            'related',  # Generated field
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'content_html']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'content_html', 'related']
+        sparse_field_sources = {
+            'content_html': ['content_markdown'],
+            'related': [],  # read from the prefetched index, no Blog columns
+        }
 
     def get_content_html(self, obj):
         """
         Convert markdown content to HTML.
-        Uses Python-Markdown with extensions for better formatting.
+        Uses Python-Markdown with extensions for better formatting;
+        renderings are cached by content hash.
         """
-        md = markdown.Markdown(extensions=[
-            'extra',  # Includes tables, fenced code blocks, etc.
-            'codehilite',  # Syntax highlighting for code blocks
-            'toc',  # Table of contents
-            'nl2br',  # Convert newlines to <br>
-        ])
-        return md.convert(obj.content_markdown)
+        return render_markdown(obj.content_markdown)
+
+    def get_related(self, obj):
+        """
+        Return related posts from the precomputed index.
+        Views should prefetch 'related_entries__related' to avoid extra queries.
+        """
+        entries = [entry for entry in obj.related_entries.all() if entry.related.is_published]
+        return RelatedBlogSerializer(entries, many=True).data
 
 
-class BlogListSerializer(serializers.ModelSerializer):
+class BlogListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for blog list views.
     Excludes full content for better performance.
@@ -204,7 +283,7 @@ class BlogListSerializer(serializers.ModelSerializer):
         ]
 
 
-class BlogCommentSerializer(serializers.ModelSerializer):
+class BlogCommentSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for blog comments.
     """
@@ -243,7 +322,7 @@ class BlogCommentCreateSerializer(serializers.ModelSerializer):
         }
 
 
-class BlogsDataSerializer(serializers.ModelSerializer):
+class BlogsDataSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = BlogsData
         fields = '__all__'
@@ -254,7 +333,7 @@ class SectionSerializer(serializers.Serializer):
         fields = ()
 
 
-class MediaFileSerializer(serializers.ModelSerializer):
+class MediaFileSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for MediaFile model.
     Provides file URL, size display, and metadata.
@@ -285,6 +364,12 @@ class MediaFileSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'uuid', 'file_size', 'original_filename', 'uploaded_at', 'updated_at']
+        sparse_field_sources = {
+            'file_url': ['slug'],
+            'api_url': ['slug'],
+            'file_size_display': ['file_size'],
+            'file_extension': ['file'],
+        }
 
     def get_file_url(self, obj):
         """Returns the CDN URL for accessing this file."""
@@ -303,7 +388,7 @@ class MediaFileSerializer(serializers.ModelSerializer):
         return obj.get_file_extension()
 
 
-class MediaFileListSerializer(serializers.ModelSerializer):
+class MediaFileListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for listing media files.
     """
@@ -325,6 +410,11 @@ class MediaFileListSerializer(serializers.ModelSerializer):
             'file_url',
             'uploaded_at',
         ]
+        sparse_field_sources = {
+            'file_url': ['slug'],
+            'file_size_display': ['file_size'],
+            'file_extension': ['file'],
+        }
 
     def get_file_url(self, obj):
         return obj.get_file_url()
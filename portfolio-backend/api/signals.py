@@ -0,0 +1,162 @@
+"""
+Signal handlers that keep derived data in sync with the models it is built from.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from .facets import FACET_FIELDS, invalidate_blog_facets
+from .models import (
+    EducationEntry,
+    ExperienceEntry,
+    Project,
+    ResearchPublication,
+    ResearchIcon,
+    HomeData,
+    Blog,
+    BlogComment,
+    RelatedBlog,
+    BlogsData,
+    BlogSettings,
+    MediaFile,
+)
+from .related import INDEXED_FIELDS as RELATED_FIELDS, related_updates_are_paused, schedule_related_update
+from .response_cache import bump_version as invalidate_api_responses
+from .search import SEARCH_SOURCES, get_indexed_fields, get_source_for_model, index_object, remove_object
+from .suggest import bump_generation
+from .tags import TAG_SOURCES, sync_object_tags
+
+# Fields the suggestion index is built from
+SUGGEST_FIELDS = {'title', 'slug', 'category', 'tags', 'is_published', 'is_visible'}
+
+# Counter-only saves don't invalidate cached API responses; cached counts
+# catch up within API_RESPONSE_CACHE_TIMEOUT.
+COUNTER_FIELDS = {'views', 'likes', 'comments_count', 'shares', 'trending_score', 'trending_score_updated_at'}
+
+
+def touches(update_fields, fields):
+    """Return True if a save with `update_fields` may have changed any of `fields`."""
+    return update_fields is None or bool(set(update_fields) & fields)
+
+
+@receiver(post_save, sender=Blog)
+def refresh_related_blogs_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Counter updates (views, likes, ...) save with update_fields and are skipped here
+    if raw or not getattr(settings, 'RELATED_BLOGS_UPDATE_ON_SAVE', True) or related_updates_are_paused():
+        return
+    if not touches(update_fields, RELATED_FIELDS):
+        return
+    transaction.on_commit(lambda: schedule_related_update(instance.pk))
+
+
+@receiver(pre_delete, sender=Blog)
+def remember_related_listers(sender, instance, **kwargs):
+    if related_updates_are_paused():
+        return
+    # The cascade removes the rows pointing at this blog, so note who had them
+    instance._related_listers = list(
+        RelatedBlog.objects.filter(related=instance).values_list('blog_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Blog)
+def refresh_related_blogs_on_delete(sender, instance, **kwargs):
+    if not getattr(settings, 'RELATED_BLOGS_UPDATE_ON_SAVE', True) or related_updates_are_paused():
+        return
+    blog_id = instance.pk
+    listers = getattr(instance, '_related_listers', [])
+    transaction.on_commit(lambda: schedule_related_update(blog_id, recompute_ids=listers))
+
+
+def update_search_index_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    _, source = get_source_for_model(sender)
+    if not touches(update_fields, get_indexed_fields(source)):
+        return
+    index_object(instance)
+
+
+def update_search_index_on_delete(sender, instance, **kwargs):
+    remove_object(sender, instance.pk)
+
+
+for _source in SEARCH_SOURCES.values():
+    post_save.connect(update_search_index_on_save, sender=_source['model'],
+                      dispatch_uid=f"search_index_save_{_source['model'].__name__}")
+    post_delete.connect(update_search_index_on_delete, sender=_source['model'],
+                        dispatch_uid=f"search_index_delete_{_source['model'].__name__}")
+
+
+def invalidate_suggestions_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if touches(update_fields, SUGGEST_FIELDS):
+        bump_generation()
+
+
+def invalidate_suggestions_on_delete(sender, instance, **kwargs):
+    bump_generation()
+
+
+for _model in (Blog, Project, ResearchPublication):
+    post_save.connect(invalidate_suggestions_on_save, sender=_model,
+                      dispatch_uid=f'suggest_save_{_model.__name__}')
+    post_delete.connect(invalidate_suggestions_on_delete, sender=_model,
+                        dispatch_uid=f'suggest_delete_{_model.__name__}')
+
+
+def sync_tags_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not touches(update_fields, {'tags'}):
+        return
+    sync_object_tags(instance)
+
+
+for _model in TAG_SOURCES:
+    post_save.connect(sync_tags_on_save, sender=_model, dispatch_uid=f'tags_save_{_model.__name__}')
+
+
+@receiver(post_save, sender=Blog)
+def invalidate_facets_on_save(sender, instance, update_fields=None, **kwargs):
+    if touches(update_fields, FACET_FIELDS):
+        invalidate_blog_facets()
+
+
+@receiver(post_delete, sender=Blog)
+def invalidate_facets_on_delete(sender, instance, **kwargs):
+    invalidate_blog_facets()
+
+
+# Models whose rows appear in API responses. Derived tables (related posts,
+# tag links) only change as a consequence of saves to these.
+CACHED_RESPONSE_MODELS = (
+    EducationEntry,
+    ExperienceEntry,
+    Project,
+    ResearchPublication,
+    ResearchIcon,
+    HomeData,
+    Blog,
+    BlogComment,
+    BlogsData,
+    BlogSettings,
+    MediaFile,
+)
+
+
+def invalidate_api_responses_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= COUNTER_FIELDS:
+        return
+    # After commit, so a concurrent request cannot cache the old data under the new version
+    transaction.on_commit(invalidate_api_responses)
+
+
+def invalidate_api_responses_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_api_responses)
+
+
+for _model in CACHED_RESPONSE_MODELS:
+    post_save.connect(invalidate_api_responses_on_save, sender=_model,
+                      dispatch_uid=f'response_cache_save_{_model.__name__}')
+    post_delete.connect(invalidate_api_responses_on_delete, sender=_model,
+                        dispatch_uid=f'response_cache_delete_{_model.__name__}')
@@ -0,0 +1,264 @@
+"""
+Static JSON snapshots of the public API.
+
+export_snapshot() renders every public GET endpoint through its view and
+writes the response bodies to SNAPSHOT_ROOT/<version>/, mirroring the URL
+(`/api/projects/` -> `api/projects/index.json`) so nginx can serve a
+snapshot directly and the frontend can read it at build time. Each version
+has a manifest.json; the `current` symlink is switched to a version only
+once it is complete.
+
+Incremental exports regenerate every collection endpoint (they are one
+query each) but reuse per-object detail files whose fingerprint (a digest
+of the object's columns, plus its related posts' for blogs) is unchanged,
+hard-linking them from the previous version. Columns are digested rather
+than trusting updated_at because counters and admin bulk actions change
+rows with queryset.update().
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.test import RequestFactory
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+
+from .models import (
+    EducationEntry,
+    ExperienceEntry,
+    Project,
+    ResearchPublication,
+    Blog,
+    RelatedBlog,
+    Tag,
+)
+from .backup_utils import row_digests
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+INDEX_FILE = 'index.json'
+CURRENT_LINK = 'current'
+
+# Endpoints that list or aggregate many objects; always regenerated
+COLLECTION_PATHS = [
+    '/api/education/',
+    '/api/experience/',
+    '/api/projects/',
+    '/api/research/',
+    '/api/research-icons/',
+    '/api/home/',
+    '/api/blogs/',
+    '/api/blog-settings/',
+    '/api/blog-posts/',
+    '/api/trending-blogs/',
+    '/api/featured-blogs/',
+    '/api/blog-facets/',
+    '/api/tags/',
+]
+
+# The related-post columns a blog detail embeds (RelatedBlogSerializer)
+RELATED_FIELDS = ['id', 'slug', 'title', 'excerpt', 'cover_image', 'category', 'published_date', 'is_published']
+
+
+def get_snapshot_root():
+    return Path(getattr(settings, 'SNAPSHOT_ROOT', settings.BASE_DIR / 'snapshots'))
+
+
+def collection_paths():
+    """Fixed collection endpoints plus one per blog category and tag."""
+    paths = list(COLLECTION_PATHS)
+    categories = Blog.objects.filter(is_published=True).exclude(category='').values_list('category', flat=True)
+    paths += [f'/api/blogs/category/{category}/' for category in sorted(set(categories))]
+    paths += [f'/api/tags/{slug}/' for slug in Tag.objects.order_by('slug').values_list('slug', flat=True)]
+    return paths
+
+
+def detail_fingerprints():
+    """Return {path: fingerprint} for every per-object detail endpoint."""
+    fingerprints = {}
+    for model, prefix, key in (
+            (EducationEntry, '/api/education/', 'pk'),
+            (ExperienceEntry, '/api/experience/', 'pk'),
+            (Project, '/api/projects/', 'slug'),
+            (ResearchPublication, '/api/research/', 'slug')):
+        digests = row_digests(model)
+        for pk, value in model.objects.values_list('pk', key):
+            fingerprints[f'{prefix}{value}/'] = digests[str(pk)]
+
+    # A blog detail embeds the compact form of its related posts, so those columns are part of its fingerprint
+    blog_digests = row_digests(Blog)
+    neighbours = {}
+    for blog_id, *related in RelatedBlog.objects.order_by('blog_id', 'rank').values_list(
+            'blog_id', *(f'related__{field}' for field in RELATED_FIELDS)):
+        neighbours.setdefault(blog_id, []).append(hashlib.blake2b(repr(related).encode(), digest_size=8).hexdigest())
+
+    for blog_id, slug in Blog.objects.filter(is_published=True).values_list('id', 'slug'):
+        fingerprints[f'/api/blog-posts/{slug}/'] = '|'.join([blog_digests[str(blog_id)], *neighbours.get(blog_id, [])])
+    return fingerprints
+
+
+def public_paths():
+    """Every public GET endpoint path: collections first, then detail pages."""
+    return collection_paths() + sorted(detail_fingerprints())
+
+
+def render_path(path):
+    """Render a GET request for `path` through its view; returns (status, body)."""
+    match = resolve(path)
+    request = RequestFactory().get(quote(path))
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return response.status_code, response.content
+
+
+def path_to_file(path):
+    """Map '/api/projects/x/' to 'api/projects/x/index.json', refusing unsafe segments."""
+    parts = [part for part in path.split('/') if part]
+    if any(part in ('.', '..') or '\\' in part for part in parts):
+        raise ValueError(f'Unsafe snapshot path: {path}')
+    return '/'.join(parts + [INDEX_FILE])
+
+
+def load_manifest(version_dir):
+    try:
+        with open(Path(version_dir) / MANIFEST_FILE, encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def current_version_dir(root=None):
+    link = (root or get_snapshot_root()) / CURRENT_LINK
+    return link.resolve() if link.exists() else None
+
+
+def _new_version_name(root):
+    name = timezone.now().strftime('%Y%m%dT%H%M%SZ')
+    candidate, counter = name, 1
+    while (root / candidate).exists():
+        candidate = f'{name}-{counter}'
+        counter += 1
+    return candidate
+
+
+def _reuse_file(source, target):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _point_current(root, version):
+    temporary = root / f'.{CURRENT_LINK}.tmp'
+    if temporary.is_symlink() or temporary.exists():
+        temporary.unlink()
+    os.symlink(version, temporary, target_is_directory=True)
+    os.replace(temporary, root / CURRENT_LINK)
+
+
+def prune_versions(root, keep):
+    """Delete all but the `keep` newest versions (never the current one)."""
+    current = current_version_dir(root)
+    versions = sorted(
+        (path for path in root.iterdir() if path.is_dir() and not path.is_symlink() and not path.name.startswith('.')),
+        key=lambda path: path.name,
+    )
+    removed = []
+    for path in versions[:-keep] if keep > 0 else versions:
+        if current is not None and path.resolve() == current:
+            continue
+        shutil.rmtree(path)
+        removed.append(path.name)
+    return removed
+
+
+def export_snapshot(incremental=False, root=None, keep=3):
+    """
+    Write a new snapshot version and make it current.
+
+    Args:
+        incremental: Reuse detail files whose fingerprint is unchanged since
+            the current version
+        root: Snapshot directory (defaults to settings.SNAPSHOT_ROOT)
+        keep: Number of versions to keep on disk
+
+    Returns:
+        dict: version, base, written, reused, skipped (non-200 paths) and pruned
+    """
+    root = Path(root) if root else get_snapshot_root()
+    root.mkdir(parents=True, exist_ok=True)
+
+    base_dir = current_version_dir(root) if incremental else None
+    base_manifest = load_manifest(base_dir) if base_dir else None
+    base_files = base_manifest['files'] if base_manifest else {}
+
+    version = _new_version_name(root)
+    staging = root / f'.{version}.tmp'
+    staging.mkdir()
+
+    files = {}
+    stats = {'written': 0, 'reused': 0, 'skipped': []}
+
+    fingerprints = detail_fingerprints()
+    paths = [(path, None) for path in collection_paths()] + sorted(fingerprints.items())
+    try:
+        for path, fingerprint in paths:
+            relative = path_to_file(path)
+            target = staging / relative
+            previous = base_files.get(path)
+
+            if fingerprint is not None and previous and previous.get('fingerprint') == fingerprint \
+                    and (base_dir / previous['file']).exists():
+                _reuse_file(base_dir / previous['file'], target)
+                files[path] = previous
+                stats['reused'] += 1
+                continue
+
+            try:
+                status, body = render_path(path)
+            except Resolver404:
+                # e.g. a category containing '/', which no URL pattern can match
+                logger.warning('Snapshot skipped %s: no matching URL pattern', path)
+                status = 404
+            if status != 200:
+                stats['skipped'].append(path)
+                continue
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(body)
+            files[path] = {
+                'file': relative,
+                'bytes': len(body),
+                'sha256': hashlib.sha256(body).hexdigest(),
+                'fingerprint': fingerprint,
+            }
+            stats['written'] += 1
+
+        manifest = {
+            'version': version,
+            'created_at': timezone.now().isoformat(),
+            'base': base_manifest['version'] if base_manifest else None,
+            'files': files,
+        }
+        with open(staging / MANIFEST_FILE, 'w', encoding='utf-8') as handle:
+            json.dump(manifest, handle, indent=2, sort_keys=True)
+
+        staging.rename(root / version)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    _point_current(root, version)
+    stats['pruned'] = prune_versions(root, keep)
+    stats['version'] = version
+    stats['base'] = manifest['base']
+    return stats
@@ -0,0 +1,136 @@
+"""
+Sparse fieldsets for list and detail endpoints.
+
+`?fields=title,slug` keeps only the named fields, `?exclude=content_markdown`
+drops them; both may be combined. SparseFieldsetsMixin (views) validates the
+names, passes the selection to the serializer through its context and trims
+the queryset with .only() so unrequested columns are never read. Serializers
+opt in with SparseFieldsSerializerMixin; fields that are not plain model
+columns (method fields, custom sections) declare the columns they read in
+Meta.sparse_field_sources, otherwise the queryset is left untouched.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+from .fast_serializers import get_values_serializer
+
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+
+
+def parse_field_list(value):
+    """Split a comma-separated query parameter into field names."""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def get_sparse_columns(serializer, names):
+    """
+    Return the model fields needed to render `names`, or None if that cannot
+    be determined (the queryset must then load every column).
+    """
+    meta = serializer.Meta
+    declared = getattr(meta, 'sparse_field_sources', {})
+    fields = serializer.get_all_fields()
+
+    columns = {meta.model._meta.pk.name}
+    for name in names:
+        if name in declared:
+            columns.update(declared[name])
+            continue
+        source = fields[name].source or name  # unbound fields default to their name
+        if source == '*' or '.' in source:
+            return None
+        try:
+            model_field = meta.model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete:
+            return None
+        columns.add(model_field.name)
+    return columns
+
+
+class SparseFieldsSerializerMixin:
+    """Drop the fields that were not selected through ?fields= / ?exclude=."""
+
+    def get_all_fields(self):
+        """All fields, ignoring any selection in the context."""
+        return super().get_fields()
+
+    def get_available_fields(self):
+        """Names that may be used in ?fields= and ?exclude=."""
+        return [name for name, field in self.get_all_fields().items() if not field.write_only]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get('sparse_fields')
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+
+class SparseFieldsetsMixin:
+    """
+    Add ?fields= and ?exclude= to a generic list or detail view.
+
+    Views that build their own object (get_object overrides) must go through
+    filter_queryset(), which is where the column trimming happens.
+    """
+
+    def get_sparse_fields(self):
+        """
+        Return the selected field names in serializer order, or None when the
+        request does not restrict the fields.
+        """
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+
+        params = self.request.query_params
+        requested = parse_field_list(params.get(FIELDS_PARAM, ''))
+        excluded = parse_field_list(params.get(EXCLUDE_PARAM, ''))
+
+        selected = None
+        if requested or excluded:
+            available = self.get_serializer_class()().get_available_fields()
+            errors = {}
+            for param, names in ((FIELDS_PARAM, requested), (EXCLUDE_PARAM, excluded)):
+                unknown = [name for name in names if name not in available]
+                if unknown:
+                    errors[param] = [
+                        f"Unknown field(s): {', '.join(unknown)}. "
+                        f"Available: {', '.join(available)}."
+                    ]
+            if errors:
+                raise ValidationError(errors)
+
+            selected = tuple(
+                name for name in available
+                if (not requested or name in requested) and name not in excluded
+            )
+
+        self._sparse_fields = selected
+        return selected
+
+    def is_field_selected(self, name):
+        selected = self.get_sparse_fields()
+        return selected is None or name in selected
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fields'] = self.get_sparse_fields()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        selected = self.get_sparse_fields()
+        if selected is not None:
+            columns = get_sparse_columns(self.get_serializer_class()(), selected)
+            if columns is not None:
+                queryset = queryset.only(*columns)
+        return queryset
+
+    def get_list_values_serializer(self):
+        # Used by FastListMixin: read only the selected columns through values()
+        return get_values_serializer(self.get_serializer_class(), self.get_sparse_fields())
@@ -0,0 +1,203 @@
+"""
+In-memory prefix index for search-as-you-type suggestions.
+
+Every worker keeps sorted arrays of lowercase keys (one per word position of
+each title, tag and category) and answers prefix lookups with bisect, so a
+suggestion request never touches the database. Keys at the start of a label
+live in their own array and are scanned first, because they rank highest. Model signals bump a
+generation counter in the shared cache; each worker compares it at most once
+per SUGGEST_REFRESH_INTERVAL seconds and rebuilds when it has changed.
+"""
+
+import logging
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from .models import Blog, Project, ResearchPublication
+from .tags import clean_tag_names
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'suggest:generation'
+
+# Lower sorts first when several entries match equally well
+KIND_PRIORITY = {
+    'blog': 0,
+    'project': 1,
+    'research': 2,
+    'category': 3,
+    'tag': 4,
+}
+
+
+def bump_generation():
+    """Tell every worker that the suggestion index is out of date."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+
+def _current_generation():
+    return cache.get(GENERATION_KEY, 0)
+
+
+def _word_keys(text):
+    """Yield the lowercase text starting at every word boundary."""
+    lowered = ' '.join(text.lower().split())
+    yield lowered
+    position = lowered.find(' ')
+    while position != -1:
+        yield lowered[position + 1:]
+        position = lowered.find(' ', position + 1)
+
+
+def _collect_entries():
+    """Return (label, kind, slug) tuples for everything that can be suggested."""
+    entries = []
+    categories = set()
+    tags = {}  # tag slug -> display name
+
+    for title, slug, category, blog_tags in Blog.objects.filter(is_published=True).values_list(
+            'title', 'slug', 'category', 'tags'):
+        entries.append((title, 'blog', slug))
+        if category:
+            categories.add(category)
+        for tag_slug, name in clean_tag_names(blog_tags).items():
+            tags.setdefault(tag_slug, name)
+
+    for title, slug in Project.objects.filter(is_visible=True).values_list('title', 'slug'):
+        entries.append((title, 'project', slug))
+
+    for title, slug in ResearchPublication.objects.filter(is_visible=True).values_list('title', 'slug'):
+        entries.append((title, 'research', slug))
+
+    entries.extend((category, 'category', category) for category in categories)
+    # Tag suggestions link to /api/tags/<slug>/, so they carry the tag slug
+    entries.extend((name, 'tag', tag_slug) for tag_slug, name in tags.items())
+    return entries
+
+
+class PrefixIndex:
+    """Sorted-array prefix index; rebuilt as a whole and swapped atomically."""
+
+    def __init__(self):
+        self._label_keys = []  # whole labels
+        self._label_payloads = []
+        self._keys = []  # labels from their second word on
+        self._payloads = []
+        self._lock = threading.Lock()
+        self._generation = None
+        self._checked_at = 0.0
+        self.build_seconds = 0.0
+        self.built_at = None
+
+    def build(self):
+        """Rebuild the index from the database."""
+        started = time.perf_counter()
+        generation = _current_generation()
+
+        label_pairs = []
+        pairs = []
+        for entry_id, (label, kind, slug) in enumerate(_collect_entries()):
+            payload = (KIND_PRIORITY[kind], label, kind, slug, entry_id)
+            label_key, *word_keys = _word_keys(label)
+            label_pairs.append((label_key, payload))
+            pairs.extend((key, payload) for key in word_keys)
+        label_pairs.sort(key=lambda pair: pair[0])
+        pairs.sort(key=lambda pair: pair[0])
+
+        with self._lock:
+            self._label_keys = [key for key, _ in label_pairs]
+            self._label_payloads = [payload for _, payload in label_pairs]
+            self._keys = [key for key, _ in pairs]
+            self._payloads = [payload for _, payload in pairs]
+            self._generation = generation
+            self._checked_at = time.monotonic()
+            self.build_seconds = time.perf_counter() - started
+            self.built_at = time.time()
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        interval = getattr(settings, 'SUGGEST_REFRESH_INTERVAL', 1.0)
+        if self._generation is not None and now - self._checked_at < interval:
+            return
+        self._checked_at = now
+        if self._generation is None or _current_generation() != self._generation:
+            self.build()
+
+    def suggest(self, prefix, limit=10):
+        """
+        Return up to `limit` suggestions whose label has a word starting with `prefix`.
+        Matches at the start of the label rank above matches further in.
+        """
+        prefix = ' '.join(prefix.lower().split())
+        if not prefix:
+            return []
+        self._ensure_fresh()
+
+        scan_limit = getattr(settings, 'SUGGEST_SCAN_LIMIT', 200)
+
+        # Label-start matches first: the scan limit then only ever cuts off
+        # matches further in, and those are not needed once `limit` is reached
+        seen = set()
+        matches = []
+        for inside_label, (keys, payloads) in enumerate((
+                (self._label_keys, self._label_payloads), (self._keys, self._payloads))):
+            if inside_label and len(matches) >= limit:
+                break
+            position = bisect_left(keys, prefix)
+            while position < len(keys) and len(matches) < scan_limit and keys[position].startswith(prefix):
+                payload = payloads[position]
+                if payload[4] not in seen:
+                    seen.add(payload[4])
+                    matches.append((inside_label, payload[0], len(payload[1]), payload))
+                position += 1
+
+        matches.sort(key=lambda match: match[:3])
+        return [
+            {'label': payload[1], 'type': payload[2], 'slug': payload[3]}
+            for *_, payload in matches[:limit]
+        ]
+
+    def memory_bytes(self):
+        """Approximate memory held by the index (keys, payloads and containers)."""
+        keys = self._label_keys + self._keys
+        payloads = self._label_payloads + self._payloads
+        total = sum(sys.getsizeof(array) for array in (
+            self._label_keys, self._label_payloads, self._keys, self._payloads))
+        total += sum(sys.getsizeof(key) for key in keys)
+        counted = set()
+        for payload in payloads:
+            if id(payload) in counted:
+                continue
+            counted.add(id(payload))
+            total += sys.getsizeof(payload) + sum(sys.getsizeof(item) for item in payload)
+        return total
+
+    def stats(self):
+        return {
+            'entries': len(self._label_payloads),
+            'keys': len(self._label_keys) + len(self._keys),
+            'memory_bytes': self.memory_bytes(),
+            'build_seconds': round(self.build_seconds, 6),
+            'built_at': self.built_at,
+            'generation': self._generation,
+        }
+
+
+suggest_index = PrefixIndex()
+
+
+def warm_up():
+    """Build the index at worker start; failures are logged, not raised."""
+    try:
+        suggest_index.build()
+    except DatabaseError:
+        logger.warning('Suggestion index not built at startup (database not ready)')
@@ -0,0 +1,110 @@
+"""
+Normalised tag index.
+
+The `tags` JSON lists on Blog, Project and ResearchPublication remain the
+source of truth; this module mirrors them into the Tag table and one
+through-table per content type so tag listings and counts are index lookups
+instead of JSON scans. Links are refreshed by the save signals in signals.py
+and can be rebuilt from scratch with the rebuild_tag_index command.
+"""
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from .models import (
+    Blog,
+    Project,
+    ResearchPublication,
+    Tag,
+    BlogTag,
+    ProjectTag,
+    ResearchPublicationTag,
+)
+
+
+# model -> (through model, FK field name on the through model)
+TAG_SOURCES = {
+    Blog: (BlogTag, 'blog'),
+    Project: (ProjectTag, 'project'),
+    ResearchPublication: (ResearchPublicationTag, 'publication'),
+}
+
+
+def tag_slug(name):
+    """Return the lookup key for a tag name ('Machine Learning' -> 'machine-learning')."""
+    return slugify(name, allow_unicode=True) or name.strip().lower()
+
+
+def clean_tag_names(tags):
+    """Return {slug: display name} for the string entries of a JSON tag list."""
+    names = {}
+    for tag in tags or []:
+        if isinstance(tag, str) and tag.strip():
+            names.setdefault(tag_slug(tag), tag.strip())
+    return names
+
+
+def get_or_create_tags(names):
+    """
+    Resolve {slug: name} to {slug: Tag}, creating missing tags in one query.
+    The first name seen for a slug becomes its display name.
+    """
+    tags = {tag.slug: tag for tag in Tag.objects.filter(slug__in=list(names))}
+    missing = [Tag(slug=slug, name=name) for slug, name in names.items() if slug not in tags]
+    if missing:
+        Tag.objects.bulk_create(missing, ignore_conflicts=True)
+        tags.update({tag.slug: tag for tag in Tag.objects.filter(slug__in=[tag.slug for tag in missing])})
+    return tags
+
+
+def sync_object_tags(obj):
+    """Make the through-table rows for `obj` match its `tags` JSON list."""
+    through, fk_name = TAG_SOURCES[type(obj)]
+    names = clean_tag_names(obj.tags)
+
+    with transaction.atomic():
+        tags = get_or_create_tags(names)
+        wanted = {tag.id for tag in tags.values()}
+        existing = set(through.objects.filter(**{fk_name: obj}).values_list('tag_id', flat=True))
+
+        if existing - wanted:
+            through.objects.filter(**{fk_name: obj, 'tag_id__in': existing - wanted}).delete()
+        through.objects.bulk_create(
+            [through(**{fk_name: obj, 'tag_id': tag_id}) for tag_id in wanted - existing],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_tag_index():
+    """
+    Rebuild every tag link from the JSON fields and drop unused tags.
+
+    Returns:
+        int: Number of links written
+    """
+    with transaction.atomic():
+        objects_by_model = {
+            model: list(model.objects.only('id', 'tags')) for model in TAG_SOURCES
+        }
+
+        names = {}
+        for objects in objects_by_model.values():
+            for obj in objects:
+                for slug, name in clean_tag_names(obj.tags).items():
+                    names.setdefault(slug, name)
+        tags = get_or_create_tags(names)
+
+        total = 0
+        for model, objects in objects_by_model.items():
+            through, fk_name = TAG_SOURCES[model]
+            through.objects.all().delete()
+            links = [
+                through(**{f'{fk_name}_id': obj.id, 'tag_id': tags[slug].id})
+                for obj in objects
+                for slug in clean_tag_names(obj.tags)
+            ]
+            through.objects.bulk_create(links, batch_size=500)
+            total += len(links)
+
+        Tag.objects.exclude(slug__in=list(names)).delete()
+    return total
@@ -0,0 +1,10 @@
+"""URLconf routing the engagement endpoints to the async views, as API_ASYNC_ENGAGEMENT does."""
+
+from django.urls import include, path
+
+from api import async_views
+from api.urls import engagement_urls
+
+urlpatterns = [
+    path('api/', include(engagement_urls(async_views))),
+]
@@ -0,0 +1,164 @@
+"""
+Fixed synthetic dataset for the test suite.
+
+Every collection has more rows than any query budget allows for, so a
+per-row query (N+1) in a view or admin changelist always shows up as a
+budget overrun. Content is deterministic; only auto_now timestamps vary.
+"""
+
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from api.models import (
+    EducationEntry,
+    ExperienceEntry,
+    Project,
+    ResearchPublication,
+    ResearchIcon,
+    HomeData,
+    Blog,
+    BlogComment,
+    BlogsData,
+    BlogSettings,
+    BlogView,
+    BlogLike,
+    MediaFile,
+    NewsletterSubscriber,
+)
+from api.jobs import claim_next_job, enqueue, run_job
+from api.profiling import profile_call, save_profile
+from api.related import rebuild_related_blogs
+from api.search import rebuild_search_index
+from api.trending import update_trending_scores
+
+ROWS = 12
+
+CATEGORIES = ['Machine Learning', 'Web', 'Systems']
+TAGS = ['Django', 'Python', 'Performance', 'Databases', 'Testing']
+WORDS = ['django', 'python', 'query', 'cache', 'index', 'latency', 'render', 'signal', 'worker', 'model']
+
+MARKDOWN = """# Heading {i}
+
+Some *markdown* about {words}.
+
+```python
+def answer():
+    return {i}
+```
+
+| column | value |
+| ------ | ----- |
+| row    | {i}   |
+"""
+
+
+def _words(i, count=6):
+    return ' '.join(WORDS[(i + n) % len(WORDS)] for n in range(count))
+
+
+def build_dataset():
+    """
+    Create the dataset and its derived indexes.
+
+    Returns:
+        dict: Handles the tests build URLs from (slugs, pks, category, tag)
+    """
+    now = timezone.now()
+
+    education = [
+        EducationEntry.objects.create(
+            institution=f'University {i}', degree='BSc', field_of_study=_words(i, 2),
+            start_date=str(2000 + i), achievements=[_words(i, 3)], display_order=i,
+        )
+        for i in range(ROWS)
+    ]
+    experience = [
+        ExperienceEntry.objects.create(
+            company_name=f'Company {i}', role='Engineer', start_date=str(2010 + i),
+            skills=['Python'], tech_stack=['Django'], display_order=i,
+        )
+        for i in range(ROWS)
+    ]
+    projects = [
+        Project.objects.create(
+            slug=f'project-{i}', title=f'Project {i} {_words(i, 2)}', short_description=_words(i),
+            tags=TAGS[i % len(TAGS):][:2], tech_stack={'backend': ['Django']}, display_order=i,
+        )
+        for i in range(ROWS)
+    ]
+    research = [
+        ResearchPublication.objects.create(
+            slug=f'paper-{i}', title=f'Paper {i} {_words(i, 2)}', authors=['A. Author'],
+            description=_words(i), tags=TAGS[i % len(TAGS):][:2], display_order=i,
+        )
+        for i in range(ROWS)
+    ]
+    for i in range(ROWS):
+        ResearchIcon.objects.create(key=f'icon-{i}', path='M0 0h24v24H0z', title=f'Icon {i}')
+
+    HomeData.objects.create(
+        hero_name='Test Person', about_paragraphs=['About'], skills_categories=[{'name': 'Backend', 'skills': ['Python']}],
+    )
+    BlogsData.objects.create(metadata={'title': 'Blog'}, blogs=[], future_topics=['Topic'])
+    BlogSettings.get_settings()
+
+    blogs = [
+        Blog.objects.create(
+            slug=f'post-{i}', title=f'Post {i} {_words(i, 3)}', excerpt=_words(i),
+            content_markdown=MARKDOWN.format(i=i, words=_words(i, 8)),
+            category=CATEGORIES[i % len(CATEGORIES)], tags=TAGS[i % len(TAGS):][:3],
+            author=f'Author {i % 3}', published_date=now - timedelta(days=i),
+            is_published=i < ROWS - 2, is_featured=i % 4 == 0, is_trending=i % 3 == 0,
+        )
+        for i in range(ROWS)
+    ]
+    published = [blog for blog in blogs if blog.is_published]
+
+    for i, blog in enumerate(published):
+        for n in range(3):
+            BlogComment.objects.create(
+                blog=blog, author_name=f'Reader {n}', author_email=f'reader{n}@example.com',
+                comment_text=f'Comment {n} on {blog.title}', is_approved=n != 2,
+            )
+            BlogView.objects.create(blog=blog, fingerprint=f'fp-{i}-{n}', session_id=f's-{n}', ip_address='127.0.0.1')
+            BlogLike.objects.create(blog=blog, fingerprint=f'fp-{i}-{n}', ip_address='127.0.0.1', is_active=n != 1)
+
+    media = [
+        MediaFile.objects.create(
+            slug=f'file-{i}', file=ContentFile(b'x' * (100 + i), name=f'file-{i}.png'),
+            file_type='image', mime_type='image/png', title=f'File {i}', is_public=i != ROWS - 1,
+        )
+        for i in range(ROWS)
+    ]
+
+    for i in range(ROWS):
+        NewsletterSubscriber.objects.create(email=f'subscriber{i}@example.com', confirmed=i % 2 == 0)
+
+    _, profile = profile_call('cprofile', 'dataset', sorted, range(ROWS))
+    profile_name = save_profile('cprofile', profile, {
+        'method': 'GET', 'path': '/api/', 'status': 200, 'duration': 0.001, 'queries': 0, 'user': 'admin',
+    })
+
+    # Normally refreshed on commit or by management commands
+    rebuild_related_blogs()
+    rebuild_search_index()
+    update_trending_scores(full=True)
+
+    # A finished export, run through the job queue like the admin's
+    enqueue('export')
+    export_job = run_job(claim_next_job('dataset'))
+
+    return {
+        'education_pk': education[0].pk,
+        'experience_pk': experience[0].pk,
+        'project_slug': projects[0].slug,
+        'research_slug': research[0].slug,
+        'blog_slug': published[0].slug,
+        'category': published[0].category,
+        'tag_slug': 'django',
+        'media_slug': media[0].slug,
+        'profile_name': profile_name,
+        'job_pk': export_job.pk,
+    }
@@ -0,0 +1,69 @@
+"""
+Fixtures shared by the test modules.
+"""
+
+import logging
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api import suggest
+
+from .dataset import build_dataset
+from .query_budget import QueryBudgetMixin
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class QuietLogsMixin:
+    """Mutes the per-request and job log lines; one line per request would bury the test output."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.log_levels = {name: logging.getLogger(name).level for name in ('api.performance', 'api.jobs')}
+        for name in cls.log_levels:
+            logging.getLogger(name).setLevel(logging.WARNING)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for name, level in cls.log_levels.items():
+            logging.getLogger(name).setLevel(level)
+
+
+class DatasetTestCase(QuietLogsMixin, QueryBudgetMixin, TestCase):
+    """Loads the synthetic dataset once per class, with media and exports in a temp dir."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.settings_override = override_settings(
+            BASE_DIR=cls.temp_dir,
+            MEDIA_ROOT=cls.temp_dir,
+            API_PROFILE_DIR=f'{cls.temp_dir}/profiles',
+            API_MEMORY_DIR=f'{cls.temp_dir}/memory',
+            CACHES=TEST_CACHES,
+            API_RESPONSE_CACHE=False,
+        )
+        cls.settings_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.settings_override.disable()
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.handles = build_dataset()
+        cls.staff = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        # Measure cold caches: rendered markdown, facets, suggestion index
+        cache.clear()
+        suggest.suggest_index.__init__()
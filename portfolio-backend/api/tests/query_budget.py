@@ -0,0 +1,108 @@
+"""
+Query budget assertions with a readable SQL diff on failure.
+
+The SQL each budgeted case executed when its budget was last set is stored,
+normalised, in query_snapshots.json. When a case goes over budget the
+failure shows a unified diff between that recording and what ran now, plus
+the statements that repeated (the usual N+1 signature). Rewrite the
+recordings after an intended change with:
+
+    UPDATE_QUERY_SNAPSHOTS=1 python manage.py test api
+"""
+
+import difflib
+import json
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SNAPSHOT_FILE = Path(__file__).with_name('query_snapshots.json')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'IN \((?:\?, )+\?\)')
+_SAVEPOINT = re.compile(r'"s\d+_x\d+"')
+
+
+def normalize_sql(sql):
+    """Replace literals with ? so recordings don't depend on ids, dates or slugs."""
+    sql = _SAVEPOINT.sub('"?"', sql)
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def load_snapshots():
+    try:
+        with open(SNAPSHOT_FILE, encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_snapshots(snapshots):
+    with open(SNAPSHOT_FILE, 'w', encoding='utf-8') as handle:
+        json.dump(snapshots, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+
+
+def format_failure(name, budget, executed, recorded):
+    lines = [f'{name}: {len(executed)} queries executed, budget is {budget}.']
+
+    repeated = [(sql, count) for sql, count in Counter(executed).items() if count > 1]
+    if repeated:
+        lines.append('')
+        lines.append('Repeated statements:')
+        for sql, count in sorted(repeated, key=lambda item: -item[1]):
+            lines.append(f'  {count}x {sql}')
+
+    lines.append('')
+    if recorded is None:
+        lines.append('No recorded SQL for this case; executed:')
+        lines.extend(f'  {number}. {sql}' for number, sql in enumerate(executed, 1))
+    else:
+        lines.append('SQL diff (- recorded, + executed):')
+        diff = difflib.unified_diff(recorded, executed, 'recorded', 'executed', lineterm='', n=1)
+        lines.extend(f'  {line}' for line in diff)
+    return '\n'.join(lines)
+
+
+class QueryBudgetMixin:
+    """TestCase mixin providing assertQueryBudget()."""
+
+    update_snapshots = os.environ.get('UPDATE_QUERY_SNAPSHOTS') == '1'
+    _snapshots = None
+    _snapshots_changed = False
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        QueryBudgetMixin._snapshots = QueryBudgetMixin._snapshots or load_snapshots()
+
+    @classmethod
+    def tearDownClass(cls):
+        if QueryBudgetMixin._snapshots_changed:
+            save_snapshots(QueryBudgetMixin._snapshots)
+            QueryBudgetMixin._snapshots_changed = False
+        super().tearDownClass()
+
+    @contextmanager
+    def assertQueryBudget(self, name, budget):
+        """Fail if the block runs more than `budget` queries; `name` keys its recorded SQL."""
+        with CaptureQueriesContext(connection) as context:
+            yield context
+
+        executed = [normalize_sql(query['sql']) for query in context.captured_queries]
+        snapshots = QueryBudgetMixin._snapshots
+
+        if self.update_snapshots:
+            if snapshots.get(name) != executed:
+                snapshots[name] = executed
+                QueryBudgetMixin._snapshots_changed = True
+        if len(executed) > budget:
+            self.fail(format_failure(name, budget, executed, snapshots.get(name)))
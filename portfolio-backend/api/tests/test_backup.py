@@ -0,0 +1,90 @@
+"""
+Backups: incremental exports contain only real changes, and a full backup
+plus its increments restores the exported rows.
+"""
+
+from datetime import timedelta
+
+from django.utils import timezone
+
+from api.backup_utils import (
+    export_portfolio_data,
+    get_exportable_models,
+    import_portfolio_data,
+    read_backup_file,
+    read_manifest,
+    row_digests,
+)
+from api.models import BackgroundJob, Blog, EducationEntry, NewsletterSubscriber, RelatedBlog
+from api.trending import update_trending_scores
+
+from .helpers import DatasetTestCase
+
+
+class IncrementalBackupTests(DatasetTestCase):
+
+    def test_trending_update_changes_no_backed_up_rows(self):
+        full = export_portfolio_data()
+
+        stats = update_trending_scores(now=timezone.now() + timedelta(hours=6))
+        self.assertTrue(stats['incremental'])
+        incremental = export_portfolio_data(base=full)
+
+        manifest = read_manifest(incremental)
+        self.assertEqual(manifest['changed_counts']['Blog'], 0)
+        self.assertIsNone(read_backup_file(incremental, 'json_data/blog.json'))
+
+    def test_blog_rows_leave_out_derived_fields(self):
+        full = export_portfolio_data()
+
+        rows = read_backup_file(full, 'json_data/blog.json')
+        self.assertEqual(len(rows), Blog.objects.count())
+        self.assertNotIn('trending_score', rows[0]['fields'])
+        self.assertNotIn('trending_score_updated_at', rows[0]['fields'])
+
+
+def all_row_digests():
+    return {model.__name__: row_digests(model) for _, model, _ in get_exportable_models()}
+
+
+class BackupChainTests(DatasetTestCase):
+
+    def test_full_and_incremental_restore_the_exported_rows(self):
+        full = export_portfolio_data()
+
+        blog = Blog.objects.get(slug=self.handles['blog_slug'])
+        blog.title = 'Renamed after the full backup'
+        blog.save()
+        EducationEntry.objects.filter(pk=self.handles['education_pk']).delete()
+        NewsletterSubscriber.objects.create(email='new@example.com')
+        expected = all_row_digests()
+
+        incremental = export_portfolio_data(base=full)
+        self.assertEqual(read_manifest(incremental)['backup_type'], 'incremental')
+
+        Blog.objects.update(title='Overwritten')
+        results = import_portfolio_data([incremental, full], overwrite=True)
+
+        self.assertTrue(results['success'], results['errors'])
+        self.assertEqual(results['chain'], [full.name, incremental.name])
+        self.assertEqual(all_row_digests(), expected)
+
+    def test_incremental_needs_its_base(self):
+        full = export_portfolio_data()
+        NewsletterSubscriber.objects.create(email='new@example.com')
+        incremental = export_portfolio_data(base=full)
+
+        results = import_portfolio_data(incremental, overwrite=True)
+
+        self.assertFalse(results['success'])
+        self.assertIn(full.name, results['errors'][0])
+
+    def test_restore_queues_no_related_jobs(self):
+        full = export_portfolio_data()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            results = import_portfolio_data(full, overwrite=True)
+
+        self.assertTrue(results['success'], results['errors'])
+        self.assertGreater(RelatedBlog.objects.count(), 0)
+        self.assertFalse(BackgroundJob.objects.filter(kind='related').exists())
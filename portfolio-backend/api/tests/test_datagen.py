@@ -0,0 +1,78 @@
+"""
+Synthetic dataset: counts and counters match what was generated, a seed
+reproduces the same rows, and clearing removes only generated rows.
+"""
+
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+
+from api.datagen import PREFIX, clear_generated, generate_dataset, has_generated_rows
+from api.models import BackgroundJob, Blog, BlogView, MediaFile, Project, RelatedBlog
+
+from .helpers import DatasetTestCase
+
+SIZES = {'blogs': 12, 'views': 300, 'likes': 40, 'comments': 20, 'projects': 3, 'media': 2, 'days': 10}
+
+
+class GenerateDatasetTests(DatasetTestCase):
+
+    def generate(self, seed=7):
+        return generate_dataset(seed=seed, batch_size=50, **SIZES)
+
+    def generated_rows(self):
+        blogs = Blog.objects.filter(slug__startswith=PREFIX).order_by('slug')
+        return {
+            'blogs': list(blogs.values_list('slug', 'title', 'category', 'tags', 'views', 'likes')),
+            'media': list(MediaFile.objects.filter(slug__startswith=PREFIX).order_by('slug').values_list(
+                'slug', 'uuid', 'file_size')),
+        }
+
+    def test_rows_and_counters(self):
+        steps = {name: result for name, _, result in self.generate()}
+        generated = Blog.objects.filter(slug__startswith=PREFIX)
+
+        self.assertEqual(generated.count(), SIZES['blogs'])
+        self.assertEqual(BlogView.objects.filter(blog__in=generated).count(), SIZES['views'])
+        self.assertEqual(Project.objects.filter(slug__startswith=PREFIX).count(), SIZES['projects'])
+        for blog in generated.annotate(view_rows=Count('view_records')):
+            self.assertEqual(blog.views, blog.view_rows)
+        self.assertTrue(RelatedBlog.objects.filter(blog__in=generated).exists())
+        self.assertIn('derived', steps)
+
+    def test_same_seed_same_rows(self):
+        self.generate()
+        first = self.generated_rows()
+        clear_generated(batch_size=50)
+        self.generate()
+        self.assertEqual(self.generated_rows(), first)
+
+        clear_generated(batch_size=50)
+        self.generate(seed=8)
+        self.assertNotEqual(self.generated_rows()['blogs'], first['blogs'])
+
+    def test_clear_removes_only_generated_rows(self):
+        real_blogs = Blog.objects.count()
+        self.generate()
+        BackgroundJob.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted = clear_generated(batch_size=5)
+
+        self.assertEqual((deleted['Blog'], deleted['MediaFile']), (SIZES['blogs'], SIZES['media']))
+        self.assertFalse(has_generated_rows())
+        self.assertEqual(Blog.objects.count(), real_blogs)
+        self.assertEqual(BackgroundJob.objects.filter(kind='related').count(), 1)
+
+    def test_generated_rows_are_not_replaced_silently(self):
+        self.generate()
+        with self.assertRaises(ValueError):
+            self.generate()
+        with self.assertRaises(CommandError):
+            call_command('generate_dataset', '--blogs', '1', stdout=StringIO())
+
+        out = StringIO()
+        call_command('generate_dataset', '--clear-only', stdout=out)
+        self.assertIn(f"{SIZES['blogs']} Blog", out.getvalue())
+        self.assertFalse(has_generated_rows())
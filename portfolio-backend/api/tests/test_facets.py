@@ -0,0 +1,58 @@
+"""
+Blog facets: counts over published posts, served from the cache until a
+save that can change them.
+"""
+
+from datetime import datetime
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from api.facets import get_blog_facets
+from api.models import Blog
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+@override_settings(CACHES=TEST_CACHES, API_RESPONSE_CACHE=False)
+class BlogFacetsTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        for slug, category, author, year, tags, published in (
+                ('a', 'Data', 'Ann', 2024, ['Python', 'Pandas'], True),
+                ('b', 'Data', 'Bob', 2025, ['Python'], True),
+                ('c', 'Web', 'Ann', 2025, ['Django'], True),
+                ('d', 'Web', 'Ann', 2025, ['Django'], False)):
+            Blog.objects.create(slug=slug, title=slug, content_markdown=slug, category=category, author=author,
+                                tags=tags, is_published=published,
+                                published_date=timezone.make_aware(datetime(year, 6, 1)))
+
+    def test_counts_published_posts(self):
+        facets = self.client.get(reverse('blog-facets')).json()
+        self.assertEqual(facets['total'], 3)
+        self.assertEqual(facets['categories'], [{'name': 'Data', 'count': 2}, {'name': 'Web', 'count': 1}])
+        self.assertEqual(facets['authors'], [{'name': 'Ann', 'count': 2}, {'name': 'Bob', 'count': 1}])
+        self.assertEqual(facets['years'], [{'year': 2025, 'count': 2}, {'year': 2024, 'count': 1}])
+        self.assertEqual(facets['tags'][0], {'name': 'Python', 'slug': 'python', 'count': 2})
+        self.assertEqual(len(facets['tags']), 3)
+
+    def test_cached_until_a_facet_field_changes(self):
+        get_blog_facets()
+        with self.assertNumQueries(0):
+            get_blog_facets()
+
+        # A counter save leaves the cached counts alone
+        Blog.objects.get(slug='a').save(update_fields=['views'])
+        with self.assertNumQueries(0):
+            get_blog_facets()
+
+        draft = Blog.objects.get(slug='d')
+        draft.is_published = True
+        draft.save()
+        self.assertEqual(get_blog_facets()['categories'], [{'name': 'Data', 'count': 2}, {'name': 'Web', 'count': 2}])
+
+    def test_delete_invalidates(self):
+        get_blog_facets()
+        Blog.objects.get(slug='c').delete()
+        self.assertEqual(get_blog_facets()['total'], 2)
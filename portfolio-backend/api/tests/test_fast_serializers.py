@@ -0,0 +1,84 @@
+"""
+The FastListMixin fast path (ValuesSerializer) must return exactly what the
+view's serializer returns: for every FastListMixin view in api/urls.py, with
+and without sparse fieldsets, and with JSON fields holding null or empty values.
+"""
+
+from django.db import models
+from django.db.models import Value
+from django.test import override_settings
+from django.urls import reverse
+
+from api.fast_serializers import FastListMixin
+from api.urls import urlpatterns
+
+from .helpers import DatasetTestCase
+
+# URL kwarg -> dataset handle
+URL_HANDLES = {'category': 'category'}
+
+
+def fast_list_views():
+    """(url name, view class) of every list endpoint served through FastListMixin."""
+    views = []
+    for pattern in urlpatterns:
+        view_class = getattr(pattern.callback, 'view_class', None)
+        if view_class is not None and issubclass(view_class, FastListMixin):
+            views.append((pattern.name, view_class))
+    return views
+
+
+class FastListSerializationTests(DatasetTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Put JSON null, [] and {} into every JSON column, on different rows
+        empty_values = [Value(None, models.JSONField()), [], {}]
+        for _, view_class in fast_list_views():
+            model = view_class.serializer_class.Meta.model
+            json_fields = [field.name for field in model._meta.concrete_fields if isinstance(field, models.JSONField)]
+            for number, pk in enumerate(model.objects.order_by('pk').values_list('pk', flat=True)[:6]):
+                model.objects.filter(pk=pk).update(**{name: empty_values[number % 3] for name in json_fields})
+
+    def url(self, name):
+        pattern = next(pattern for pattern in urlpatterns if pattern.name == name)
+        kwargs = {key: self.handles[URL_HANDLES[key]] for key in pattern.pattern.converters}
+        return reverse(name, kwargs=kwargs)
+
+    def get_both(self, url):
+        with override_settings(API_FAST_LIST_SERIALIZATION=True):
+            fast = self.client.get(url)
+        with override_settings(API_FAST_LIST_SERIALIZATION=False):
+            regular = self.client.get(url)
+        self.assertEqual(fast.status_code, 200, url)
+        self.assertEqual(regular.status_code, 200, url)
+        return fast.json(), regular.json()
+
+    def test_views_are_found(self):
+        names = {name for name, _ in fast_list_views()}
+        self.assertIn('blog-list', names)
+        self.assertIn('project-list', names)
+
+    def test_fast_path_matches_serializer(self):
+        for name, view_class in fast_list_views():
+            available = view_class.serializer_class().get_available_fields()
+            query_strings = [
+                '',
+                f"?fields={','.join(available[::2])}",
+                f"?exclude={','.join(available[1::2])}",
+                f'?fields={available[0]}',
+            ]
+            for query_string in query_strings:
+                with self.subTest(name, query=query_string):
+                    fast, regular = self.get_both(self.url(name) + query_string)
+                    self.assertTrue(regular, 'the dataset should fill every list')
+                    self.assertEqual(fast, regular)
+
+    def test_empty_json_values_are_covered(self):
+        fast, regular = self.get_both(reverse('project-list'))
+        values = [item['tags'] for item in regular]
+        self.assertIn(None, values)
+        self.assertIn([], values)
+        self.assertIn({}, values)
+        self.assertEqual(fast, regular)
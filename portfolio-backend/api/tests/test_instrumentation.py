@@ -0,0 +1,83 @@
+"""
+Request instrumentation: the Server-Timing header, the per-request
+`api.performance` log line, and the helpers that record into them.
+"""
+
+import re
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from api import instrumentation
+from api.models import Blog
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+def timing_entries(response):
+    """{name: params} from a Server-Timing header."""
+    entries = {}
+    for entry in re.split(r', (?=\w+;)', response['Server-Timing']):
+        name, _, params = entry.partition(';')
+        entries[name] = params
+    return entries
+
+
+@override_settings(CACHES=TEST_CACHES, API_RESPONSE_CACHE=False, API_INSTRUMENTATION=True)
+class ServerTimingTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        Blog.objects.create(slug='post', title='Post', content_markdown='# Post', is_published=True)
+
+    def test_header_reports_each_phase(self):
+        response = self.client.get(reverse('blog-detail', kwargs={'slug': 'post'}))
+        entries = timing_entries(response)
+
+        self.assertEqual(list(entries)[:3], ['total', 'db', 'serialize'])
+        self.assertIn('render', entries)
+        self.assertRegex(entries['total'], r'^dur=\d+\.\d\d$')
+        queries = int(re.search(r'desc="(\d+) queries"', entries['db']).group(1))
+        self.assertGreater(queries, 0)
+        self.assertEqual(entries['cache'], 'desc="0 hit, 1 miss"')  # the rendered markdown
+
+    def test_log_line(self):
+        with self.assertLogs('api.performance', 'INFO') as logs:
+            self.client.get(reverse('blog-list'))
+        fields = logs.records[0].performance
+        self.assertEqual((fields['view'], fields['method'], fields['status']), ('BlogListView', 'GET', 200))
+        self.assertGreater(fields['db_queries'], 0)
+        self.assertIn('view=BlogListView', logs.output[0])
+
+    @override_settings(API_RESPONSE_CACHE=True)
+    def test_cache_hits_resolve_the_view(self):
+        url = reverse('blog-list')
+        self.client.get(url)
+        with self.assertLogs('api.performance', 'INFO') as logs:
+            response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        fields = logs.records[0].performance
+        self.assertEqual((fields['view'], fields['response_cache'], fields['db_queries']), ('BlogListView', 'HIT', 0))
+        self.assertNotIn('serialize', timing_entries(response))
+
+
+class HelperTests(SimpleTestCase):
+
+    def test_helpers_record_into_the_current_request_only(self):
+        instrumentation.record_cache('response', True)  # no current request: ignored
+        with instrumentation.timed('compress'):
+            pass
+
+        metrics = instrumentation.RequestMetrics()
+        token = instrumentation.activate(metrics)
+        try:
+            instrumentation.record_cache('markdown', False)
+            instrumentation.record_cache('markdown', True)
+            with instrumentation.timed('compress'):
+                pass
+        finally:
+            instrumentation.deactivate(token)
+
+        self.assertEqual((metrics.cache_hits, metrics.cache_misses), (1, 1))
+        self.assertEqual(metrics.cache_lookups, {('markdown', False): 1, ('markdown', True): 1})
+        self.assertIn('compress_ms', metrics.as_dict())
+        self.assertIsNone(instrumentation.current())
@@ -0,0 +1,89 @@
+"""
+Background jobs: queue order, claiming, stale workers and recording results.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import jobs
+from api.models import BackgroundJob
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+@override_settings(CACHES=TEST_CACHES, API_JOB_STALE_AFTER=60)
+class BackgroundJobTests(QuietLogsMixin, TestCase):
+
+    def test_oldest_queued_job_is_claimed_once(self):
+        first = jobs.enqueue('related', {'blog_id': 1})
+        second = jobs.enqueue('related', {'blog_id': 2})
+
+        claimed = jobs.claim_next_job('worker-a')
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual((claimed.status, claimed.worker), ('running', 'worker-a'))
+        self.assertEqual(jobs.claim_next_job('worker-b').pk, second.pk)
+        self.assertIsNone(jobs.claim_next_job('worker-c'))
+
+    def test_unknown_kind_is_refused(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue('reindex')
+
+    def test_identical_queued_jobs_are_not_repeated(self):
+        job = jobs.enqueue_unless_queued('related', {'blog_id': 1})
+        self.assertEqual(jobs.enqueue_unless_queued('related', {'blog_id': 1}).pk, job.pk)
+        self.assertNotEqual(jobs.enqueue_unless_queued('related', {'blog_id': 2}).pk, job.pk)
+
+        jobs.claim_next_job('worker')
+        self.assertNotEqual(jobs.enqueue_unless_queued('related', {'blog_id': 1}).pk, job.pk)
+
+    def test_jobs_without_a_heartbeat_are_failed(self):
+        jobs.enqueue('related')
+        jobs.enqueue('related', {'blog_id': 1})
+        stale = jobs.claim_next_job('gone')
+        alive = jobs.claim_next_job('busy')
+        BackgroundJob.objects.filter(pk=stale.pk).update(heartbeat_at=timezone.now() - timedelta(seconds=61))
+
+        self.assertEqual(jobs.fail_stale_jobs(), 1)
+        stale.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual(stale.status, 'failed')
+        self.assertIn('60 seconds', stale.error)
+        self.assertEqual(alive.status, 'running')
+
+    def test_result_of_a_successful_job_is_recorded(self):
+        def handler(job, progress):
+            progress(0.5, 'Halfway')
+            return {'rows': 3}
+
+        jobs.enqueue('related')
+        with mock.patch.dict(jobs.HANDLERS, {'related': handler}):
+            job = jobs.run_job(jobs.claim_next_job('worker'))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.progress), ('succeeded', {'rows': 3}, 1.0))
+        self.assertIsNotNone(job.finished_at)
+
+    def run_failing(self, handler):
+        jobs.enqueue('related')
+        with mock.patch.dict(jobs.HANDLERS, {'related': handler}):
+            job = jobs.run_job(jobs.claim_next_job('worker'))
+        job.refresh_from_db()
+        return job
+
+    def test_job_failed_is_recorded_with_its_result(self):
+        def refuse(job, progress):
+            raise jobs.JobFailed('Nothing to restore', {'errors': ['empty']})
+
+        job = self.run_failing(refuse)
+        self.assertEqual((job.status, job.error, job.result), ('failed', 'Nothing to restore', {'errors': ['empty']}))
+
+    def test_unexpected_errors_are_logged_and_recorded(self):
+        def crash(job, progress):
+            raise KeyError('path')
+
+        with self.assertLogs('api.jobs', 'ERROR'):
+            job = self.run_failing(crash)
+        self.assertEqual((job.status, job.error, job.result), ('failed', "KeyError: 'path'", None))
@@ -0,0 +1,96 @@
+"""
+Live counters over Server-Sent Events: the message format, the hub that
+wakes subscribers only when a post's counters change, and the one-shot
+fallback the sync view sends.
+"""
+
+import asyncio
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api.live import KEEPALIVE_MESSAGE, Hub, counters_of
+from api.models import Blog
+from api.renderers import event_stream_message
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+def counters_message(**counters):
+    return event_stream_message(counters, 'counters')
+
+
+@override_settings(CACHES=TEST_CACHES, API_RESPONSE_CACHE=False, API_LIVE_FALLBACK_RETRY=60)
+class LiveCounterTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        self.blog = Blog.objects.create(slug='post', title='Post', content_markdown='x', is_published=True,
+                                        views=10, likes=2, comments_count=1)
+
+    def test_message_format(self):
+        self.assertEqual(event_stream_message({'views': 3}, event='counters', retry=5000),
+                         b'retry: 5000\nevent: counters\ndata: {"views":3}\n\n')
+
+    def test_sync_view_sends_the_counters_once(self):
+        response = self.client.get(reverse('blog-live', kwargs={'slug': 'post'}), HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertEqual(response.content,
+                         b'retry: 60000\nevent: counters\ndata: {"views":10,"likes":2,"comments_count":1}\n\n')
+        self.assertEqual(self.client.get(reverse('blog-live', kwargs={'slug': 'nope'})).status_code, 404)
+
+    def test_subscribers_are_woken_only_by_changes(self):
+        async def scenario():
+            hub = Hub(interval=60, keepalive=60)
+            first, second = hub.stream('post', {'views': 1}), hub.stream('post', {'views': 1})
+            messages = [await first.__anext__(), await second.__anext__()]
+
+            waiting = [asyncio.ensure_future(stream.__anext__()) for stream in (first, second)]
+            hub.publish('post', {'views': 1})  # unchanged: nobody wakes
+            hub.publish('other', {'views': 5})  # nobody subscribed
+            await asyncio.sleep(0.01)
+            unchanged = not any(task.done() for task in waiting)
+
+            hub.publish('post', {'views': 2})
+            messages += [await task for task in waiting]
+
+            await first.aclose()
+            subscribers = dict(hub.subscribers)
+            await second.aclose()
+            hub.task.cancel()
+            return messages, unchanged, subscribers, hub.subscribers
+
+        messages, unchanged, subscribers, remaining = asyncio.run(scenario())
+        self.assertEqual(messages, [counters_message(views=1)] * 2 + [counters_message(views=2)] * 2)
+        self.assertTrue(unchanged)
+        self.assertEqual(subscribers, {'post': 1})
+        self.assertEqual(remaining, {})
+
+    def test_keepalive(self):
+        async def scenario():
+            hub = Hub(interval=60, keepalive=0.01)
+            stream = hub.stream('post', {'views': 1})
+            messages = [await stream.__anext__(), await stream.__anext__()]
+            await stream.aclose()
+            hub.task.cancel()
+            return messages
+
+        self.assertEqual(asyncio.run(scenario()), [counters_message(views=1), KEEPALIVE_MESSAGE])
+
+    def test_poll_reads_changes_from_the_database(self):
+        async def scenario():
+            hub = Hub(interval=60, keepalive=60)
+            stream = hub.stream('post', counters_of(self.blog))
+            await stream.__anext__()
+            waiting = asyncio.ensure_future(stream.__anext__())
+
+            await Blog.objects.filter(slug='post').aupdate(likes=3)
+            await hub.poll()
+            message = await waiting
+            await stream.aclose()
+            hub.task.cancel()
+            return message
+
+        # Driven from this thread so the async ORM's queries run here, on the test connection
+        self.assertEqual(async_to_sync(scenario)(), counters_message(views=10, likes=3, comments_count=1))
@@ -0,0 +1,101 @@
+"""
+Memory tracking: snapshots, the growth report that points at the leaking
+line, pruning that keeps the baseline, and the command and admin page.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import tracemalloc
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api import memory
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+class MemoryTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        settings_override = override_settings(
+            CACHES=TEST_CACHES, API_MEMORY_DIR=temp_dir, API_TRACEMALLOC=True, API_MEMORY_SNAPSHOTS_KEEP=12,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(5)
+            self.addCleanup(tracemalloc.stop)
+        self.leak = []
+
+    def grow(self):
+        self.leak.extend(bytes(1000) for _ in range(2000))  # about 2 MB from this line
+
+    def test_growth_points_at_the_allocating_line(self):
+        memory.take_snapshot(reason='start')
+        self.grow()
+        memory.take_snapshot(reason='requested')
+
+        [report] = memory.worker_reports(limit=5)
+        self.assertEqual(report['pid'], os.getpid())
+        self.assertTrue(report['alive'])
+        self.assertEqual([meta['reason'] for meta in report['snapshots']], ['start', 'requested'])
+        self.assertGreater(report['traced_growth'], 1_000_000)
+        self.assertIn('test_memory.py', report['growth'][0]['site'])
+        self.assertGreater(report['growth'][0]['size_diff'], 1_000_000)
+
+    @override_settings(API_MEMORY_SNAPSHOTS_KEEP=2)
+    def test_pruning_keeps_the_baseline(self):
+        reasons = ['start', 'interval', 'interval', 'requested']
+        for reason in reasons:
+            memory.take_snapshot(reason=reason)
+        snapshots = memory.list_snapshots(os.getpid())
+        self.assertEqual([meta['reason'] for meta in snapshots], ['start', 'interval', 'requested'])
+        self.assertTrue(all(os.path.exists(meta['path']) for meta in snapshots))
+
+    def test_requests_and_clearing(self):
+        self.assertEqual(memory._requested_at(), 0.0)
+        memory.request_snapshots()
+        self.assertGreater(memory._requested_at(), 0.0)
+
+        memory.take_snapshot()
+        memory.clear_snapshots()
+        self.assertEqual(memory.list_workers(), [])
+
+    @override_settings(API_TRACEMALLOC=False)
+    def test_monitor_is_off_by_default(self):
+        self.assertFalse(memory.start_worker_monitor())
+        self.assertEqual(memory.list_workers(), [])
+
+    def test_command(self):
+        with self.assertRaises(CommandError):
+            call_command('memory_report', stdout=StringIO())
+
+        memory.take_snapshot(reason='start')
+        self.grow()
+        memory.take_snapshot(reason='interval')
+        out = StringIO()
+        call_command('memory_report', '--json', '--limit', '3', stdout=out)
+        [report] = json.loads(out.getvalue())
+        self.assertEqual(len(report['growth']), 3)
+
+        out = StringIO()
+        call_command('memory_report', stdout=out)
+        self.assertIn(f'Worker {os.getpid()} (running), 2 snapshot(s)', out.getvalue())
+
+    def test_admin_page(self):
+        memory.take_snapshot(reason='start')
+        self.client.force_login(get_user_model().objects.create_superuser('admin', 'a@example.com', 'password'))
+        url = reverse('admin:api_memoryreport_changelist')
+
+        self.assertContains(self.client.get(url), str(os.getpid()))
+        self.client.post(url, {'clear': '1'})
+        self.assertEqual(memory.list_workers(), [])
@@ -0,0 +1,69 @@
+"""
+Prometheus metrics: who may scrape them, and the request, engagement and
+trending backlog figures they report.
+"""
+
+from unittest import skipUnless
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api import metrics
+from api.models import Blog
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+@override_settings(
+    CACHES=TEST_CACHES, API_RESPONSE_CACHE=False, API_INSTRUMENTATION=True, API_METRICS=True,
+    API_METRICS_TOKEN='', API_METRICS_ALLOWED_IPS=['127.0.0.1', '::1'],
+)
+@skipUnless(metrics.prometheus_client, 'prometheus_client is not installed')
+class MetricsTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        self.blog = Blog.objects.create(slug='post', title='Post', content_markdown='x', is_published=True)
+        self.url = reverse('metrics')
+
+    def scrape(self, address='127.0.0.1', **headers):
+        return self.client.get(self.url, REMOTE_ADDR=address, **headers)
+
+    def sample(self, name, **labels):
+        return metrics.prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_loopback_is_served(self):
+        response = self.scrape()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'api_trending_pending_events', response.content)
+
+    def test_other_addresses_are_refused(self):
+        self.assertEqual(self.scrape('172.18.0.5').status_code, 403)
+        self.assertEqual(self.scrape('203.0.113.9', HTTP_X_FORWARDED_FOR='127.0.0.1').status_code, 403)
+
+    @override_settings(API_METRICS_TOKEN='secret', API_METRICS_ALLOWED_IPS=['10.0.0.0/8'])
+    def test_token_and_allowed_networks(self):
+        self.assertEqual(self.scrape('172.18.0.5', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+        self.assertEqual(self.scrape('172.18.0.5', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(self.scrape('10.1.2.3').status_code, 200)
+        self.assertEqual(self.scrape('127.0.0.1').status_code, 403)
+
+    @override_settings(API_METRICS=False)
+    def test_disabled(self):
+        self.assertEqual(self.scrape().status_code, 503)
+
+    def test_requests_and_views_are_counted(self):
+        route = 'api/blog-posts/<slug:slug>/increment-view/'
+        requests_before = self.sample('api_requests_total', route=route, method='POST', status='200')
+        views_before = self.sample('api_engagement_events_total', event='view')
+
+        url = reverse('blog-increment-view', kwargs={'slug': self.blog.slug})
+        self.client.post(url, {'fingerprint': 'device-1'}, content_type='application/json')
+        self.client.post(url, {'fingerprint': 'device-1'}, content_type='application/json')  # same device, same day
+
+        self.assertEqual(self.sample('api_requests_total', route=route, method='POST', status='200'), requests_before + 2)
+        self.assertEqual(self.sample('api_engagement_events_total', event='view'), views_before + 1)
+
+    def test_trending_backlog(self):
+        self.client.post(reverse('blog-increment-view', kwargs={'slug': self.blog.slug}),
+                         {'fingerprint': 'device-1'}, content_type='application/json')
+        self.assertIn(b'api_trending_pending_events{event="view"} 1.0', self.scrape().content)
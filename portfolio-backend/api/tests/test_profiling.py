@@ -0,0 +1,93 @@
+"""
+On-demand profiling: only staff requests that ask are profiled, profiles
+are saved in both formats, listed, downloadable by staff and pruned.
+"""
+
+import json
+import pstats
+import shutil
+import tempfile
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api import profiling
+from api.models import Blog
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+class ProfilingTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        settings_override = override_settings(
+            CACHES=TEST_CACHES, API_RESPONSE_CACHE=False, API_PROFILING=True,
+            API_PROFILE_DIR=temp_dir, API_PROFILE_KEEP=50,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        Blog.objects.create(slug='post', title='Post', content_markdown='x', is_published=True)
+        self.staff = get_user_model().objects.create_user('staff', password='password', is_staff=True)
+        self.url = reverse('blog-list')
+
+    def test_anonymous_and_plain_requests_are_not_profiled(self):
+        self.assertFalse(self.client.get(self.url, {'_profile': 'cprofile'}).has_header('X-Profile'))
+        self.client.force_login(self.staff)
+        self.assertFalse(self.client.get(self.url).has_header('X-Profile'))
+        self.assertFalse(self.client.get(self.url, {'_profile': 'bogus'}).has_header('X-Profile'))
+        self.assertEqual(profiling.list_profiles(), [])
+
+    def test_cprofile(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, {'_profile': 'cprofile'})
+        self.assertEqual(response.status_code, 200)
+
+        [meta] = profiling.list_profiles()
+        self.assertEqual(response['X-Profile'],
+                         reverse('admin-request-profile-download', kwargs={'name': meta['name']}))
+        self.assertEqual((meta['mode'], meta['path'], meta['status'], meta['user']),
+                         ('cprofile', f'{self.url}?_profile=cprofile', 200, 'staff'))
+        stats = pstats.Stats(str(profiling.profile_path(meta['name'])))
+        self.assertGreater(stats.total_calls, 0)
+
+    def test_sampling_via_header(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, HTTP_X_PROFILE='sampling')
+
+        download = self.client.get(response['X-Profile'])
+        speedscope = json.loads(b''.join(download.streaming_content))
+        self.assertEqual(speedscope['profiles'][0]['type'], 'sampled')
+        self.assertEqual(len(speedscope['profiles'][0]['samples']), len(speedscope['profiles'][0]['weights']))
+
+    def test_sampling_profiler_sees_the_running_function(self):
+        def busy():
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+
+        _, data = profiling.profile_call('sampling', 'busy', busy)
+        frames = {frame['name'] for frame in json.loads(data)['shared']['frames']}
+        self.assertIn('busy', frames)
+
+    def test_download_needs_staff(self):
+        self.client.force_login(self.staff)
+        url = self.client.get(self.url, {'_profile': '1'})['X-Profile']
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 302)  # to the admin login
+
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        missing = reverse('admin-request-profile-download', kwargs={'name': '..%2Fsettings.py'})
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_old_profiles_are_pruned(self):
+        self.client.force_login(self.staff)
+        with override_settings(API_PROFILE_KEEP=2):
+            names = [self.client.get(self.url, {'_profile': '1'})['X-Profile'] for _ in range(3)]
+        self.assertEqual(len(profiling.list_profiles()), 2)
+        self.assertEqual(self.client.get(names[-1]).status_code, 200)
@@ -0,0 +1,190 @@
+"""
+Query-count regression tests.
+
+Every URL in api/urls.py and every admin changelist is requested against the
+synthetic dataset (see dataset.py) with cold caches, and must stay within its
+query budget. The async engagement views (api/async_views.py) are requested
+the same way through AsyncClient. The budgets are upper bounds for that dataset; a view that
+starts querying per row overruns them by at least a dozen queries.
+"""
+
+from asgiref.sync import async_to_sync
+from django.contrib import admin
+from django.test import override_settings
+from django.urls import reverse
+
+from api.urls import urlpatterns
+
+from .helpers import DatasetTestCase
+
+# (url name, method, url kwargs from the dataset handles, request body, query budget)
+ENDPOINTS = [
+    ('health-check', 'get', {}, None, 0),
+    ('metrics', 'get', {}, None, 3),
+    ('api-index', 'get', {}, None, 0),
+    ('admin-portfolio-export', 'post', {}, None, 3),
+    ('admin-portfolio-import', 'get', {}, None, 2),
+    ('admin-job-detail', 'get', {'pk': 'job_pk'}, None, 6),
+    ('admin-job-status', 'get', {'pk': 'job_pk'}, None, 3),
+    ('admin-job-download', 'get', {'pk': 'job_pk'}, None, 3),
+    ('admin-request-profile-download', 'get', {'name': 'profile_name'}, None, 2),
+    ('education-list', 'get', {}, None, 1),
+    ('education-detail', 'get', {'pk': 'education_pk'}, None, 1),
+    ('experience-list', 'get', {}, None, 1),
+    ('experience-detail', 'get', {'pk': 'experience_pk'}, None, 1),
+    ('project-list', 'get', {}, None, 1),
+    ('project-detail', 'get', {'slug': 'project_slug'}, None, 1),
+    ('research-list', 'get', {}, None, 1),
+    ('research-detail', 'get', {'slug': 'research_slug'}, None, 1),
+    ('research-icons-list', 'get', {}, None, 1),
+    ('home-data', 'get', {}, None, 5),
+    ('blogs-data', 'get', {}, None, 1),
+    ('blog-settings', 'get', {}, None, 1),
+    ('blog-list', 'get', {}, None, 1),
+    ('blog-detail', 'get', {'slug': 'blog_slug'}, None, 2),
+    ('trending-blogs', 'get', {}, None, 1),
+    ('featured-blogs', 'get', {}, None, 1),
+    ('blogs-by-category', 'get', {'category': 'category'}, None, 1),
+    ('blog-facets', 'get', {}, None, 5),
+    ('blog-increment-view', 'post', {'slug': 'blog_slug'}, {'fingerprint': 'fp-new'}, 6),
+    ('blog-update-duration', 'post', {'slug': 'blog_slug'}, {'fingerprint': 'fp-0-0', 'duration': 30}, 4),
+    ('blog-view-stats', 'get', {'slug': 'blog_slug'}, None, 6),
+    ('blog-toggle-like', 'post', {'slug': 'blog_slug'}, {'fingerprint': 'fp-new', 'action': 'like'}, 6),
+    ('blog-live', 'get', {'slug': 'blog_slug'}, None, 1),
+    ('blog-comment-create', 'post', {'slug': 'blog_slug'},
+     {'author_name': 'New reader', 'author_email': 'new@example.com', 'comment_text': 'Nice post'}, 5),
+    ('blog-comments-list', 'get', {'slug': 'blog_slug'}, None, 2),
+    ('search', 'get', {}, None, 1),
+    ('suggest', 'get', {}, None, 4),
+    ('suggest-stats', 'get', {}, None, 0),
+    ('tag-list', 'get', {}, None, 4),
+    ('tag-detail', 'get', {'slug': 'tag_slug'}, None, 4),
+    ('newsletter-subscribe', 'post', {}, {'email': 'new-subscriber@example.com'}, 3),
+    ('media-file-list', 'get', {}, None, 1),
+    ('media-file-detail', 'get', {'slug': 'media_slug'}, None, 1),
+    ('serve-media-file', 'get', {'slug': 'media_slug'}, None, 1),
+]
+
+# Query strings for endpoints that need one to do real work
+QUERY_STRINGS = {
+    'blog-view-stats': '?fingerprint=fp-0-0',
+    'search': '?q=django',
+    'suggest': '?q=pos',
+}
+
+# Budgets of the async twins of the engagement endpoints (same requests as ENDPOINTS)
+ASYNC_ENDPOINTS = {
+    'blog-increment-view': 6,
+    'blog-update-duration': 2,
+    'blog-view-stats': 1,
+    'blog-toggle-like': 6,
+    'blog-live': 1,
+}
+
+# Queries per admin changelist (includes the session and user lookups)
+ADMIN_CHANGELISTS = {
+    'api.educationentry': 9,
+    'api.experienceentry': 10,
+    'api.project': 9,
+    'api.researchpublication': 9,
+    'api.researchicon': 8,
+    'api.homedata': 9,
+    'api.blog': 9,
+    'api.blogcomment': 9,
+    'api.blogsdata': 9,
+    'api.blogsettings': 9,
+    'api.blogview': 9,
+    'api.bloglike': 9,
+    'api.mediafile': 8,
+    'api.backuprestore': 3,
+    'api.backgroundjob': 8,
+    'api.requestprofile': 2,
+    'api.memoryreport': 2,
+    'api.newslettersubscriber': 8,
+    'auth.user': 9,
+    'auth.group': 8,
+}
+
+# Queries for the delete_selected confirmation page over every row
+ADMIN_DELETE_CONFIRMATIONS = {
+    'api.blogcomment': 11,
+    'api.blogview': 11,
+    'api.bloglike': 11,
+}
+
+
+class EndpointQueryCountTests(DatasetTestCase):
+
+    def test_every_url_has_a_budget(self):
+        names = {pattern.name for pattern in urlpatterns}
+        self.assertEqual(names, {name for name, *_ in ENDPOINTS})
+
+    def test_endpoint_query_counts(self):
+        staff_client = self.client_class()
+        staff_client.force_login(self.staff)
+        for name, method, kwargs, data, budget in ENDPOINTS:
+            with self.subTest(name):
+                self.setUp()
+                url = reverse(name, kwargs={key: self.handles[handle] for key, handle in kwargs.items()})
+                url += QUERY_STRINGS.get(name, '')
+                # Admin views run as staff (their budgets include the session and user lookups)
+                client = staff_client if name.startswith('admin-') else self.client
+                request = getattr(client, method)
+                with self.assertQueryBudget(f'endpoint:{name}', budget):
+                    if data is None:
+                        response = request(url)
+                    else:
+                        response = request(url, data, content_type='application/json')
+                self.assertLess(response.status_code, 400, f'{name} returned {response.status_code}')
+
+
+@override_settings(ROOT_URLCONF='api.tests.async_urls')
+class AsyncEngagementQueryCountTests(DatasetTestCase):
+
+    def test_async_endpoint_query_counts(self):
+        # Driven from this thread so the async ORM's queries run here, on the test connection
+        for name, method, kwargs, data, _ in ENDPOINTS:
+            if name not in ASYNC_ENDPOINTS:
+                continue
+            with self.subTest(name):
+                self.setUp()
+                url = reverse(name, kwargs={key: self.handles[handle] for key, handle in kwargs.items()})
+                url += QUERY_STRINGS.get(name, '')
+                request = async_to_sync(getattr(self.async_client, method))
+                with self.assertQueryBudget(f'async-endpoint:{name}', ASYNC_ENDPOINTS[name]):
+                    if data is None:
+                        response = request(url)
+                    else:
+                        response = request(url, data, content_type='application/json')
+                self.assertLess(response.status_code, 400, f'{name} returned {response.status_code}')
+
+
+class AdminChangelistQueryCountTests(DatasetTestCase):
+
+    def test_every_changelist_has_a_budget(self):
+        registered = {model._meta.label_lower for model in admin.site._registry}
+        self.assertEqual(registered, set(ADMIN_CHANGELISTS))
+
+    def test_changelist_query_counts(self):
+        self.client.force_login(self.staff)
+        for model, model_admin in admin.site._registry.items():
+            label = model._meta.label_lower
+            with self.subTest(label):
+                url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+                with self.assertQueryBudget(f'admin:{label}', ADMIN_CHANGELISTS[label]):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200, f'{label} returned {response.status_code}')
+
+    def test_delete_confirmation_query_counts(self):
+        # The confirmation lists every selected object by its __str__
+        self.client.force_login(self.staff)
+        for model, model_admin in admin.site._registry.items():
+            label = model._meta.label_lower
+            if label not in ADMIN_DELETE_CONFIRMATIONS:
+                continue
+            with self.subTest(label):
+                url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+                data = {'action': 'delete_selected', '_selected_action': list(model.objects.values_list('pk', flat=True))}
+                with self.assertQueryBudget(f'admin-delete:{label}', ADMIN_DELETE_CONFIRMATIONS[label]):
+                    response = self.client.post(url, data)
+                self.assertTemplateUsed(response, 'admin/delete_selected_confirmation.html')
@@ -0,0 +1,90 @@
+"""
+Related posts: TF-IDF ranking and the background update after a save.
+"""
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api import related
+from api.jobs import run_worker
+from api.models import BackgroundJob, Blog, RelatedBlog
+from api.related import rebuild_related_blogs, update_related_for_blog
+from api.response_cache import get_version
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+def neighbours(blog):
+    return list(RelatedBlog.objects.filter(blog=blog).order_by('rank').values_list('related__slug', flat=True))
+
+
+@override_settings(CACHES=TEST_CACHES, RELATED_BLOGS_COUNT=2, RELATED_BLOGS_UPDATE_ON_SAVE=True)
+class RelatedBlogsTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        def post(slug, title, text, is_published=True, **extra):
+            return Blog.objects.create(slug=slug, title=title, content_markdown=text, is_published=is_published, **extra)
+
+        self.orm = post('orm', 'Django ORM queries', 'select_related prefetch queryset database index', tags=['Django'])
+        self.orm_more = post('orm-more', 'Faster Django queries', 'queryset index database prefetch', tags=['Django'])
+        self.cache = post('cache', 'Caching responses', 'redis cache database expiry', tags=['Caching'])
+        self.garden = post('garden', 'Growing tomatoes', 'soil water sunlight seedlings')
+        self.draft = post('draft', 'Django ORM draft', 'queryset database index', is_published=False)
+
+    def test_most_similar_post_ranks_first(self):
+        rebuild_related_blogs()
+
+        self.assertEqual(neighbours(self.orm), ['orm-more', 'cache'])
+        self.assertEqual(neighbours(self.orm_more)[0], 'orm')
+
+    def test_posts_without_shared_terms_are_not_related(self):
+        rebuild_related_blogs()
+
+        self.assertEqual(neighbours(self.garden), [])
+        self.assertNotIn('garden', neighbours(self.cache))
+
+    def test_unpublished_posts_are_left_out(self):
+        rebuild_related_blogs()
+
+        self.assertEqual(neighbours(self.draft), [])
+        self.assertFalse(RelatedBlog.objects.filter(related=self.draft).exists())
+
+    def test_save_queues_an_update_that_invalidates_responses(self):
+        rebuild_related_blogs()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.garden.title = 'Database index tuning'
+            self.garden.content_markdown = 'queryset database index prefetch'
+            self.garden.save()
+            self.garden.save()
+        self.assertEqual(BackgroundJob.objects.filter(kind='related', status='queued').count(), 1)
+        self.assertEqual(neighbours(self.garden), [])
+
+        garden_path = reverse('blog-detail', kwargs={'slug': 'garden'})
+        draft_path = reverse('blog-detail', kwargs={'slug': 'draft'})
+        versions = get_version(), get_version(garden_path), get_version(draft_path)
+        run_worker(once=True)
+        self.assertEqual(BackgroundJob.objects.get(kind='related').status, 'succeeded')
+        self.assertIn('orm', neighbours(self.garden))
+        self.assertIn('garden', neighbours(self.orm_more))
+        # Only the detail responses whose `related` list changed are invalidated
+        self.assertEqual(get_version(), versions[0])
+        self.assertNotEqual(get_version(garden_path), versions[1])
+        self.assertEqual(get_version(draft_path), versions[2])
+
+    def test_update_reads_only_the_changed_post(self):
+        rebuild_related_blogs()
+        Blog.objects.filter(pk=self.garden.pk).update(content_markdown='queryset database index prefetch')
+        self.garden.refresh_from_db()
+        self.garden.save()
+
+        with mock.patch('api.related.term_counts', wraps=related.term_counts) as term_counts:
+            update_related_for_blog(self.garden.pk)
+        self.assertEqual([call.args[0].pk for call in term_counts.call_args_list], [self.garden.pk])
+
+        # Other vectors keep their IDF until the next full rebuild, so only membership is compared
+        posts = (self.orm, self.orm_more, self.cache, self.garden)
+        incremental = {blog.slug: set(neighbours(blog)) for blog in posts}
+        rebuild_related_blogs()
+        self.assertEqual(incremental, {blog.slug: set(neighbours(blog)) for blog in posts})
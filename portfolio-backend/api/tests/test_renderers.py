@@ -0,0 +1,76 @@
+"""
+JSON renderer and parser: byte-for-byte the same output as DRF's for the
+types DRF encodes itself, and the benchmark command comparing them on the
+real payloads.
+"""
+
+import json
+import uuid
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONParser, FastJSONRenderer
+
+from .helpers import DatasetTestCase
+
+TIMING = {'number': 1, 'repeat': 1, 'min': 1e-5, 'median': 1e-5, 'mean': 1e-5, 'stdev': 0.0}
+
+
+class FastJSONTests(SimpleTestCase):
+
+    def assertSameAsDRF(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_types_drf_encodes(self):
+        self.assertSameAsDRF({
+            'aware': datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=dt_timezone.utc),
+            'naive': datetime(2025, 1, 2, 3, 4, 5),
+            'date': date(2025, 1, 2),
+            'time': time(3, 4, 5, 678901),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'decimal': Decimal('12.50'),
+            'lazy': gettext_lazy('Blog Post'),
+            'set': {1},
+            'text': 'caf\u00e9 \u2028 line',
+            'big': 2 ** 70,
+            7: 'integer key',
+        })
+
+    def test_indented_output_uses_the_stdlib(self):
+        renderer = FastJSONRenderer()
+        self.assertEqual(renderer.render({'a': [1]}, 'application/json; indent=2'),
+                         JSONRenderer().render({'a': [1]}, 'application/json; indent=2'))
+
+    def test_parser(self):
+        body = '{"title": "caf\u00e9", "n": 1.5}'.encode()
+        self.assertEqual(FastJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"title":'))
+
+        latin1 = '{"title": "caf\u00e9"}'.encode('latin-1')
+        self.assertEqual(FastJSONParser().parse(BytesIO(latin1), parser_context={'encoding': 'latin-1'}),
+                         {'title': 'caf\u00e9'})
+
+
+class RendererBenchmarkTests(DatasetTestCase):
+
+    @override_settings(API_RESPONSE_CACHE=True)
+    def test_benchmark_renders_every_payload(self):
+        out = StringIO()
+        with mock.patch('api.management.commands.benchmark_json_renderers.measure', return_value=TIMING):
+            call_command('benchmark_json_renderers', '--json', '--blogs', '1', stdout=out)
+
+        rows = json.loads(out.getvalue())
+        self.assertEqual(len(rows), 10)
+        for row in rows:
+            self.assertGreater(row['fast']['bytes'], 0)
+            self.assertGreater(row['stdlib']['bytes'], 0)
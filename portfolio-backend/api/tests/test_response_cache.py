@@ -0,0 +1,99 @@
+"""
+Response cache: MISS, HIT and STALE, per-path invalidation, the
+normalised cache key and the choice of content coding.
+"""
+
+import gzip
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api import response_cache
+from api.middleware import ResponseCacheMiddleware
+from api.models import Blog
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+CACHE_SETTINGS = {
+    'CACHES': TEST_CACHES,
+    'API_RESPONSE_CACHE': True,
+    'API_RESPONSE_CACHE_SOFT_TTL': 60,
+    'API_RESPONSE_CACHE_TIMEOUT': 300,
+}
+
+
+@override_settings(**CACHE_SETTINGS)
+class ResponseCacheTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        for i in range(5):
+            Blog.objects.create(slug=f'post-{i}', title=f'Post {i}', excerpt='An excerpt long enough to compress. ' * 3,
+                                content_markdown='x', is_published=True)
+        response_cache.cache.clear()
+        self.url = reverse('blog-list')
+
+    def get(self, url=None, encoding='gzip', **params):
+        return self.client.get(url or self.url, params, HTTP_ACCEPT_ENCODING=encoding)
+
+    def test_miss_then_hit(self):
+        first = self.get()
+        second = self.get()
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.content, second.content)
+        self.assertIn('max-age=60', second['Cache-Control'])
+        self.assertIn('Accept-Encoding', second['Vary'])
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        self.get()
+        with override_settings(API_RESPONSE_CACHE_SOFT_TTL=0), \
+                mock.patch.object(ResponseCacheMiddleware, 'refresh_in_background') as refresh:
+            stale = self.get()
+            again = self.get()
+        self.assertEqual(stale['X-Cache'], 'STALE')
+        refresh.assert_called_once()  # the lock keeps the second request from refreshing too
+        self.assertEqual(again['X-Cache'], 'STALE')
+
+    def test_content_changes_invalidate(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            Blog.objects.get(slug='post-0').save()
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+
+    def test_path_invalidation_leaves_other_paths(self):
+        trending = reverse('trending-blogs')
+        self.get()
+        self.get(trending)
+        response_cache.bump_version(trending)
+        self.assertEqual(self.get(trending)['X-Cache'], 'MISS')
+        self.assertEqual(self.get()['X-Cache'], 'HIT')
+
+    def test_key_uses_only_listed_parameters(self):
+        self.get(fields='title,slug')
+        self.assertEqual(self.get(fields='slug, title,slug', utm_source='mail')['X-Cache'], 'HIT')
+        self.assertEqual(self.get(fields='slug')['X-Cache'], 'MISS')
+        self.assertEqual(self.get(utm_source='mail')['X-Cache'], 'MISS')
+        self.assertEqual(self.get(page='2')['X-Cache'], 'HIT')
+
+    def test_errors_are_not_cached(self):
+        self.get(fields='nope')
+        self.assertNotIn('X-Cache', self.get(fields='nope'))
+
+    def test_encoding_choice(self):
+        identity = self.get(encoding='')
+        self.assertFalse(identity.has_header('Content-Encoding'))
+
+        gzipped = self.get(encoding='br;q=0, gzip;q=0.5')
+        self.assertEqual(gzipped['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(gzipped.content), identity.content)
+        self.assertEqual(gzipped['Content-Length'], str(len(gzipped.content)))
+
+    def test_choose_encoding(self):
+        best = response_cache.supported_encodings()[0]
+        self.assertEqual(response_cache.choose_encoding('gzip, br'), best)
+        self.assertEqual(response_cache.choose_encoding('*'), best)
+        self.assertEqual(response_cache.choose_encoding('br;q=0, gzip'), 'gzip')
+        self.assertEqual(response_cache.choose_encoding('gzip;q=0'), 'identity')
+        self.assertEqual(response_cache.choose_encoding('deflate'), 'identity')
+        self.assertEqual(response_cache.choose_encoding('*;q=0'), 'identity')
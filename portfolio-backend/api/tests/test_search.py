@@ -0,0 +1,78 @@
+"""
+Full-text search: FTS5 ranking, prefixes and visibility, the icontains
+fallback for other databases, and the uncapped admin filter.
+"""
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api.models import Blog, Project
+from api.search import filter_matching, rebuild_search_index, search
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+@override_settings(CACHES=TEST_CACHES, API_RESPONSE_CACHE=False)
+class SearchTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        Blog.objects.create(slug='in-title', title='Caching with Redis', content_markdown='Notes on expiry.',
+                            is_published=True)
+        Blog.objects.create(slug='in-body', title='Weekly notes', content_markdown='A word on redis and queues.',
+                            is_published=True)
+        Blog.objects.create(slug='draft', title='Redis draft', content_markdown='Unfinished.', is_published=False)
+        Project.objects.create(slug='cache-proxy', title='Redis cache proxy', short_description='A proxy.',
+                               organization='Acme', start_date='2024-01-01', is_visible=True)
+        rebuild_search_index()
+
+    def slugs(self, results):
+        return [result['slug'] for result in results]
+
+    def test_title_matches_rank_first(self):
+        results = search('redis', kinds=['blog'])
+        self.assertEqual(self.slugs(results), ['in-title', 'in-body'])
+        self.assertEqual(results[0]['title_highlighted'], 'Caching with <mark>Redis</mark>')
+
+    def test_last_word_is_a_prefix(self):
+        self.assertEqual(self.slugs(search('redi', kinds=['blog'])), ['in-title', 'in-body'])
+        self.assertEqual(self.slugs(search('caching redi', kinds=['blog'])), ['in-title'])
+
+    def test_unpublished_posts_are_hidden_from_the_public(self):
+        self.assertNotIn('draft', self.slugs(search('redis')))
+        self.assertIn('draft', self.slugs(search('redis', public_only=False)))
+
+    def test_kinds_filter(self):
+        self.assertEqual(self.slugs(search('redis', kinds=['project'])), ['cache-proxy'])
+
+    def test_operators_in_input_are_ignored(self):
+        self.assertEqual(search('"redis" OR NEAR(', kinds=['blog']), search('redis or near', kinds=['blog']))
+        self.assertEqual(search('*** ---'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        blog = Blog.objects.create(slug='new', title='Memcached tips', content_markdown='x', is_published=True)
+        self.assertEqual(self.slugs(search('memcached')), ['new'])
+        blog.delete()
+        self.assertEqual(search('memcached'), [])
+
+    def test_fallback_without_fts(self):
+        with mock.patch('api.search.fts_available', return_value=False):
+            results = search('redis', kinds=['blog'])
+            self.assertEqual(sorted(self.slugs(results)), ['in-body', 'in-title'])
+            self.assertEqual({result['score'] for result in results}, {0.0})
+            self.assertEqual(filter_matching(Blog.objects.all(), 'redis').count(), 3)
+
+    def test_admin_filter_is_not_capped(self):
+        Blog.objects.bulk_create([
+            Blog(slug=f'bulk-{i}', title=f'Redis note {i}', content_markdown='x', is_published=True)
+            for i in range(1100)
+        ])
+        rebuild_search_index()
+        self.assertEqual(filter_matching(Blog.objects.all(), 'redis').count(), 1103)
+        self.assertEqual(filter_matching(Blog.objects.all(), 'redis', public_only=True).count(), 1102)
+
+    def test_endpoint(self):
+        response = self.client.get(reverse('search'), {'q': 'redis', 'type': 'blog'})
+        self.assertEqual(response.json()['count'], 2)
+        self.assertEqual(self.client.get(reverse('search')).status_code, 400)
@@ -0,0 +1,81 @@
+"""
+Static snapshots: a full export renders every public endpoint, an
+incremental one rewrites only the detail files that changed.
+"""
+
+import json
+from pathlib import Path
+
+from api.models import Blog, Project
+from api.snapshots import (
+    collection_paths,
+    current_version_dir,
+    detail_fingerprints,
+    export_snapshot,
+    load_manifest,
+    public_paths,
+)
+
+from .helpers import DatasetTestCase
+
+
+class SnapshotTests(DatasetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.root = Path(self.temp_dir) / 'snapshots' / self._testMethodName
+
+    def test_full_export_writes_every_public_path(self):
+        stats = export_snapshot(root=self.root)
+
+        manifest = load_manifest(current_version_dir(self.root))
+        self.assertEqual(stats['reused'], 0)
+        self.assertEqual(stats['skipped'], [])
+        self.assertEqual(set(manifest['files']), set(public_paths()))
+
+        detail = f"/api/projects/{self.handles['project_slug']}/"
+        body = (current_version_dir(self.root) / manifest['files'][detail]['file']).read_bytes()
+        self.assertEqual(json.loads(body), self.client.get(detail).json())
+
+    def test_incremental_export_rewrites_only_changed_details(self):
+        full = export_snapshot(root=self.root)
+        unchanged = export_snapshot(incremental=True, root=self.root)
+        self.assertEqual(unchanged['base'], full['version'])
+        self.assertEqual(unchanged['reused'], len(detail_fingerprints()))
+        self.assertEqual(unchanged['written'], len(collection_paths()))
+
+        project = Project.objects.get(slug=self.handles['project_slug'])
+        project.title = 'Renamed project'
+        project.save()
+        changed = export_snapshot(incremental=True, root=self.root)
+
+        self.assertEqual(changed['reused'], unchanged['reused'] - 1)
+        self.assertEqual(changed['written'], unchanged['written'] + 1)
+        manifest = load_manifest(current_version_dir(self.root))
+        detail = manifest['files'][f'/api/projects/{project.slug}/']
+        body = (current_version_dir(self.root) / detail['file']).read_bytes()
+        self.assertEqual(json.loads(body)['title'], 'Renamed project')
+
+    def test_counter_changes_rewrite_the_detail(self):
+        export_snapshot(root=self.root)
+        Blog.objects.filter(slug=self.handles['blog_slug']).update(views=12345, likes=678)
+        stats = export_snapshot(incremental=True, root=self.root)
+
+        self.assertEqual(stats['reused'], len(detail_fingerprints()) - 1)
+        manifest = load_manifest(current_version_dir(self.root))
+        detail = manifest['files'][f"/api/blog-posts/{self.handles['blog_slug']}/"]
+        body = json.loads((current_version_dir(self.root) / detail['file']).read_bytes())
+        self.assertEqual((body['views'], body['likes']), (12345, 678))
+
+    def test_unroutable_category_is_skipped(self):
+        Blog.objects.filter(slug=self.handles['blog_slug']).update(category='News/Updates')
+        with self.assertLogs('api.snapshots', 'WARNING'):
+            stats = export_snapshot(root=self.root)
+        self.assertEqual(stats['skipped'], ['/api/blogs/category/News/Updates/'])
+        self.assertIsNotNone(current_version_dir(self.root))
+
+    def test_old_versions_are_pruned(self):
+        for _ in range(3):
+            stats = export_snapshot(root=self.root, keep=2)
+        self.assertEqual(len(stats['pruned']), 1)
+        self.assertEqual(current_version_dir(self.root).name, stats['version'])
@@ -0,0 +1,51 @@
+"""
+Sparse fieldsets: ?fields= and ?exclude= select fields, unknown names are a 400.
+"""
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api.models import Blog
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+@override_settings(CACHES=TEST_CACHES, API_RESPONSE_CACHE=False)
+class SparseFieldsetTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        Blog.objects.create(slug='post', title='Post', excerpt='Short', content_markdown='# Post', is_published=True)
+        self.list_url = reverse('blog-list')
+        self.detail_url = reverse('blog-detail', kwargs={'slug': 'post'})
+
+    def test_fields_selects(self):
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url):
+                data = self.client.get(url, {'fields': 'slug, title,,'}).json()
+                item = data[0] if isinstance(data, list) else data
+                self.assertEqual(set(item), {'slug', 'title'})
+
+    def test_exclude_drops(self):
+        item = self.client.get(self.detail_url, {'exclude': 'content_markdown'}).json()
+        self.assertNotIn('content_markdown', item)
+        self.assertIn('title', item)
+
+    def test_fields_and_exclude_combine(self):
+        item = self.client.get(self.list_url, {'fields': 'slug,title', 'exclude': 'title'}).json()[0]
+        self.assertEqual(set(item), {'slug'})
+
+    def test_unknown_fields_are_a_400(self):
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url):
+                response = self.client.get(url, {'fields': 'title,nope'})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('Unknown field(s): nope.', response.json()['fields'][0])
+
+    def test_unknown_exclude_is_a_400(self):
+        response = self.client.get(self.list_url, {'exclude': 'nope', 'fields': 'bad'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'fields', 'exclude'})
+
+    def test_fields_of_other_serializers_are_unknown(self):
+        # content_markdown is on the detail serializer, not the list one
+        self.assertEqual(self.client.get(self.list_url, {'fields': 'content_markdown'}).status_code, 400)
@@ -0,0 +1,66 @@
+"""
+Suggestions: prefix matching and ranking, tag slugs, and rebuilding the
+in-memory index when content changes.
+"""
+
+from unittest import mock
+
+from django.contrib import admin
+from django.test import RequestFactory, TestCase, override_settings
+
+from api.models import Blog
+from api.suggest import suggest_index
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+@override_settings(CACHES=TEST_CACHES, SUGGEST_REFRESH_INTERVAL=0)
+class SuggestTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        Blog.objects.create(slug='pandas', title='Pandas tips', category='Data', tags=['Machine Learning'],
+                            content_markdown='x', is_published=True)
+        Blog.objects.create(slug='intro', title='An intro to pandas', tags=['machine learning'],
+                            content_markdown='x', is_published=True)
+        Blog.objects.create(slug='draft', title='Pandas draft', content_markdown='x', is_published=False)
+        suggest_index.__init__()
+
+    def labels(self, prefix, limit=10):
+        return [item['label'] for item in suggest_index.suggest(prefix, limit=limit)]
+
+    def test_matches_word_prefixes(self):
+        self.assertEqual(self.labels('pand'), ['Pandas tips', 'An intro to pandas'])
+        self.assertEqual(self.labels('  INTRO  '), ['An intro to pandas'])
+        self.assertEqual(self.labels('to pan'), ['An intro to pandas'])
+        self.assertEqual(self.labels('zzz'), [])
+        self.assertEqual(self.labels(''), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.labels('pand', limit=1)), 1)
+
+    @override_settings(SUGGEST_SCAN_LIMIT=1)
+    def test_label_start_matches_are_scanned_first(self):
+        # 'pandas' (inside 'An intro to pandas') sorts before 'pandas tips'
+        self.assertEqual(self.labels('pand'), ['Pandas tips'])
+
+    def test_tags_are_suggested_once_by_slug(self):
+        tags = [item for item in suggest_index.suggest('mach') if item['type'] == 'tag']
+        self.assertEqual(tags, [{'label': 'Machine Learning', 'type': 'tag', 'slug': 'machine-learning'}])
+
+    def test_unpublished_posts_are_not_suggested(self):
+        self.assertNotIn('Pandas draft', self.labels('pand'))
+
+    def test_saves_rebuild_the_index(self):
+        self.labels('pand')
+        Blog.objects.get(slug='pandas').delete()
+        Blog.objects.create(slug='polars', title='Polars vs pandas', content_markdown='x', is_published=True)
+        # Neither starts with the prefix, so the shorter label comes first
+        self.assertEqual(self.labels('pand'), ['Polars vs pandas', 'An intro to pandas'])
+
+    def test_bulk_publish_rebuilds_the_index(self):
+        self.labels('pand')
+        request = RequestFactory().post('/')
+        model_admin = admin.site._registry[Blog]
+        with mock.patch.object(model_admin, 'message_user'), self.captureOnCommitCallbacks(execute=True):
+            model_admin.publish_blogs(request, Blog.objects.filter(slug='draft'))
+        self.assertIn('Pandas draft', self.labels('pand'))
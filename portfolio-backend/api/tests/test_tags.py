@@ -0,0 +1,59 @@
+"""
+Tag index: links follow the `tags` JSON lists on save, counts cover only
+published/visible content, and a rebuild drops unused tags.
+"""
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api.models import Blog, BlogTag, Project, Tag
+from api.tags import clean_tag_names, rebuild_tag_index
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+
+@override_settings(CACHES=TEST_CACHES, API_RESPONSE_CACHE=False)
+class TagIndexTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        self.blog = Blog.objects.create(slug='a', title='A', content_markdown='a', is_published=True,
+                                        tags=['Machine Learning', 'Django'])
+        Blog.objects.create(slug='draft', title='Draft', content_markdown='d', is_published=False, tags=['Django'])
+        Project.objects.create(slug='p', title='P', short_description='p', tags=['django', 'Rust'])
+
+    def blog_tags(self, blog):
+        return set(BlogTag.objects.filter(blog=blog).values_list('tag__slug', flat=True))
+
+    def test_clean_tag_names(self):
+        self.assertEqual(clean_tag_names(['Machine Learning', ' machine learning ', '', 3, None, 'C++']),
+                         {'machine-learning': 'Machine Learning', 'c': 'C++'})
+
+    def test_saves_sync_the_links(self):
+        self.assertEqual(self.blog_tags(self.blog), {'machine-learning', 'django'})
+        self.assertEqual(Tag.objects.get(slug='django').name, 'Django')  # the first spelling seen
+
+        self.blog.tags = ['Django', 'Python']
+        self.blog.save()
+        self.assertEqual(self.blog_tags(self.blog), {'django', 'python'})
+
+    def test_list_counts_only_public_content(self):
+        tags = {tag['slug']: tag for tag in self.client.get(reverse('tag-list')).json()}
+        self.assertEqual(tags['django'], {'name': 'Django', 'slug': 'django', 'blogs': 1, 'projects': 1,
+                                          'research': 0, 'total': 2})
+        self.assertEqual(set(tags), {'django', 'machine-learning', 'rust'})
+
+    def test_detail(self):
+        body = self.client.get(reverse('tag-detail', kwargs={'slug': 'django'})).json()
+        self.assertEqual([blog['slug'] for blog in body['blogs']], ['a'])
+        self.assertEqual([project['slug'] for project in body['projects']], ['p'])
+        self.assertEqual(self.client.get(reverse('tag-detail', kwargs={'slug': 'nope'})).status_code, 404)
+
+    def test_rebuild_matches_the_json_lists(self):
+        # Bulk updates skip the signals; a rebuild catches up and drops unused tags
+        Blog.objects.filter(pk=self.blog.pk).update(tags=['Python'])
+        Project.objects.update(tags=[])
+        links = rebuild_tag_index()
+
+        self.assertEqual(links, 2)  # 'python' on the post, 'django' on the draft
+        self.assertEqual(self.blog_tags(self.blog), {'python'})
+        self.assertEqual(set(Tag.objects.values_list('slug', flat=True)), {'python', 'django'})
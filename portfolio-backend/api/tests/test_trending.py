@@ -0,0 +1,121 @@
+"""
+Trending scores: decay, incremental updates, unlikes and the trending list.
+"""
+
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from api.models import Blog, BlogLike, BlogView
+from api.trending import decay_factor, update_trending_scores
+from api.views import TrendingBlogsView
+
+from .helpers import TEST_CACHES, QuietLogsMixin
+
+HOUR = 3600
+
+
+@override_settings(
+    CACHES=TEST_CACHES, API_RESPONSE_CACHE=False,
+    TRENDING_HALF_LIFE_HOURS=10, TRENDING_WINDOW_DAYS=14,
+    TRENDING_VIEW_WEIGHT=1.0, TRENDING_LIKE_WEIGHT=3.0, TRENDING_SCORE_EPSILON=0.01,
+)
+class TrendingScoreTests(QuietLogsMixin, TestCase):
+
+    def setUp(self):
+        self.now = timezone.now().replace(minute=30, second=0, microsecond=0)
+        self.blog = Blog.objects.create(slug='a', title='A', content_markdown='a', is_published=True)
+        self.other = Blog.objects.create(slug='b', title='B', content_markdown='b', is_published=True)
+
+    def view(self, blog, at, fingerprint):
+        # viewed_at is auto_now_add, so backdate it afterwards
+        record = BlogView.objects.create(blog=blog, fingerprint=fingerprint)
+        BlogView.objects.filter(pk=record.pk).update(viewed_at=at)
+
+    def like(self, blog, at, fingerprint):
+        record = BlogLike.objects.create(blog=blog, fingerprint=fingerprint)
+        BlogLike.objects.filter(pk=record.pk).update(liked_at=at)
+        return record
+
+    def score(self, blog):
+        return Blog.objects.get(pk=blog.pk).trending_score
+
+    def test_half_life(self):
+        self.assertAlmostEqual(decay_factor(10 * HOUR), 0.5)
+        self.assertAlmostEqual(decay_factor(20 * HOUR), 0.25)
+        self.assertEqual(decay_factor(-5), 1.0)
+
+    def test_events_decay_by_age(self):
+        # Mid-hour timestamps, so bucketing by hour changes nothing
+        self.view(self.blog, self.now - timedelta(hours=10), 'old')
+        self.view(self.other, self.now, 'new')
+        update_trending_scores(full=True, now=self.now)
+
+        self.assertAlmostEqual(self.score(self.blog), 0.5, places=6)
+        self.assertAlmostEqual(self.score(self.other), 1.0, places=6)
+
+    def test_incremental_update_matches_full_recompute(self):
+        self.view(self.blog, self.now - timedelta(hours=30), 'v1')
+        self.like(self.blog, self.now - timedelta(hours=20), 'l1')
+        update_trending_scores(full=True, now=self.now - timedelta(hours=12))
+
+        self.view(self.blog, self.now - timedelta(hours=5), 'v2')
+        self.like(self.other, self.now - timedelta(hours=1), 'l2')
+        stats = update_trending_scores(now=self.now)
+        incremental = self.score(self.blog), self.score(self.other)
+        # `other` had no score yet, so it is computed from the window
+        self.assertEqual(stats, {'incremental': 1, 'full': 1, 'unchanged': 0})
+
+        update_trending_scores(full=True, now=self.now)
+        self.assertAlmostEqual(incremental[0], self.score(self.blog), places=6)
+        self.assertAlmostEqual(incremental[1], self.score(self.other), places=6)
+
+    def test_small_changes_are_not_written(self):
+        self.view(self.blog, self.now, 'v1')
+        update_trending_scores(full=True, now=self.now)
+        written_at = Blog.objects.get(pk=self.blog.pk).trending_score_updated_at
+
+        # One minute of decay moves a score of 1 by about 0.001
+        stats = update_trending_scores(now=self.now + timedelta(minutes=1))
+        self.assertEqual(stats['incremental'], 0)
+        self.assertEqual(Blog.objects.get(pk=self.blog.pk).trending_score_updated_at, written_at)
+
+        stats = update_trending_scores(now=self.now + timedelta(hours=10))
+        self.assertEqual(stats['incremental'], 1)
+        self.assertAlmostEqual(self.score(self.blog), 0.5, places=6)
+
+    def test_unlike_is_subtracted(self):
+        self.view(self.blog, self.now - timedelta(hours=1), 'v1')
+        self.like(self.blog, self.now - timedelta(hours=1), 'reader')
+        update_trending_scores(full=True)
+        url = reverse('blog-toggle-like', kwargs={'slug': self.blog.slug})
+
+        self.client.post(url, {'fingerprint': 'reader', 'action': 'unlike'}, content_type='application/json')
+        retracted = self.score(self.blog)
+        update_trending_scores(full=True)
+        self.assertAlmostEqual(retracted, self.score(self.blog), places=2)
+
+        # A re-like counts again, as a new like
+        self.client.post(url, {'fingerprint': 'reader', 'action': 'like'}, content_type='application/json')
+        update_trending_scores()
+        relike = self.score(self.blog)
+        # Worth up to 3.0 less the decay since mid-hour of the current hour
+        self.assertGreater(relike - retracted, 2.8)
+        update_trending_scores(full=True)
+        self.assertAlmostEqual(relike, self.score(self.blog), places=2)
+
+    def test_marked_blogs_lead_the_trending_list(self):
+        self.view(self.blog, self.now, 'v1')
+        self.view(self.blog, self.now, 'v2')
+        update_trending_scores(full=True, now=self.now)
+        unscored = Blog.objects.create(slug='c', title='C', content_markdown='c', is_published=True, is_trending=True)
+
+        slugs = [item['slug'] for item in self.client.get(reverse('trending-blogs')).json()]
+        self.assertEqual(slugs, [unscored.slug, self.blog.slug])
+
+    def test_trending_list_reads_the_ordered_index(self):
+        plan = TrendingBlogsView().get_queryset().explain()
+        self.assertIn('api_blog_trending_order_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
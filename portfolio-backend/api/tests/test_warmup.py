@@ -0,0 +1,35 @@
+"""
+Cache warm-up: the renderings warmed by warm_local_caches() must still be in
+the cache afterwards, and uncached_markdown() must notice when they aren't.
+"""
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from api.models import Blog
+from api.rendering import markdown_cache_key
+from api.warmup import uncached_markdown, warm_local_caches
+
+from .helpers import DatasetTestCase
+
+
+class WarmLocalCachesTests(DatasetTestCase):
+
+    def test_every_published_rendering_is_cached(self):
+        warm_local_caches()
+
+        texts = Blog.objects.filter(is_published=True).values_list('content_markdown', flat=True)
+        self.assertTrue(texts)
+        for text in texts:
+            self.assertIsNotNone(cache.get(markdown_cache_key(text)))
+        self.assertEqual(uncached_markdown(), [])
+
+    def test_evictions_are_reported(self):
+        tiny = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'warmup-tiny',
+            'OPTIONS': {'MAX_ENTRIES': 3},
+        }}
+        with override_settings(CACHES=tiny):
+            warm_local_caches()
+            self.assertTrue(uncached_markdown())
@@ -0,0 +1,195 @@
+"""
+Time-decayed trending scores for blog posts.
+
+Every BlogView and active BlogLike adds its weight to the score of its blog,
+and that contribution halves every TRENDING_HALF_LIFE_HOURS. The score is
+stored on Blog.trending_score together with the time it was computed, so a
+later run only has to decay the stored value and add the events recorded
+since then instead of rescanning the whole engagement history.
+
+A blog is only written when its score moved by more than
+TRENDING_SCORE_EPSILON. Skipping it keeps the old score and timestamp,
+which the next run decays and adds to as usual, so nothing is lost. An unlike takes
+its like back out of the stored score right away (retract_like()), and a
+re-like counts as a new like.
+"""
+
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, F
+from django.db.models.functions import Greatest, TruncHour
+from django.utils import timezone
+
+from .models import Blog, BlogView, BlogLike
+from .response_cache import bump_version
+
+# The only response that depends on the scores (see api/urls.py)
+TRENDING_PATH = '/api/trending-blogs/'
+
+
+def get_decay_rate():
+    """Return the decay constant (per second) derived from the configured half-life."""
+    half_life_hours = getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 48)
+    return math.log(2) / (half_life_hours * 3600)
+
+
+def decay_factor(elapsed_seconds, rate=None):
+    """Return how much of a score survives after `elapsed_seconds`."""
+    if rate is None:
+        rate = get_decay_rate()
+    return math.exp(-rate * max(elapsed_seconds, 0))
+
+
+def get_window():
+    return timedelta(days=getattr(settings, 'TRENDING_WINDOW_DAYS', 14))
+
+
+def _event_time(bucket, until):
+    """Every event in an hour bucket is treated as happening mid-hour."""
+    return min(bucket + timedelta(minutes=30), until)
+
+
+def _bucketed_events(queryset, time_field, since, until):
+    """
+    Count events per (blog, hour) in the half-open interval (since, until].
+
+    Bucketing by hour keeps the number of rows returned bounded by
+    blogs * hours regardless of how many individual events were recorded.
+    """
+    filters = {f'{time_field}__lte': until}
+    if since is not None:
+        filters[f'{time_field}__gt'] = since
+
+    return (
+        queryset.filter(**filters)
+        .annotate(bucket=TruncHour(time_field))
+        .values('blog_id', 'bucket')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+
+
+def _collect_contributions(blog_ids, since, until, rate):
+    """Return {blog_id: decayed contribution at `until`} for events after `since`."""
+    view_weight = getattr(settings, 'TRENDING_VIEW_WEIGHT', 1.0)
+    like_weight = getattr(settings, 'TRENDING_LIKE_WEIGHT', 3.0)
+
+    sources = [
+        (BlogView.objects.filter(blog_id__in=blog_ids), 'viewed_at', view_weight),
+        (BlogLike.objects.filter(blog_id__in=blog_ids, is_active=True), 'liked_at', like_weight),
+    ]
+
+    contributions = defaultdict(float)
+    for queryset, time_field, weight in sources:
+        for row in _bucketed_events(queryset, time_field, since, until):
+            elapsed = (until - _event_time(row['bucket'], until)).total_seconds()
+            contributions[row['blog_id']] += weight * row['total'] * decay_factor(elapsed, rate)
+    return contributions
+
+
+def update_trending_scores(full=False, now=None):
+    """
+    Recompute Blog.trending_score for every blog.
+
+    Blogs that already have a score are updated incrementally: the stored
+    score is decayed to `now` and the events recorded after the previous run
+    are added. Blogs without a score (or all blogs when `full` is True) are
+    computed from the events inside the TRENDING_WINDOW_DAYS window. Scores
+    below TRENDING_SCORE_EPSILON become 0, and blogs whose score moved by
+    less than that are not written.
+
+    Returns:
+        dict: Counts of blogs updated incrementally, from scratch, and left unchanged
+    """
+    now = now or timezone.now()
+    rate = get_decay_rate()
+    epsilon = getattr(settings, 'TRENDING_SCORE_EPSILON', 0.01)
+    window_start = now - get_window()
+
+    blogs = list(Blog.objects.only('id', 'trending_score', 'trending_score_updated_at'))
+
+    # Group blogs by the moment they were last scored; usually most blogs
+    # share the timestamp of the previous run, so there are only a few groups.
+    groups = defaultdict(list)
+    for blog in blogs:
+        last_run = None if full else blog.trending_score_updated_at
+        if last_run is not None and last_run < window_start:
+            last_run = None
+        groups[last_run].append(blog)
+
+    stats = {'incremental': 0, 'full': 0, 'unchanged': 0}
+    changed = []
+    for last_run, group in groups.items():
+        contributions = _collect_contributions(
+            [blog.id for blog in group],
+            last_run or window_start,
+            now,
+            rate,
+        )
+        for blog in group:
+            if last_run is None:
+                base = 0.0
+            else:
+                base = blog.trending_score * decay_factor((now - last_run).total_seconds(), rate)
+            score = base + contributions.get(blog.id, 0.0)
+            if score < epsilon:
+                score = 0.0
+            # The list is ordered by the stored value, so that is what must stay close
+            if abs(score - blog.trending_score) <= epsilon and (score > 0 or blog.trending_score == 0):
+                stats['unchanged'] += 1
+                continue
+            stats['full' if last_run is None else 'incremental'] += 1
+            blog.trending_score = score
+            blog.trending_score_updated_at = now
+            changed.append(blog)
+
+    Blog.objects.bulk_update(changed, ['trending_score', 'trending_score_updated_at'], batch_size=500)
+    if changed:
+        bump_version(TRENDING_PATH)  # only the trending list shows these scores
+    return stats
+
+
+def counted_like(liked_at, scored_at, rate=None):
+    """
+    Return what a like recorded at `liked_at` contributes to a score computed
+    at `scored_at`, or 0 if that score doesn't include it.
+    """
+    if scored_at is None or liked_at > scored_at or liked_at <= scored_at - get_window():
+        return 0.0
+    weight = getattr(settings, 'TRENDING_LIKE_WEIGHT', 3.0)
+    bucket = liked_at.replace(minute=0, second=0, microsecond=0)
+    elapsed = (scored_at - _event_time(bucket, scored_at)).total_seconds()
+    return weight * decay_factor(elapsed, rate)
+
+
+def retract_like(blog_id, liked_at):
+    """
+    Take an unliked like back out of its blog's stored trending score.
+
+    The amount is worked out for the time the score was stored at, and the
+    update only applies if the score hasn't been rewritten in the meantime
+    (otherwise it is recomputed for the new score).
+    """
+    for _ in range(3):
+        scored_at = Blog.objects.filter(pk=blog_id).values_list('trending_score_updated_at', flat=True).first()
+        amount = counted_like(liked_at, scored_at)
+        if not amount:
+            return
+        if Blog.objects.filter(pk=blog_id, trending_score_updated_at=scored_at).update(
+                trending_score=Greatest(F('trending_score') - amount, 0.0)):
+            return
+
+
+async def aretract_like(blog_id, liked_at):
+    """retract_like() for the async engagement views."""
+    for _ in range(3):
+        scored_at = await Blog.objects.filter(pk=blog_id).values_list('trending_score_updated_at', flat=True).afirst()
+        amount = counted_like(liked_at, scored_at)
+        if not amount:
+            return
+        if await Blog.objects.filter(pk=blog_id, trending_score_updated_at=scored_at).aupdate(
+                trending_score=Greatest(F('trending_score') - amount, 0.0)):
+            return
@@ -1,14 +1,33 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 from . import admin_views
+from . import async_views
+
+
+def engagement_urls(module):
+    """The reader engagement pings and live counters, served by `module` (views or async_views)."""
+    return [
+        path('blog-posts/<slug:slug>/increment-view/', module.BlogIncrementViewAPIView.as_view(), name='blog-increment-view'),
+        path('blog-posts/<slug:slug>/update-duration/', module.BlogUpdateDurationAPIView.as_view(), name='blog-update-duration'),
+        path('blog-posts/<slug:slug>/view-stats/', module.BlogViewStatsAPIView.as_view(), name='blog-view-stats'),
+        path('blog-posts/<slug:slug>/toggle-like/', module.BlogLikeToggleAPIView.as_view(), name='blog-toggle-like'),
+        path('blog-posts/<slug:slug>/live/', module.BlogLiveAPIView.as_view(), name='blog-live'),
+    ]
+
 
 urlpatterns = [
     path('health/', views.HealthCheckView.as_view(), name='health-check'),
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
     path('', views.IndexView.as_view(), name='api-index'),
 
     # Admin Import/Export Views (simple buttons)
     path('admin/portfolio-export/', admin_views.export_portfolio_view, name='admin-portfolio-export'),
     path('admin/portfolio-import/', admin_views.import_portfolio_view, name='admin-portfolio-import'),
+    path('admin/jobs/<int:pk>/', admin_views.job_detail_view, name='admin-job-detail'),
+    path('admin/jobs/<int:pk>/status/', admin_views.job_status_view, name='admin-job-status'),
+    path('admin/jobs/<int:pk>/download/', admin_views.job_download_view, name='admin-job-download'),
+    path('admin/profiles/<str:name>/', admin_views.download_profile_view, name='admin-request-profile-download'),
 
     # Education
     path('education/', views.EducationListView.as_view(), name='education-list'),
@@ -40,15 +59,22 @@ urlpatterns = [
     path('trending-blogs/', views.TrendingBlogsView.as_view(), name='trending-blogs'),
     path('featured-blogs/', views.FeaturedBlogsView.as_view(), name='featured-blogs'),
     path('blogs/category/<str:category>/', views.BlogsByCategoryView.as_view(), name='blogs-by-category'),
+    path('blog-facets/', views.BlogFacetsView.as_view(), name='blog-facets'),
 
-    # Blog Interactions
-    path('blog-posts/<slug:slug>/increment-view/', views.BlogIncrementViewAPIView.as_view(), name='blog-increment-view'),
-    path('blog-posts/<slug:slug>/update-duration/', views.BlogUpdateDurationAPIView.as_view(), name='blog-update-duration'),
-    path('blog-posts/<slug:slug>/view-stats/', views.BlogViewStatsAPIView.as_view(), name='blog-view-stats'),
-    path('blog-posts/<slug:slug>/toggle-like/', views.BlogLikeToggleAPIView.as_view(), name='blog-toggle-like'),
+    # Blog Interactions (async under ASGI, see API_ASYNC_ENGAGEMENT)
+    *engagement_urls(async_views if settings.API_ASYNC_ENGAGEMENT else views),
     path('blog-posts/<slug:slug>/comments/', views.BlogCommentCreateAPIView.as_view(), name='blog-comment-create'),
     path('blog-posts/<slug:slug>/comments/list/', views.BlogCommentsListAPIView.as_view(), name='blog-comments-list'),
 
+    # Search
+    path('search/', views.SearchView.as_view(), name='search'),
+    path('suggest/', views.SuggestView.as_view(), name='suggest'),
+    path('suggest/stats/', views.SuggestStatsView.as_view(), name='suggest-stats'),
+
+    # Tags
+    path('tags/', views.TagListView.as_view(), name='tag-list'),
+    path('tags/<str:slug>/', views.TagDetailView.as_view(), name='tag-detail'),
+
     # Newsletter
     path('newsletter/subscribe/', views.NewsletterSubscribeView.as_view(), name='newsletter-subscribe'),
 
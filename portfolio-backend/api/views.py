@@ -1,9 +1,11 @@
 from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.conf import settings
+from django.db.models import Count, Prefetch, Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.http import FileResponse, Http404
+from django.http import FileResponse, Http404, HttpResponse
 import mimetypes
 import os
 
@@ -18,13 +20,26 @@ from .models import (
     HomeData,
     Blog,
     BlogComment,
+    RelatedBlog,
     BlogsData,
     BlogSettings,
     BlogView,
     BlogLike,
     MediaFile,
     NewsletterSubscriber,
+    Tag,
+    BlogTag,
+    ProjectTag,
+    ResearchPublicationTag,
 )
+from . import live, metrics
+from .facets import get_blog_facets
+from .fast_serializers import FastListMixin
+from .renderers import EventStreamRenderer
+from .search import SEARCH_SOURCES, search
+from .sparse_fields import SparseFieldsetsMixin
+from .suggest import suggest_index
+from .trending import retract_like
 from .serializers import (
     EducationEntrySerializer,
     ExperienceEntrySerializer,
@@ -50,6 +65,25 @@ class HealthCheckView(APIView):
         return Response({'status': 'healthy'}, status=http_status.HTTP_200_OK)
 
 
+class MetricsView(APIView):
+    """
+    GET /api/metrics/
+    Prometheus metrics for all worker processes (see api/metrics.py).
+
+    Served to addresses in API_METRICS_ALLOWED_IPS (loopback by default) and
+    to scrapers that send API_METRICS_TOKEN as `Authorization: Bearer <token>`.
+    """
+    def get(self, request):
+        if not metrics.is_enabled():
+            return Response({'detail': 'Metrics are disabled'}, status=http_status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        if not metrics.is_allowed_scraper(request):
+            return Response({'detail': 'Metrics token required'}, status=http_status.HTTP_403_FORBIDDEN)
+
+        body, content_type = metrics.render_metrics()
+        return HttpResponse(body, content_type=content_type)
+
+
 class IndexView(APIView):
     """Return available endpoints / keys."""
 
@@ -65,58 +99,62 @@ class IndexView(APIView):
             'blog-posts',
             'trending-blogs',
             'featured-blogs',
+            'blog-facets',
+            'search',
+            'suggest',
+            'tags',
         ]
         return Response({'available': keys})
 
 
-class EducationListView(generics.ListAPIView):
+class EducationListView(SparseFieldsetsMixin, FastListMixin, generics.ListAPIView):
     queryset = EducationEntry.objects.all()
     serializer_class = EducationEntrySerializer
 
 
-class EducationDetailView(generics.RetrieveAPIView):
+class EducationDetailView(SparseFieldsetsMixin, generics.RetrieveAPIView):
     queryset = EducationEntry.objects.all()
     serializer_class = EducationEntrySerializer
 
 
-class ExperienceListView(generics.ListAPIView):
+class ExperienceListView(SparseFieldsetsMixin, FastListMixin, generics.ListAPIView):
     queryset = ExperienceEntry.objects.all()
     serializer_class = ExperienceEntrySerializer
 
 
-class ExperienceDetailView(generics.RetrieveAPIView):
+class ExperienceDetailView(SparseFieldsetsMixin, generics.RetrieveAPIView):
     queryset = ExperienceEntry.objects.all()
     serializer_class = ExperienceEntrySerializer
 
 
-class ProjectListView(generics.ListAPIView):
+class ProjectListView(SparseFieldsetsMixin, FastListMixin, generics.ListAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
 
 
-class ProjectDetailView(generics.RetrieveAPIView):
+class ProjectDetailView(SparseFieldsetsMixin, generics.RetrieveAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     lookup_field = 'slug'
 
 
-class ResearchListView(generics.ListAPIView):
+class ResearchListView(SparseFieldsetsMixin, FastListMixin, generics.ListAPIView):
     queryset = ResearchPublication.objects.all()
     serializer_class = ResearchPublicationSerializer
 
 
-class ResearchDetailView(generics.RetrieveAPIView):
+class ResearchDetailView(SparseFieldsetsMixin, generics.RetrieveAPIView):
     queryset = ResearchPublication.objects.all()
     serializer_class = ResearchPublicationSerializer
     lookup_field = 'slug'
 
 
-class ResearchIconListView(generics.ListAPIView):
+class ResearchIconListView(SparseFieldsetsMixin, generics.ListAPIView):
     queryset = ResearchIcon.objects.all()
     serializer_class = ResearchIconSerializer
 
 
-class HomeDataView(generics.RetrieveAPIView):
+class HomeDataView(SparseFieldsetsMixin, generics.RetrieveAPIView):
     """
     Retrieve the singleton HomeData object.
     """
@@ -125,13 +163,13 @@ class HomeDataView(generics.RetrieveAPIView):
 
     def get_object(self):
         """Return the first (and only) HomeData object."""
-        return self.queryset.first()
+        return self.filter_queryset(self.get_queryset()).first()
 
 
-class BlogListView(generics.ListAPIView):
+class BlogListView(SparseFieldsetsMixin, FastListMixin, generics.ListAPIView):
     """
     List all published blogs.
-    Uses lightweight serializer without full content.
+    Uses lightweight serializer without full content, read through values().
     """
     serializer_class = BlogListSerializer
 
@@ -139,7 +177,7 @@ class BlogListView(generics.ListAPIView):
         return Blog.objects.filter(is_published=True).order_by('-published_date')
 
 
-class BlogDetailView(generics.RetrieveAPIView):
+class BlogDetailView(SparseFieldsetsMixin, generics.RetrieveAPIView):
     """
     Retrieve a single blog by slug with full content (markdown converted to HTML).
     Note: Use the /increment-view/ endpoint to track views from frontend.
@@ -148,21 +186,32 @@ class BlogDetailView(generics.RetrieveAPIView):
     serializer_class = BlogSerializer
     lookup_field = 'slug'
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.is_field_selected('related'):
+            queryset = queryset.prefetch_related(
+                Prefetch('related_entries', queryset=RelatedBlog.objects.select_related('related'))
+            )
+        return queryset
+
 
-class TrendingBlogsView(generics.ListAPIView):
+class TrendingBlogsView(SparseFieldsetsMixin, FastListMixin, generics.ListAPIView):
     """
-    List trending blogs.
+    List trending blogs: the ones marked as trending in the admin first,
+    then the rest by the time-decayed trending score.
+    Scores are refreshed by the update_trending_scores management command.
     """
     serializer_class = BlogListSerializer
 
     def get_queryset(self):
+        limit = getattr(settings, 'TRENDING_BLOGS_LIMIT', 10)
         return Blog.objects.filter(
+            Q(trending_score__gt=0) | Q(is_trending=True),
             is_published=True,
-            is_trending=True
-        ).order_by('-views', '-published_date')
+        ).order_by('-is_trending', '-trending_score')[:limit]
 
 
-class FeaturedBlogsView(generics.ListAPIView):
+class FeaturedBlogsView(SparseFieldsetsMixin, FastListMixin, generics.ListAPIView):
     """
     List featured blogs.
     """
@@ -175,7 +224,7 @@ class FeaturedBlogsView(generics.ListAPIView):
         ).order_by('-published_date')
 
 
-class BlogsByCategoryView(generics.ListAPIView):
+class BlogsByCategoryView(SparseFieldsetsMixin, FastListMixin, generics.ListAPIView):
     """
     List blogs by category.
     """
@@ -189,7 +238,16 @@ class BlogsByCategoryView(generics.ListAPIView):
         ).order_by('-published_date')
 
 
-class BlogsDataView(generics.RetrieveAPIView):
+class BlogFacetsView(APIView):
+    """
+    GET /api/blog-facets/
+    Category, tag, author and year counts for published blogs (cached).
+    """
+    def get(self, request):
+        return Response(get_blog_facets(), status=http_status.HTTP_200_OK)
+
+
+class BlogsDataView(SparseFieldsetsMixin, generics.RetrieveAPIView):
     """
     Retrieve the singleton BlogsData object.
     """
@@ -198,7 +256,7 @@ class BlogsDataView(generics.RetrieveAPIView):
 
     def get_object(self):
         """Return the first (and only) BlogsData object."""
-        return self.queryset.first()
+        return self.filter_queryset(self.get_queryset()).first()
 
 
 class BlogSettingsView(APIView):
@@ -265,6 +323,7 @@ class BlogIncrementViewAPIView(APIView):
             # This is a new view for today, increment the counter
             blog.views += 1
             blog.save(update_fields=['views'])
+            metrics.record_engagement('view')
             message = 'View count incremented'
         else:
             # This fingerprint has already viewed this blog today
@@ -414,13 +473,16 @@ class BlogLikeToggleAPIView(APIView):
             if created:
                 # New like
                 blog.likes += 1
+                metrics.record_engagement('like')
                 message = 'Blog liked'
                 is_liked = True
             elif not like_record.is_active:
-                # Re-liking after unliking
+                # Re-liking after unliking counts as a new like
                 like_record.is_active = True
-                like_record.save(update_fields=['is_active'])
+                like_record.liked_at = timezone.now()
+                like_record.save(update_fields=['is_active', 'liked_at'])
                 blog.likes += 1
+                metrics.record_engagement('like')
                 message = 'Blog liked'
                 is_liked = True
             else:
@@ -433,7 +495,9 @@ class BlogLikeToggleAPIView(APIView):
                 # Unliking
                 like_record.is_active = False
                 like_record.save(update_fields=['is_active'])
+                retract_like(blog.pk, like_record.liked_at)
                 blog.likes = max(0, blog.likes - 1)  # Prevent negative likes
+                metrics.record_engagement('unlike')
                 message = 'Blog unliked'
                 is_liked = False
             else:
@@ -505,7 +569,7 @@ class BlogCommentCreateAPIView(generics.CreateAPIView):
         }, status=http_status.HTTP_201_CREATED)
 
 
-class BlogCommentsListAPIView(generics.ListAPIView):
+class BlogCommentsListAPIView(SparseFieldsetsMixin, generics.ListAPIView):
     """
     Get all approved comments for a specific blog post.
     GET /api/blog-posts/<slug>/comments/
@@ -577,7 +641,172 @@ class BlogViewStatsAPIView(APIView):
             }, status=http_status.HTTP_200_OK)
 
 
-class MediaFileListView(generics.ListAPIView):
+class BlogLiveAPIView(APIView):
+    """
+    Live counters of a blog post as Server-Sent Events.
+    GET /api/blog-posts/<slug>/live/
+
+    Under ASGI (API_ASYNC_ENGAGEMENT) async_views.BlogLiveAPIView keeps the
+    stream open and pushes every change. A sync worker can't hold a
+    connection open, so this view sends the current counters once and
+    closes. Its `retry` field makes EventSource reconnect after
+    API_LIVE_FALLBACK_RETRY seconds, so the page polls slowly instead:
+
+        retry: 60000
+        event: counters
+        data: {"views": 1204, "likes": 87, "comments_count": 12}
+    """
+    renderer_classes = [EventStreamRenderer]
+    event_name = 'counters'
+
+    @property
+    def retry(self):
+        return int(getattr(settings, 'API_LIVE_FALLBACK_RETRY', 60) * 1000)
+
+    def get(self, request, slug):
+        blog = get_object_or_404(Blog.objects.only('slug', *live.COUNTER_FIELDS), slug=slug, is_published=True)
+        return Response(live.counters_of(blog), headers={'Cache-Control': 'no-cache'})
+
+
+class SearchView(APIView):
+    """
+    Ranked full-text search across blogs, projects and research publications.
+    GET /api/search/?q=<query>&type=blog,project,research&limit=20
+
+    Returns:
+    {
+        "query": "django",
+        "count": 1,
+        "results": [
+            {
+                "type": "blog",
+                "id": 1,
+                "slug": "getting-started-with-django",
+                "title": "Getting Started with Django",
+                "title_highlighted": "Getting Started with <mark>Django</mark>",
+                "snippet": "…build APIs with <mark>Django</mark> REST…",
+                "score": 4.21
+            }
+        ]
+    }
+    """
+    max_limit = 50
+
+    def get(self, request):
+        query = request.GET.get('q', '').strip()
+        kinds = [kind for kind in request.GET.get('type', '').split(',') if kind] or list(SEARCH_SOURCES)
+
+        try:
+            limit = min(max(int(request.GET.get('limit', 20)), 1), self.max_limit)
+        except (TypeError, ValueError):
+            limit = 20
+
+        if not query:
+            return Response({
+                'success': False,
+                'message': 'Query parameter "q" is required',
+            }, status=http_status.HTTP_400_BAD_REQUEST)
+
+        results = search(query, kinds=kinds, public_only=True, limit=limit)
+        return Response({
+            'query': query,
+            'count': len(results),
+            'results': results,
+        }, status=http_status.HTTP_200_OK)
+
+
+class SuggestView(APIView):
+    """
+    Search-as-you-type suggestions served from the in-memory prefix index.
+    GET /api/suggest/?q=<prefix>&limit=10
+
+    Returns:
+    {
+        "query": "dja",
+        "suggestions": [
+            {"label": "Getting Started with Django", "type": "blog", "slug": "getting-started-with-django"},
+            {"label": "Django", "type": "tag", "slug": "django"}
+        ]
+    }
+    """
+    max_limit = 20
+
+    def get(self, request):
+        query = request.GET.get('q', '')
+        try:
+            limit = min(max(int(request.GET.get('limit', 10)), 1), self.max_limit)
+        except (TypeError, ValueError):
+            limit = 10
+
+        return Response({
+            'query': query,
+            'suggestions': suggest_index.suggest(query, limit=limit),
+        }, status=http_status.HTTP_200_OK)
+
+
+class SuggestStatsView(APIView):
+    """
+    GET /api/suggest/stats/
+    Size and build time of this worker's suggestion index.
+    """
+    def get(self, request):
+        return Response(suggest_index.stats(), status=http_status.HTTP_200_OK)
+
+
+class TagListView(APIView):
+    """
+    GET /api/tags/
+    All tags in use with per-content-type counts, read from the tag index.
+
+    Returns:
+    [
+        {"name": "Django", "slug": "django", "blogs": 3, "projects": 1, "research": 0, "total": 4}
+    ]
+    """
+    def get(self, request):
+        counts = {}
+        sources = [
+            ('blogs', BlogTag.objects.filter(blog__is_published=True)),
+            ('projects', ProjectTag.objects.filter(project__is_visible=True)),
+            ('research', ResearchPublicationTag.objects.filter(publication__is_visible=True)),
+        ]
+        for key, queryset in sources:
+            for row in queryset.values('tag_id').annotate(total=Count('id')).order_by():
+                counts.setdefault(row['tag_id'], {})[key] = row['total']
+
+        tags = []
+        for tag in Tag.objects.filter(id__in=list(counts)).order_by('name'):
+            tag_counts = counts[tag.id]
+            entry = {'name': tag.name, 'slug': tag.slug}
+            for key, _ in sources:
+                entry[key] = tag_counts.get(key, 0)
+            entry['total'] = sum(tag_counts.values())
+            tags.append(entry)
+
+        return Response(tags, status=http_status.HTTP_200_OK)
+
+
+class TagDetailView(APIView):
+    """
+    GET /api/tags/<slug>/
+    Published blogs, visible projects and visible research carrying a tag.
+    """
+    def get(self, request, slug):
+        tag = get_object_or_404(Tag, slug=slug)
+
+        blogs = Blog.objects.filter(tag_links__tag=tag, is_published=True).order_by('-published_date')
+        projects = Project.objects.filter(tag_links__tag=tag, is_visible=True)
+        research = ResearchPublication.objects.filter(tag_links__tag=tag, is_visible=True)
+
+        return Response({
+            'tag': {'name': tag.name, 'slug': tag.slug},
+            'blogs': BlogListSerializer(blogs, many=True).data,
+            'projects': ProjectSerializer(projects, many=True).data,
+            'research': ResearchPublicationSerializer(research, many=True).data,
+        }, status=http_status.HTTP_200_OK)
+
+
+class MediaFileListView(SparseFieldsetsMixin, generics.ListAPIView):
     """
     List all media files.
     GET /api/media-files/
@@ -598,7 +827,7 @@ class MediaFileListView(generics.ListAPIView):
         return queryset.order_by('-uploaded_at')
 
 
-class MediaFileDetailView(generics.RetrieveAPIView):
+class MediaFileDetailView(SparseFieldsetsMixin, generics.RetrieveAPIView):
     """
     Get details of a specific media file by slug or UUID.
     GET /api/media-files/{slug_or_uuid}/
@@ -614,14 +843,15 @@ class MediaFileDetailView(generics.RetrieveAPIView):
         Allow lookup by either slug or UUID.
         """
         lookup_value = self.kwargs.get(self.lookup_field)
+        queryset = self.filter_queryset(self.get_queryset())
 
         try:
             # Try to get by slug first
-            return self.get_queryset().get(slug=lookup_value)
+            return queryset.get(slug=lookup_value)
         except MediaFile.DoesNotExist:
             # Try to get by UUID
             try:
-                return self.get_queryset().get(uuid=lookup_value)
+                return queryset.get(uuid=lookup_value)
             except (MediaFile.DoesNotExist, ValueError):
                 raise Http404("Media file not found")
 
@@ -682,6 +912,7 @@ class ServeMediaFileView(APIView):
             # Set cache headers (optional - cache for 1 day)
             response['Cache-Control'] = 'public, max-age=86400'
 
+            metrics.record_media_bytes(media_file.file_type, media_file.file_size)
             return response
 
         except Exception as e:
@@ -0,0 +1,104 @@
+"""
+Cache warm-up after a deploy.
+
+warm_local_caches() fills the shared caches that can be computed in-process
+(markdown renderings, blog facets). warm_endpoints() then requests every
+public endpoint over HTTP with bounded concurrency, so the response cache is
+filled through the running server exactly as a visitor would fill it; one
+request stores every compressed variant. Both report per-item timings.
+uncached_markdown() then checks that the renderings are still cached; when
+the cache is too small for the site, culling evicts what was just warmed.
+"""
+
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .facets import get_blog_facets, invalidate_blog_facets
+from .models import Blog
+from .rendering import markdown_cache_key, render_markdown
+
+
+def warm_local_caches():
+    """
+    Render and cache markdown for every published blog and recompute facets.
+
+    Returns:
+        dict: {name: seconds}
+    """
+    timings = {}
+
+    started = time.perf_counter()
+    for text in Blog.objects.filter(is_published=True).values_list('content_markdown', flat=True).iterator():
+        render_markdown(text)
+    timings['markdown'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    invalidate_blog_facets()
+    get_blog_facets()
+    timings['blog-facets'] = time.perf_counter() - started
+    return timings
+
+
+def uncached_markdown():
+    """Slugs of published blogs whose rendered markdown is not in the cache."""
+    blogs = list(Blog.objects.filter(is_published=True).values_list('slug', 'content_markdown'))
+    cached = cache.get_many([markdown_cache_key(text) for _, text in blogs])
+    return [slug for slug, text in blogs if markdown_cache_key(text) not in cached]
+
+
+def default_host_header():
+    """First concrete ALLOWED_HOSTS entry, so requests to 127.0.0.1 pass host validation."""
+    for host in settings.ALLOWED_HOSTS:
+        host = host.lstrip('.')
+        if host and host != '*':
+            return host
+    return None
+
+
+def wait_for_server(base_url, timeout=30.0, host=None):
+    """Poll the health endpoint until it answers; returns True if it did within `timeout`."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if fetch(base_url, '/api/health/', timeout=2.0, host=host)['status'] == 200:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.5)
+
+
+def fetch(base_url, path, timeout=30.0, host=None):
+    """GET one path and return its timing record (the body is read but not kept)."""
+    request = urllib.request.Request(base_url.rstrip('/') + quote(path), headers={'Accept-Encoding': 'br, gzip'})
+    if host:
+        request.add_header('Host', host)
+
+    result = {'path': path, 'status': None, 'seconds': 0.0, 'bytes': 0, 'cache': None, 'error': None}
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            result['bytes'] = len(response.read())
+            result['status'] = response.status
+            result['cache'] = response.headers.get('X-Cache')
+    except urllib.error.HTTPError as error:
+        result['status'] = error.code
+    except (urllib.error.URLError, OSError) as error:
+        result['error'] = str(getattr(error, 'reason', error))
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def warm_endpoints(base_url, paths, concurrency=4, timeout=30.0, host=None):
+    """
+    Request every path with at most `concurrency` requests in flight.
+
+    Returns:
+        list: One timing record per path, in the order of `paths`
+    """
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return list(executor.map(lambda path: fetch(base_url, path, timeout, host), paths))
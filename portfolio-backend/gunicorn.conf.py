@@ -0,0 +1,153 @@
+"""
+Gunicorn settings for the production image (gunicorn -c gunicorn.conf.py).
+
+With WARM_CACHES_ON_START=True the first worker forked after start-up runs
+`manage.py warm_caches` against this server in the background, so the
+response, render and lookup caches are filled before visitors arrive.
+Workers forked later (restarts, max_requests recycling) don't repeat it.
+
+Workers write their Prometheus samples to PROMETHEUS_MULTIPROC_DIR, which is
+emptied when the server starts; /api/metrics/ aggregates them.
+
+GUNICORN_ASGI=True switches to the ASGI profile: uvicorn workers serving
+portfolio_backend.asgi, with the engagement pings on the async views
+(API_ASYNC_ENGAGEMENT). A worker then keeps thousands of slow or idle
+connections open cheaply, so fewer workers are needed. The post_request
+RSS check below only runs in sync workers.
+
+With API_TRACEMALLOC=True each worker traces its allocations and snapshots
+them (api/memory.py). GUNICORN_MAX_WORKER_RSS_MB recycles a worker, like
+max_requests, once its resident memory passes the limit: it finishes the
+current request, exits, and the arbiter starts a fresh one.
+
+With GUNICORN_RUN_JOBS=True (the default) the master also runs
+`manage.py run_jobs`, the worker for the admin's backup exports and imports
+(api/jobs.py). It runs in this container so it sees the same database file
+and media, is restarted if it dies, and is stopped with the server after
+finishing its current job.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+ASGI = os.getenv('GUNICORN_ASGI', 'False') == 'True'
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', '2' if ASGI else '3'))
+if ASGI:
+    worker_class = 'uvicorn.workers.UvicornWorker'
+    wsgi_app = 'portfolio_backend.asgi:application'
+    # Read by settings.py in the workers
+    os.environ.setdefault('API_ASYNC_ENGAGEMENT', 'True')
+else:
+    worker_class = 'sync'
+    wsgi_app = 'portfolio_backend.wsgi:application'
+timeout = 120
+accesslog = '-'
+errorlog = '-'
+
+# Must be set before any worker imports prometheus_client
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus-multiproc')
+
+# Recycle workers by measured memory (0 = off), checked every N requests
+MAX_WORKER_RSS_MB = int(os.getenv('GUNICORN_MAX_WORKER_RSS_MB', '0'))
+RSS_CHECK_INTERVAL = int(os.getenv('GUNICORN_RSS_CHECK_INTERVAL', '20'))
+
+WARM_CACHES_ON_START = os.getenv('WARM_CACHES_ON_START', 'True') == 'True'
+WARM_CACHES_CONCURRENCY = os.getenv('WARM_CACHES_CONCURRENCY', '4')
+
+RUN_JOBS = os.getenv('GUNICORN_RUN_JOBS', 'True') == 'True'
+_job_worker = {'process': None, 'stopping': False}
+
+
+def _without_metrics_dir():
+    # Not a worker: keep its metrics out of the workers' directory
+    return {key: value for key, value in os.environ.items() if key != 'PROMETHEUS_MULTIPROC_DIR'}
+
+
+def _warm_caches(log):
+    port = bind.rsplit(':', 1)[-1]
+    command = [
+        sys.executable, 'manage.py', 'warm_caches',
+        '--base-url', f'http://127.0.0.1:{port}',
+        '--concurrency', WARM_CACHES_CONCURRENCY,
+        '--wait', '60',
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, env=_without_metrics_dir())
+    for line in (result.stdout + result.stderr).splitlines():
+        log.info('warm_caches: %s', line)
+
+
+def _supervise_job_worker(log):
+    while not _job_worker['stopping']:
+        process = subprocess.Popen([sys.executable, 'manage.py', 'run_jobs'], env=_without_metrics_dir())
+        _job_worker['process'] = process
+        code = process.wait()
+        if _job_worker['stopping']:
+            return
+        log.warning('run_jobs exited with status %s, restarting it in 5 s', code)
+        time.sleep(5)
+
+
+def when_ready(server):
+    if RUN_JOBS:
+        threading.Thread(target=_supervise_job_worker, args=(server.log,), daemon=True).start()
+
+
+def on_exit(server):
+    _job_worker['stopping'] = True
+    process = _job_worker['process']
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(server.cfg.graceful_timeout)
+    except subprocess.TimeoutExpired:
+        server.log.warning('run_jobs did not stop within %ss, killing it', server.cfg.graceful_timeout)
+        process.kill()
+
+
+def post_fork(server, worker):
+    if WARM_CACHES_ON_START and worker.age == 1:
+        threading.Thread(target=_warm_caches, args=(server.log,), daemon=True).start()
+
+
+def post_worker_init(worker):
+    # The application (and so Django) is loaded by now
+    from api.memory import start_worker_monitor
+
+    if start_worker_monitor(worker):
+        worker.log.info('Worker %s: tracing memory allocations', worker.pid)
+
+
+def post_request(worker, req, environ, resp):
+    if not MAX_WORKER_RSS_MB or worker.nr % RSS_CHECK_INTERVAL:
+        return
+    from api.memory import current_rss
+
+    rss_mb = current_rss() / (1024 * 1024)
+    if rss_mb > MAX_WORKER_RSS_MB and worker.alive:
+        worker.log.info(
+            'Worker %s: RSS %.0f MB > %s MB after %s requests, restarting',
+            worker.pid, rss_mb, MAX_WORKER_RSS_MB, worker.nr,
+        )
+        worker.alive = False
+
+
+def on_starting(server):
+    # Samples from a previous run would otherwise be added to this one
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -4,3 +4,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_backend.settings')
 
 application = get_asgi_application()
+
+# Build per-worker in-memory indexes before the first request arrives
+from api.suggest import warm_up  # noqa: E402
+
+warm_up()
@@ -27,7 +27,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.InstrumentationMiddleware',  # keep first (Server-Timing "total" covers the whole stack)
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.gzip.GZipMiddleware',  # responses not already compressed by the response cache
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -35,6 +37,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ProfilingMiddleware',  # staff-only ?_profile=; needs request.user
+    'api.middleware.ResponseCacheMiddleware',  # keep last (background refreshes re-run only the view)
 ]
 
 ROOT_URLCONF = 'portfolio_backend.urls'
@@ -57,10 +61,21 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'portfolio_backend.wsgi.application'
 
+# SQLite tuned for concurrent writers: WAL lets reads run during a write,
+# and IMMEDIATE transactions take the write lock up front, so a
+# get_or_create waits its turn (up to `timeout` seconds) instead of failing
+# with "database is locked" when two requests upgrade their locks at once.
+# This matters under ASGI, where every in-flight request has its own
+# connection.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': int(os.getenv('SQLITE_TIMEOUT', '20')),
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL',
+        },
     }
 }
 
@@ -79,12 +94,185 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static_root')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# JSON backend for API responses and request bodies: 'orjson' (falls back to
+# the stdlib automatically when orjson is not installed) or 'stdlib'
+API_JSON_BACKEND = os.getenv('API_JSON_BACKEND', 'orjson')
+
+if API_JSON_BACKEND == 'stdlib':
+    JSON_RENDERER_CLASS = 'rest_framework.renderers.JSONRenderer'
+    JSON_PARSER_CLASS = 'rest_framework.parsers.JSONParser'
+else:
+    JSON_RENDERER_CLASS = 'api.renderers.FastJSONRenderer'
+    JSON_PARSER_CLASS = 'api.renderers.FastJSONParser'
+
+# Read-only list endpoints build their JSON from queryset.values() instead of
+# model instances (same output, see api/fast_serializers.py)
+API_FAST_LIST_SERIALIZATION = os.getenv('API_FAST_LIST_SERIALIZATION', 'True') == 'True'
+
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        JSON_RENDERER_CLASS,
     ],
+    'DEFAULT_PARSER_CLASSES': [
+        JSON_PARSER_CLASS,
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Cache shared by all worker processes on this host (used for cross-worker
+# invalidation and cached data). Point it at Redis/Memcached if you scale out.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('DJANGO_CACHE_LOCATION', str(BASE_DIR / 'cache')),
+    }
+}
+if CACHES['default']['BACKEND'].endswith(('.FileBasedCache', '.LocMemCache')):
+    # Django's default of 300 entries culls a third of the cache whenever it
+    # is reached. Each cached API path takes up to three entries (identity,
+    # gzip, br) and each post one rendered-markdown entry, so size this to
+    # about 4 x (posts + projects + research) plus a few hundred. Redis and
+    # Memcached manage their memory themselves and don't take this option.
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.getenv('DJANGO_CACHE_MAX_ENTRIES', '20000')),
+    }
+
+# API response cache: anonymous GET /api/ responses are cached per content
+# version and compressed once on the way in (gzip, and br if brotli is
+# installed); hits send the stored bytes matching Accept-Encoding.
+# Entries are fresh for the soft TTL, then served stale (while one background
+# refresh runs) until the hard TTL (API_RESPONSE_CACHE_TIMEOUT).
+API_RESPONSE_CACHE = os.getenv('API_RESPONSE_CACHE', 'True') == 'True'
+API_RESPONSE_CACHE_SOFT_TTL = int(os.getenv('API_RESPONSE_CACHE_SOFT_TTL', '60'))
+API_RESPONSE_CACHE_TIMEOUT = int(os.getenv('API_RESPONSE_CACHE_TIMEOUT', '300'))
+API_RESPONSE_CACHE_LOCK_TIMEOUT = 30  # seconds a rebuild lock is held at most
+API_RESPONSE_CACHE_LOCK_WAIT = 2.0  # seconds a request waits for another worker's rebuild
+API_RESPONSE_CACHE_EXCLUDE = [  # regexes matched against the request path
+    r'^/api/health/',
+    r'^/api/metrics/',
+    r'^/api/cdn/',
+    # Per-keystroke suggestions come from an in-process index and search
+    # queries rarely repeat; caching them only adds cache I/O and compression
+    r'^/api/suggest/',
+    r'^/api/search/',
+    r'/view-stats/',
+    r'/live/$',
+]
+# Query parameters that become part of the cache key; the views ignore all others
+API_RESPONSE_CACHE_QUERY_PARAMS = ('fields', 'exclude', 'file_type')
+API_COMPRESSION_MIN_SIZE = 200  # bytes; same threshold as GZipMiddleware
+API_GZIP_LEVEL = 9
+API_BROTLI_QUALITY = 9  # 11 compresses slightly better but is much slower on cache fills
+
+# Per-request timings (total, SQL, serialisation, rendering, cache hits) in a
+# Server-Timing header and one `api.performance` log line per request
+API_INSTRUMENTATION = os.getenv('API_INSTRUMENTATION', 'True') == 'True'
+
+# Prometheus metrics at /api/metrics/ (needs prometheus_client; request
+# metrics also need API_INSTRUMENTATION). Under gunicorn all workers are
+# aggregated through PROMETHEUS_MULTIPROC_DIR, see gunicorn.conf.py.
+API_METRICS = os.getenv('API_METRICS', 'True') == 'True'
+API_METRICS_TOKEN = os.getenv('API_METRICS_TOKEN', '')  # accept "Authorization: Bearer <token>" when set
+# Client addresses/networks (REMOTE_ADDR) served without the token; comma-separated,
+# empty to always require it. The backend port is published by docker-compose, so
+# keep this to loopback and give a Prometheus in another container the token.
+API_METRICS_ALLOWED_IPS = [
+    network.strip() for network in os.getenv('API_METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if network.strip()
+]
+
+# Serve the engagement pings (increment-view, update-duration, toggle-like,
+# view-stats) from the async views in api/async_views.py. Only worth it under
+# ASGI: gunicorn.conf.py turns it on with GUNICORN_ASGI=True (uvicorn workers).
+API_ASYNC_ENGAGEMENT = os.getenv('API_ASYNC_ENGAGEMENT', 'False') == 'True'
+# Async engagement requests per worker that may use the database at once;
+# the rest wait on the event loop instead of each opening a connection
+API_ASYNC_DB_CONCURRENCY = int(os.getenv('API_ASYNC_DB_CONCURRENCY', '8'))
+
+# Live counters at /api/blog-posts/<slug>/live/ (Server-Sent Events, see
+# api/live.py). Under ASGI each post sends at most one update per interval;
+# sync workers send the counters once and have the browser reconnect after
+# API_LIVE_FALLBACK_RETRY seconds.
+API_LIVE_INTERVAL = float(os.getenv('API_LIVE_INTERVAL', '2'))
+API_LIVE_KEEPALIVE = float(os.getenv('API_LIVE_KEEPALIVE', '15'))
+API_LIVE_FALLBACK_RETRY = int(os.getenv('API_LIVE_FALLBACK_RETRY', '60'))
+
+# Admin backup exports and imports run as background jobs (api/jobs.py) in
+# `manage.py run_jobs`, which gunicorn.conf.py starts next to the server.
+# A running job whose worker has not been heard of for API_JOB_STALE_AFTER
+# seconds is marked failed.
+API_JOB_POLL_INTERVAL = float(os.getenv('API_JOB_POLL_INTERVAL', '2'))
+API_JOB_PROGRESS_INTERVAL = 1.0  # seconds between progress writes
+API_JOB_HEARTBEAT_INTERVAL = 10.0
+API_JOB_STALE_AFTER = int(os.getenv('API_JOB_STALE_AFTER', '120'))
+
+# Staff users can profile a single request with ?_profile=cprofile|sampling
+# (or an X-Profile header); see api/profiling.py and the Request Profiles
+# admin page. Only the newest API_PROFILE_KEEP profiles are kept.
+API_PROFILING = os.getenv('API_PROFILING', 'True') == 'True'
+API_PROFILE_DIR = os.getenv('API_PROFILE_DIR', str(BASE_DIR / 'profiles'))
+API_PROFILE_KEEP = int(os.getenv('API_PROFILE_KEEP', '50'))
+
+# tracemalloc in every gunicorn worker, with snapshots in API_MEMORY_DIR/<pid>/
+# taken at start-up, every API_MEMORY_SNAPSHOT_INTERVAL seconds and on demand
+# (memory_report command, Memory Usage admin page); see api/memory.py.
+# Tracing slows allocation-heavy code down, so it is off by default.
+API_TRACEMALLOC = os.getenv('API_TRACEMALLOC', 'False') == 'True'
+API_TRACEMALLOC_FRAMES = int(os.getenv('API_TRACEMALLOC_FRAMES', '10'))
+API_MEMORY_DIR = os.getenv('API_MEMORY_DIR', str(BASE_DIR / 'memory'))
+API_MEMORY_SNAPSHOT_INTERVAL = int(os.getenv('API_MEMORY_SNAPSHOT_INTERVAL', '600'))
+API_MEMORY_SNAPSHOTS_KEEP = int(os.getenv('API_MEMORY_SNAPSHOTS_KEEP', '12'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.performance': {
+            'handlers': ['console'],
+            'level': os.getenv('API_PERFORMANCE_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+        'api.jobs': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
 }
 
+# Static JSON snapshots of the public API (export_snapshot command)
+SNAPSHOT_ROOT = Path(os.getenv('SNAPSHOT_ROOT', str(BASE_DIR / 'snapshots')))
+
+# Trending blogs
+# Scores decay exponentially; an event loses half its weight every half-life.
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', '48'))
+TRENDING_WINDOW_DAYS = int(os.getenv('TRENDING_WINDOW_DAYS', '14'))
+TRENDING_VIEW_WEIGHT = 1.0
+TRENDING_LIKE_WEIGHT = 3.0
+# Blogs whose score moves by less than this aren't rewritten; smaller scores become 0
+TRENDING_SCORE_EPSILON = 0.01
+TRENDING_BLOGS_LIMIT = 10
+
+# Related posts (precomputed by rebuild_related_blogs, refreshed by a background
+# job queued on blog save)
+RELATED_BLOGS_COUNT = 5
+RELATED_BLOGS_UPDATE_ON_SAVE = os.getenv('RELATED_BLOGS_UPDATE_ON_SAVE', 'True') == 'True'
+
+# Rendered blog markdown is cached by content hash (no invalidation needed)
+MARKDOWN_CACHE_TIMEOUT = 7 * 24 * 3600
+
+# Blog facet counts are cached until a blog changes
+BLOG_FACETS_CACHE_TIMEOUT = 3600
+
+# Search-as-you-type suggestions (in-memory prefix index per worker)
+SUGGEST_REFRESH_INTERVAL = 1.0  # seconds between checks for changed content
+SUGGEST_SCAN_LIMIT = 200  # max index entries examined per lookup, label-start matches first
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = os.getenv('CORS_ALLOWED_ORIGINS', 'http://localhost:4321,http://127.0.0.1:4321').split(',')
 
@@ -4,3 +4,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_backend.settings')
 
 application = get_wsgi_application()
+
+# Build per-worker in-memory indexes before the first request arrives
+from api.suggest import warm_up  # noqa: E402
+
+warm_up()
@@ -87,6 +87,20 @@ export default function BlogInteractions({ slug, initialViews, initialLikes }: B
     setIsLiked(likedPosts.includes(slug));
   }, [slug, fingerprint, sessionId]);
 
+  // Live view/like counts pushed by the backend (Server-Sent Events)
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return;
+
+    const source = new EventSource(`${getApiUrl()}/api/blog-posts/${slug}/live/`);
+    source.addEventListener('counters', (event) => {
+      const data = JSON.parse((event as MessageEvent).data);
+      setViews(data.views);
+      setLikes(data.likes);
+    });
+
+    return () => source.close();
+  }, [slug]);
+
   // Fetch view stats periodically
   useEffect(() => {
     if (!fingerprint) return;
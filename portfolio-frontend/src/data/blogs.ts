@@ -13,6 +13,7 @@
 
 import siteData from './site-data.json';
 import { getApiUrl } from '@/utils/api-config';
+import { snapshotFetch } from '@/utils/snapshot';
 
 export interface BlogPost {
   id?: number;
@@ -93,7 +94,7 @@ const FEATURED_BLOGS_API = () => getApiEndpoint('/api/featured-blogs/');
  */
 export const fetchBlogPosts = async (): Promise<BlogPost[]> => {
   try {
-    const res = await fetch(BLOG_POSTS_API());
+    const res = await snapshotFetch(BLOG_POSTS_API());
     if (!res.ok) {
       console.error(`Failed to fetch blog posts: ${res.status} ${res.statusText}`);
       return [];
@@ -142,7 +143,7 @@ export const fetchBlogPosts = async (): Promise<BlogPost[]> => {
  */
 export const fetchBlogPostBySlug = async (slug: string): Promise<BlogPost | null> => {
   try {
-    const res = await fetch(`${BLOG_POSTS_API()}${slug}/`);
+    const res = await snapshotFetch(`${BLOG_POSTS_API()}${slug}/`);
     if (!res.ok) {
       console.error(`Failed to fetch blog post ${slug}: ${res.status} ${res.statusText}`);
       return null;
@@ -190,7 +191,7 @@ export const fetchBlogPostBySlug = async (slug: string): Promise<BlogPost | null
  */
 export const fetchBlogMetadata = async (): Promise<Partial<BlogsData>> => {
   try {
-    const res = await fetch(BLOGS_API());
+    const res = await snapshotFetch(BLOGS_API());
     if (!res.ok) {
       console.error(`Failed to fetch blog metadata: ${res.status} ${res.statusText}`);
       return {};
@@ -212,7 +213,7 @@ export const fetchBlogMetadata = async (): Promise<Partial<BlogsData>> => {
  */
 export const fetchTrendingBlogs = async (): Promise<BlogPost[]> => {
   try {
-    const res = await fetch(TRENDING_BLOGS_API());
+    const res = await snapshotFetch(TRENDING_BLOGS_API());
     if (!res.ok) return [];
     const data = await res.json();
     if (!Array.isArray(data)) return [];
@@ -246,7 +247,7 @@ export const fetchTrendingBlogs = async (): Promise<BlogPost[]> => {
  */
 export const fetchFeaturedBlogs = async (): Promise<BlogPost[]> => {
   try {
-    const res = await fetch(FEATURED_BLOGS_API());
+    const res = await snapshotFetch(FEATURED_BLOGS_API());
     if (!res.ok) return [];
     const data = await res.json();
     if (!Array.isArray(data)) return [];
@@ -280,7 +281,7 @@ export const fetchFeaturedBlogs = async (): Promise<BlogPost[]> => {
  */
 export const fetchBlogsByCategory = async (category: string): Promise<BlogPost[]> => {
   try {
-    const res = await fetch(`${BLOGS_API()}category/${encodeURIComponent(category)}/`);
+    const res = await snapshotFetch(`${BLOGS_API()}category/${encodeURIComponent(category)}/`);
     if (!res.ok) return [];
     const data = await res.json();
     if (!Array.isArray(data)) return [];
@@ -46,6 +46,7 @@ export interface EducationData {
 
 import siteData from './site-data.json';
 import { getApiUrl } from '@/utils/api-config';
+import { snapshotFetch } from '@/utils/snapshot';
 
 /**
  * Keep metadata and page content from local `site-data.json` (used for titles/metadata).
@@ -66,7 +67,7 @@ const EDUCATION_API = () => `${getApiUrl()}/api/education/`;
  */
 export const fetchEducation = async (): Promise<EducationItem[]> => {
   try {
-    const res = await fetch(EDUCATION_API());
+    const res = await snapshotFetch(EDUCATION_API());
     if (!res.ok) {
       console.error(`Failed to fetch education: ${res.status} ${res.statusText}`);
       return [];
@@ -50,6 +50,7 @@ export interface ExperienceData {
 }
 import siteData from './site-data.json';
 import { getApiUrl } from '@/utils/api-config';
+import { snapshotFetch } from '@/utils/snapshot';
 
 /**
  * Keep metadata and page content from local `site-data.json` (used for titles/metadata).
@@ -68,7 +69,7 @@ const EXPERIENCE_API = () => `${getApiUrl()}/api/experience/`;
 
 export const fetchExperience = async (): Promise<ExperienceItem[]> => {
   try {
-    const res = await fetch(EXPERIENCE_API());
+    const res = await snapshotFetch(EXPERIENCE_API());
     if (!res.ok) {
       console.error(`Failed to fetch experience: ${res.status} ${res.statusText}`);
       return [];
@@ -9,6 +9,7 @@
  */
 
 import { getApiUrl } from '@/utils/api-config';
+import { snapshotFetch } from '@/utils/snapshot';
 import siteData from './site-data.json';
 
 export interface HomeData {
@@ -69,7 +70,7 @@ export interface HomeData {
  */
 export async function fetchHomeData(): Promise<HomeData> {
   try {
-    const response = await fetch(`${getApiUrl()}/api/home/`);
+    const response = await snapshotFetch(`${getApiUrl()}/api/home/`);
     if (!response.ok) {
       throw new Error(`Failed to fetch home data: ${response.statusText}`);
     }
@@ -1,5 +1,6 @@
 import siteData from './site-data.json';
 import { getApiUrl } from '@/utils/api-config';
+import { snapshotFetch } from '@/utils/snapshot';
 
 export interface TechStack {
   backend?: string[];
@@ -61,7 +62,7 @@ const PROJECTS_API = () => `${getApiUrl()}/api/projects/`;
 
 export const fetchProjects = async (): Promise<ProjectItem[]> => {
   try {
-    const res = await fetch(PROJECTS_API());
+    const res = await snapshotFetch(PROJECTS_API());
     if (!res.ok) {
       console.error(`Failed to fetch projects: ${res.status} ${res.statusText}`);
       return [];
@@ -77,6 +77,7 @@ export interface ResearchData {
 
 import siteData from './site-data.json';
 import { getApiUrl } from '@/utils/api-config';
+import { snapshotFetch } from '@/utils/snapshot';
 
 /**
  * Keep metadata and page content from local `site-data.json` (used for titles/metadata).
@@ -97,7 +98,7 @@ const RESEARCH_API = () => `${getApiUrl()}/api/research/`;
  */
 export const fetchResearch = async (): Promise<ResearchPublication[]> => {
   try {
-    const res = await fetch(RESEARCH_API());
+    const res = await snapshotFetch(RESEARCH_API());
     if (!res.ok) {
       console.error(`Failed to fetch research: ${res.status} ${res.statusText}`);
       return [];
@@ -0,0 +1,40 @@
+/**
+ * Snapshot-aware fetch
+ *
+ * When SNAPSHOT_DIR is set (e.g. ../portfolio-backend/snapshots/current), server-side
+ * API reads are answered from the static JSON snapshot written by
+ * `python manage.py export_snapshot`, so builds don't need a running backend.
+ * Browser-side calls, non-GET requests and paths missing from the snapshot use the live API.
+ */
+
+/**
+ * Drop-in replacement for fetch() for GET requests to the API
+ * @param url - Absolute API URL (e.g. from getApiUrl())
+ * @param options - Regular fetch options
+ */
+export async function snapshotFetch(url: string, options?: RequestInit): Promise<Response> {
+  const isServer = typeof window === 'undefined';
+  const snapshotDir = isServer ? import.meta.env.SNAPSHOT_DIR : undefined;
+  const method = (options?.method || 'GET').toUpperCase();
+
+  if (snapshotDir && method === 'GET') {
+    const { pathname, search } = new URL(url);
+    const segments = decodeURIComponent(pathname).split('/').filter(Boolean);
+
+    if (!search && !segments.includes('..')) {
+      try {
+        const { readFile } = await import('node:fs/promises');
+        const { join } = await import('node:path');
+        const body = await readFile(join(snapshotDir, ...segments, 'index.json'));
+        return new Response(body, {
+          status: 200,
+          headers: { 'Content-Type': 'application/json' },
+        });
+      } catch {
+        // Not in the snapshot; fall through to the live API
+      }
+    }
+  }
+
+  return fetch(url, options);
+}